@@ -14,6 +14,9 @@ import threading
 import ctypes
 import pyperclip
 import re
+import sqlite3
+import uuid
+from urllib.parse import urlparse
 
 # UTF-8 환경 강제 설정
 if sys.platform == 'win32':
@@ -93,6 +96,34 @@ class StopRequested(Exception):
 import platform
 from datetime import datetime
 from license_check import LicenseManager
+from keyword_store import LeaseKeeper, get_keyword_store
+from prompt_store import JSON_OUTPUT_NOTE, PromptTemplateStore
+from post_pipeline import PostPipeline
+from ai_response_parser import (
+    POST_RESPONSE_SCHEMA,
+    IncrementalLabelParser,
+    InvalidAIResponse,
+    extract_title_body,
+    format_labeled_text,
+    parse_batch_response,
+    parse_json_response,
+)
+from ai_cache import AIResponseCache, backend_model_key
+from ai_metrics import AIMetricsStore
+from background_cache import get_background_cache
+from font_resolver import get_font_resolver
+from thumbnail_render import TitleLayoutEngine, draw_title, MIN_FONT_SIZE, MAX_FONT_SIZE
+from ai_router import BACKEND_NAMES, configured_backends, get_ai_router
+from gemini_client import GeminiClient, get_gemini_client, usage_counts
+from web_completion import (
+    CompletionWatcher,
+    click_first,
+    count_responses,
+    read_editor_text,
+    set_editor_text,
+    tab_state,
+    wait_prompt_sent,
+)
 import random
 
 _last_error_signature = None
@@ -181,6 +212,64 @@ def parse_interval_range(interval_value):
 
 class NaverBlogAutomation:
     """네이버 블로그 자동 포스팅 클래스"""
+
+    # 웹 AI 응답/복사 버튼 선택자 (개수 확인, 클릭, 완료 감지 공용)
+    GEMINI_RESPONSE_SELECTORS = (
+        "div.markdown",
+        "message-content",
+        "div.response-container",
+        "div.model-response",
+        "div[role='article']",
+    )
+    GEMINI_COPY_SELECTOR = "copy-button button, button[data-test-id='copy-button'], button[aria-label='복사']"
+    CHATGPT_RESPONSE_SELECTORS = (
+        "div[data-message-author-role='assistant'] div.markdown",
+        "div.markdown",
+    )
+    CHATGPT_COPY_SELECTORS = (
+        "button[data-testid='copy-turn-action-button']",
+        "button[aria-label*='Copy']",
+        "button[aria-label*='복사']",
+    )
+    PERPLEXITY_RESPONSE_SELECTOR = "div.prose, div.markdown"
+    # XPATH로 강력하게 찾기 (aria-label 한/영 지원 및 아이콘 ID 매칭, 사용자 제공: use xlink:href="#pplx-icon-copy")
+    PERPLEXITY_COPY_XPATH = "//button[@aria-label='복사' or @aria-label='Copy' or .//use[contains(@href, 'pplx-icon-copy')]]"
+    # 웹 AI 탭: 제공자 → (이름, 주소, 도메인, 입력창 선택자, 새 채팅 버튼 선택자, 응답 선택자)
+    WEB_AI_TABS = {
+        "gemini": (
+            "Gemini",
+            "https://gemini.google.com/app?hl=ko",
+            "gemini.google.com",
+            "rich-textarea div.ql-editor, div.ql-editor.textarea, div[role='textbox']",
+            "[data-test-id='new-chat-button'] a, [data-test-id='new-chat-button'] button, "
+            "a[aria-label='새 채팅'], button[aria-label='새 채팅'], a[aria-label='New chat'], button[aria-label='New chat']",
+            GEMINI_RESPONSE_SELECTORS,
+        ),
+        "gpt": (
+            "ChatGPT",
+            "https://chatgpt.com/",
+            "chatgpt.com",
+            "div#prompt-textarea",
+            "a[data-testid='create-new-chat-button'], button[data-testid='create-new-chat-button'], "
+            "a[aria-label='새 채팅'], a[aria-label='New chat']",
+            CHATGPT_RESPONSE_SELECTORS,
+        ),
+        "perplexity": (
+            "Perplexity",
+            "https://www.perplexity.ai/",
+            "perplexity.ai",
+            "#ask-input",
+            "a[data-testid='sidebar-new-thread'], button[aria-label='New Thread'], button[aria-label='새 스레드']",
+            (PERPLEXITY_RESPONSE_SELECTOR,),
+        ),
+    }
+    PROFILE_DIRNAME = "chrome_profile"  # 포스팅 브라우저 프로필 (setting 폴더 아래)
+    AI_PROFILE_DIRNAME = "chrome_profile_ai"  # 웹 AI 전용 브라우저 프로필 (web_ai_separate_browser)
+    WARM_TAB_RESET_TIMEOUT = 3  # 새 채팅 전환 확인 대기 시간 (초)
+    AI_TAB_READY_TIMEOUT = 5  # 탭을 새로 열었을 때 입력창 대기 시간 (초)
+    KEYWORD_WAIT = "keyword_wait"  # run() 결과: 남은 키워드를 지금 임대할 수 없어 대기 후 재시도
+    KEYWORD_WAIT_MAX = 60  # 예약 키워드 대기 시 한 번에 기다리는 최대 시간 (초, keywords.txt 변경 반영용)
+    LEASE_RETRY_WAIT = 5  # 다른 작업자가 남은 키워드를 모두 임대 중일 때 재시도 간격 (초, PostPipeline.IDLE_WAIT와 같음)
     
     def _ensure_imports(self):
         """Lazy load heavy imports"""
@@ -290,6 +379,8 @@ class NaverBlogAutomation:
         self.gemini_tab_handle = None
         self.gpt_tab_handle = None
         self.perplexity_tab_handle = None
+        self.web_ai_tab_warm = False  # 마지막으로 준비한 웹 AI 탭이 재사용(로그인 유지) 탭인지
+        self.profile_dirname = self.PROFILE_DIRNAME  # 웹 AI 전용 인스턴스는 AI_PROFILE_DIRNAME
         self.gemini_first_open = True  # 첫 생성 여부 추적
         self.gpt_first_open = True
         self.perplexity_first_open = True
@@ -304,7 +395,11 @@ class NaverBlogAutomation:
         self.should_stop = False  # 정지 플래그
         self.should_pause = False  # 일시정지 플래그
         self.current_keyword = ""  # 현재 사용 중인 키워드
+        self.current_keyword_id = None  # 키워드 큐에서 꺼낸 항목 ID
+        self.keyword_wait_until = None  # 지금 임대할 키워드가 없을 때 다시 시도할 시각 (epoch)
         self.last_callback_time = 0 # 콜백 쓰로틀링용
+        self.pipeline = None  # 사전 생성 파이프라인 (GUI에서 연결, API 모드 전용)
+        self._early_thumbnails = {}  # 스트리밍 중 미리 만든 썸네일 {키워드: (제목, 스레드, 결과)}
         
         # 디렉토리 설정 (exe 실행 시 고려)
         if getattr(sys, 'frozen', False):
@@ -325,16 +420,63 @@ class NaverBlogAutomation:
         else:
             self.data_dir = os.path.dirname(os.path.abspath(__file__))
         
-        # AI 모델 설정 (Gemini 고정)
-        if self.gemini_mode != "web":
-            genai.configure(api_key=api_key)  # type: ignore
-            self.model = genai.GenerativeModel('gemini-2.5-flash-lite')  # type: ignore
+        # 키워드 큐 (keywords.txt를 매번 다시 쓰지 않음)
+        # 여러 인스턴스가 같은 폴더를 공유해도 임대(lease) 방식으로 중복 포스팅 방지
+        self.keyword_store = get_keyword_store(
+            self.data_dir,
+            lease_ttl=self.config.get("keyword_lease_ttl"),
+            skip_duplicates=self.config.get("skip_used_keywords", True),
+            order_mode=self.config.get("keyword_order", "fifo"),
+        )
+        self.lease_keeper = LeaseKeeper(self.keyword_store, on_lost=self._on_keyword_lease_lost)
+        
+        # 프롬프트 템플릿 캐시 (prompt1/prompt2/prompt_output_form)
+        self.prompt_store = PromptTemplateStore(os.path.join(self.data_dir, "setting"))
+        
+        # AI 응답 캐시 (발행 실패 후 같은 키워드 재시도 시 AI 재호출 방지)
+        self.api_model_name = 'gemini-2.5-flash-lite'
+        self.ai_cache = AIResponseCache(self.data_dir, ttl=self.config.get("ai_cache_ttl"))
+        
+        # AI 호출 기록 (소요 시간/토큰/재시도/예상 비용, GUI 사용량 요약용)
+        self.ai_metrics = AIMetricsStore(self.data_dir, prices=self.config.get("gemini_prices"))
+        self._metrics_local = threading.local()  # 진행 중인 호출의 토큰/재시도 누적 (작업자 스레드별)
+        
+        # AI 백엔드 후보 (첫 번째가 기본, 실패 시 응답 시간/오류율 기준으로 다음 백엔드로 전환)
+        self.ai_router = get_ai_router()
+        self.ai_backends = configured_backends(self.config, bool(api_key))
+        # 캐시 조회는 전환 가능한 모든 백엔드의 항목을 대상으로 함 (저장은 실제로 응답한 백엔드 기준)
+        self.ai_cache_models = [backend_model_key(backend, self.api_model_name) for backend in self.ai_backends]
+        
+        # AI 모델 설정 (Gemini 고정, 웹 모드에서도 API 키가 있으면 전환용으로 준비)
+        if "gemini_api" in self.ai_backends:
+            api_endpoint = self.config.get("gemini_api_endpoint")
+            if api_endpoint:
+                # 대역 서버(mock_llm_server.py) 등 다른 주소로 보낼 때는 REST 전송 사용
+                genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": api_endpoint})  # type: ignore
+            else:
+                genai.configure(api_key=api_key)  # type: ignore
+            # RPM/TPM/동시 요청 제한은 같은 키/모델을 쓰는 모든 인스턴스가 공유
+            self.gemini_client = get_gemini_client(api_key, self.api_model_name, self.config)
+            self.model = self.gemini_client.model
         else:
+            self.gemini_client = None
             self.model = None
         
         # 초기화 시 오래된 파일 정리
         self.clean_old_files()
+        
+        # 첫 썸네일 전에 배경 이미지를 미리 디코딩/축소 (백그라운드)
+        threading.Thread(target=self._prewarm_thumbnail_background, daemon=True).start()
     
+    def _prewarm_thumbnail_background(self):
+        """썸네일 배경 이미지와 글꼴을 캐시에 미리 준비"""
+        try:
+            setting_dir = os.path.join(self.data_dir, "setting")
+            get_background_cache(setting_dir).prewarm(os.path.join(setting_dir, "image"))
+            get_font_resolver(setting_dir, self.config.get("thumbnail_fonts")).path
+        except Exception as e:
+            print(f"⚠️ 썸네일 배경 미리 준비 실패: {e}")
+
     def clean_old_files(self):
         """result 폴더의 1주일 이상 된 파일 자동 삭제"""
         try:
@@ -439,8 +581,12 @@ class NaverBlogAutomation:
         print(f"{'='*80}\n")
     
     def load_keyword(self):
-        """키워드를 keywords.txt 파일에서 로드 (개수 확인 및 경고)"""
-        keywords_file = os.path.join(self.data_dir, "setting", "keywords.txt")
+        """키워드 큐에서 다음 키워드를 꺼냄 (개수 확인 및 경고)
+
+        남은 키워드가 있지만 지금 임대할 수 없으면 None을 반환하고 keyword_wait_until에 재시도 시각을 둔다.
+        """
+        keywords_file = self.keyword_store.keywords_file
+        self.keyword_wait_until = None
         
         # 파일 읽기 재시도 로직 (파일 동시 접근 문제 해결)
         max_retries = 3
@@ -453,13 +599,11 @@ class NaverBlogAutomation:
                         self.callback("KEYWORD_FILE_MISSING")
                     return None
                 
-                # 파일 읽기
-                with open(keywords_file, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                    keywords = [line.strip() for line in lines if line.strip() and not line.strip().startswith('#')]
-                
-                keyword_count = len(keywords)
-                print(f"📖 키워드 파일 읽기 성공: {keyword_count}개 발견")
+                # 큐 읽기 (keywords.txt가 변경된 경우에만 다시 가져옴)
+                if self.keyword_store.sync() and self.keyword_store.last_import_duplicates:
+                    self._update_status(f"♻️ 이미 사용한 키워드 {self.keyword_store.last_import_duplicates}개를 건너뜁니다")
+                keyword_count = self.keyword_store.pending_count()
+                print(f"📖 키워드 큐 확인 성공: {keyword_count}개 발견")
                 
                 # 키워드 개수 확인 및 경고
                 if keyword_count == 0:
@@ -472,12 +616,37 @@ class NaverBlogAutomation:
                     self._update_status(f"⚠️ 경고: 키워드가 {keyword_count}개 남았습니다! 추가 등록이 필요합니다.")
                     # 팝업 제거: 상태 메시지만 표시하고 프로그램은 계속 진행
                 
-                # 첫 번째 키워드 선택
-                selected_keyword = keywords[0]
+                # 첫 번째 키워드 임대 (포스팅 성공 시 ack, 실패 시 release, 비정상 종료 시 TTL 만료 후 반환)
+                entry = self.keyword_store.lease()
+                if entry is None:
+                    next_at = self.keyword_store.next_available_at()
+                    if next_at:
+                        # 우선순위 모드: 발행 가능 시각이 남은 예약 키워드만 있는 경우 (소진이 아니므로 대기 후 재시도)
+                        next_at_text = datetime.fromtimestamp(next_at).strftime("%Y-%m-%d %H:%M")
+                        self._update_status(f"⏰ 지금 발행 가능한 키워드가 없습니다. (다음 예약: {next_at_text})")
+                        self.keyword_wait_until = min(next_at, time.time() + self.KEYWORD_WAIT_MAX)
+                        return None
+                    if self.keyword_store.pending_count() == 0:
+                        # 임대 중 이미 사용한 키워드를 건너뛰다 대기열이 비었음
+                        self._update_status("⚠️ 오류: 사용 가능한 키워드가 없습니다. 프로그램을 종료합니다.")
+                        if self.callback:
+                            self.callback("KEYWORD_EMPTY")
+                        return None
+                    # 남은 키워드를 다른 작업자(사전 생성 작업자/다른 PC)가 모두 임대 중: 반납/만료될 때까지 대기 후 재시도
+                    self._update_status(f"⏳ 다른 작업자가 남은 키워드를 모두 처리 중입니다. {self.LEASE_RETRY_WAIT}초 후 다시 확인합니다.")
+                    self.keyword_wait_until = time.time() + self.LEASE_RETRY_WAIT
+                    return None
+                self.current_keyword_id, selected_keyword, skipped_keywords = entry
+                self.lease_keeper.add(self.current_keyword_id)
+                for skipped in skipped_keywords:
+                    if self.keyword_store.skip_duplicates:
+                        self._update_status(f"♻️ 이미 사용한 키워드 건너뜀: {skipped}")
+                    else:
+                        self._update_status(f"⚠️ 이미 사용한 키워드입니다: {skipped}")
                 self._update_status(f"✅ 선택된 키워드: {selected_keyword} (남은 개수: {keyword_count}개)")
                 return selected_keyword
                 
-            except PermissionError as e:
+            except (PermissionError, sqlite3.OperationalError) as e:
                 print(f"⚠️ 파일 접근 권한 오류 (시도 {attempt + 1}/{max_retries}): {str(e)}")
                 if attempt < max_retries - 1:
                     time.sleep(0.5)  # 잠시 대기 후 재시도
@@ -504,40 +673,33 @@ class NaverBlogAutomation:
         return None
     
     def move_keyword_to_used(self, keyword):
-        """키워드를 keywords.txt에서 제거하고 used_keywords.txt로 이동"""
-        keywords_file = os.path.join(self.data_dir, "setting", "keywords.txt")
-        used_keywords_file = os.path.join(self.data_dir, "setting", "used_keywords.txt")
+        """꺼낸 키워드를 사용 완료 처리 (큐에서 제거 후 used_keywords.txt에 기록)"""
+        if self.current_keyword_id is None:
+            print(f"❌ 큐에서 꺼낸 키워드가 아닙니다: '{keyword}'")
+            return
         
         # 파일 작업 재시도 로직
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                if not os.path.exists(keywords_file):
-                    print(f"❌ keywords.txt 파일이 없습니다: {keywords_file}")
-                    return
-                
-                # 파일 읽기
-                with open(keywords_file, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                    keywords = [line.strip() for line in lines if line.strip() and not line.strip().startswith('#')]
-                
-                # 사용한 키워드 제거
-                remaining_keywords = [kw for kw in keywords if kw != keyword]
-                
-                # keywords.txt 업데이트
-                with open(keywords_file, 'w', encoding='utf-8') as f:
-                    for kw in remaining_keywords:
-                        f.write(kw + '\n')
-                
-                # used_keywords.txt에 추가
-                with open(used_keywords_file, 'a', encoding='utf-8') as f:
-                    f.write(keyword + '\n')
-                
+                self.lease_keeper.discard(self.current_keyword_id)
+                if not self.keyword_store.ack(self.current_keyword_id):
+                    self._update_status(f"⚠️ 키워드 '{keyword}'의 임대가 만료되어 다른 작업자에게 넘어갔을 수 있습니다")
+                self.current_keyword_id = None
                 self._update_status(f"✅ 키워드 '{keyword}'를 사용 완료 목록으로 이동")
-                print(f"✅ 키워드 이동 성공: '{keyword}' (남은 키워드: {len(remaining_keywords)}개)")
+                print(f"✅ 키워드 이동 성공: '{keyword}'")
+                # 발행한 글은 재사용하지 않도록 캐시에서 삭제
+                try:
+                    self.ai_cache.discard_keyword(keyword)
+                except sqlite3.Error as e:
+                    print(f"⚠️ AI 응답 캐시 정리 실패: {e}")
+                try:
+                    self.ai_metrics.mark_posted(keyword)
+                except sqlite3.Error as e:
+                    print(f"⚠️ AI 호출 기록 갱신 실패: {e}")
                 return  # 성공시 바로 리턴
                 
-            except PermissionError as e:
+            except (PermissionError, sqlite3.OperationalError) as e:
                 print(f"⚠️ 파일 접근 권한 오류 (시도 {attempt + 1}/{max_retries}): {str(e)}")
                 if attempt < max_retries - 1:
                     time.sleep(0.5)  # 잠시 대기 후 재시도
@@ -556,6 +718,21 @@ class NaverBlogAutomation:
                     import traceback
                     traceback.print_exc()
 
+    def _release_current_keyword(self):
+        """포스팅에 실패한 키워드를 큐로 되돌림"""
+        if self.current_keyword_id is None:
+            return
+        self.lease_keeper.discard(self.current_keyword_id)
+        try:
+            self.keyword_store.release(self.current_keyword_id)
+        except Exception as e:
+            print(f"⚠️ 키워드 반환 실패: {e}")
+        self.current_keyword_id = None
+
+    def _on_keyword_lease_lost(self, entry_id):
+        """임대 연장 실패 알림 (LeaseKeeper 스레드에서 호출)"""
+        self._update_status(f"⚠️ 키워드 임대 연장 실패 (id={entry_id}) - 다른 작업자와 중복될 수 있습니다")
+
     def _wait_if_paused(self):
         """일시정지 상태일 때 대기"""
         if self.should_stop:
@@ -637,9 +814,12 @@ class NaverBlogAutomation:
             
             # keywords.txt에서 키워드 로드
             self._update_status("📋 키워드 파일 읽는 중...")
+            self.current_keyword = ""
             keyword = self.load_keyword()
             
             if keyword is None:
+                if self.keyword_wait_until:
+                    return None, None
                 self._update_status("❌ 사용 가능한 키워드가 없습니다! 프로그램을 중지합니다.")
                 return None, None
             
@@ -650,113 +830,52 @@ class NaverBlogAutomation:
             self.current_keyword = keyword
             # self._update_status(f"✅ 선택된 키워드: {keyword}")
             print(f"🎯 키워드 사용: {keyword}")
-            
-            # prompt1.txt와 prompt2.txt 파일 읽기
-            self._update_status("📄 프롬프트 템플릿 로드 중...")
-            
-            # 파일 경로 설정
-            prompt_files = {
-                "prompt1": os.path.join(self.data_dir, "setting", "prompt1.txt"),
-                "prompt2": os.path.join(self.data_dir, "setting", "prompt2.txt"),
-                "output_form": os.path.join(self.data_dir, "setting", "prompt_output_form.txt")
-            }
-            
-            prompts = {}
-            
-            # 각 파일 읽기
-            for key, path in prompt_files.items():
-                if os.path.exists(path):
-                    with open(path, 'r', encoding='utf-8') as f:
-                        prompts[key] = f.read().replace('{keywords}', keyword).replace('{keyword}', keyword)
-                else:
-                    prompts[key] = ""
-                    self._update_status(f"⚠️ {os.path.basename(path)} 파일을 찾을 수 없습니다.")
-
-            if prompts["prompt1"] and prompts["prompt2"]:
-                # 프롬프트 조합
-                # output_form이 없으면 빈 문자열 (하위 호환성)
-                
-                full_prompt = f"""
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-[프롬프트 1 - 제목과 서론 작성]
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-{prompts["prompt1"]}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-[프롬프트 2 - 소제목과 본문 작성]
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+            return self._generate_content_for_keyword(keyword, model_name)
+        except StopRequested:
+            return None, None
+        except Exception as e:
+            self._report_error("AI 글 생성", e)
+            return None, None
 
-{prompts["prompt2"]}
+    def _generate_content_for_keyword(self, keyword, model_name="Gemini 2.5 Flash-Lite"):
+        """키워드 하나로 AI 글 생성 후 (제목, 본문) 반환 (사전 생성 작업자도 사용)"""
+        try:
+            # 프롬프트 템플릿 (파일이 바뀐 경우에만 다시 읽음)
+            self._update_status("📄 프롬프트 템플릿 로드 중...")
+            full_prompt = self.prompt_store.render(keyword)
+            for filename in self.prompt_store.missing:
+                self._update_status(f"⚠️ {filename} 파일을 찾을 수 없습니다.")
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-{prompts["output_form"]}
-"""
+            if full_prompt:
                 print(f"📄 프롬프트에 키워드 '{keyword}' 삽입 완료")
             else:
                 self._update_status("❌ 프롬프트 파일을 찾을 수 없습니다")
                 return None, None
             
-            # Gemini 호출
-            self._update_status(f"🔄 AI에게 글 생성 요청 중... (모델: {model_name})")
-            if self.gemini_mode == "web":
-                provider = (self.config.get("web_ai_provider", "gemini") or "gemini").lower()
-                if provider == "gpt":
-                    content = self._generate_content_with_chatgpt_web(full_prompt)
-                elif provider == "perplexity":
-                    content = self._generate_content_with_perplexity_web(full_prompt)
-                else:
-                    content = self._generate_content_with_gemini_web(full_prompt)
-            else:
-                response = self.model.generate_content(full_prompt)  # type: ignore
-                content = getattr(response, "text", "")  # type: ignore
-
-            if not content or not content.strip():
-                self._update_status("❌ AI 응답이 비어 있습니다")
-                if self.gemini_mode == "web":
-                    self.last_ai_error = "gemini_web_failed"
-                return None, None
-            
-            self._update_status("📝 AI 응답 처리 중...")
-            self._wait_if_paused()
-
+            # 같은 키워드/템플릿으로 사용 가능한 백엔드 중 하나가 이미 생성한 글이 있으면 재사용
+            template_hash = self.prompt_store.template_hash
+            try:
+                cached = self.ai_cache.get_any(keyword, template_hash, self.ai_cache_models)
+            except sqlite3.Error as e:
+                cached = None
+                print(f"⚠️ AI 응답 캐시 조회 실패: {e}")
+            if cached:
+                title, body = cached
+                self._update_status(f"♻️ 이전에 생성한 글을 재사용합니다 (제목: {title[:30]}...)")
+                return title, body
+            
+            # 가장 빠른 정상 백엔드부터 시도 (실패하면 같은 요청 안에서 다음 백엔드로 전환)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             result_folder = os.path.join("setting", "result")
             os.makedirs(result_folder, exist_ok=True)
-
-            # 원문 저장 (Gemini 복사본)
-            try:
-                raw_filename = f"{keyword}_{timestamp}_raw.txt"
-                raw_filepath = os.path.join(result_folder, raw_filename)
-                with open(raw_filepath, 'w', encoding='utf-8') as f:
-                    f.write(content.strip() + "\n")
-                # self._update_status(f"✅ 원문 저장: {raw_filename}")
-            except Exception as e:
-                self._update_status(f"⚠️ 원문 저장 실패: {str(e)}")
-
-            # 제목/서론/소제목/본문 분리
-            title, intro, sections = self._parse_ai_response(content)
-            self._update_status("✅ 라벨 제거 완료 - 네이버 글쓰기창에 입력합니다")
-            if not title:
-                for line in content.splitlines():
-                    if line.strip():
-                        title = line.strip()
-                        break
-            if not title:
-                self._update_status("❌ 제목 추출 실패")
+            title, body, backend = self._generate_with_failover(keyword, full_prompt, model_name, result_folder, timestamp)
+            if not title or not body:
                 return None, None
-
-            body = self._build_body_text(intro, sections)
-            if not body:
-                # 폴백: 줄바꿈 기준으로 제목/본문 분리
-                fallback_lines = [line.strip() for line in content.splitlines() if line.strip()]
-                if len(fallback_lines) >= 2:
-                    if not title:
-                        title = fallback_lines[0]
-                    body = "\n".join(fallback_lines[1:])
-                else:
-                    self._update_status("❌ 본문 추출 실패")
-                    return None, None
+            
+            try:
+                self.ai_cache.put(keyword, template_hash, backend_model_key(backend, self.api_model_name), title, body)
+            except sqlite3.Error as e:
+                print(f"⚠️ AI 응답 캐시 저장 실패: {e}")
 
             # AI 생성 글을 result 폴더에 저장
             try:
@@ -773,9 +892,11 @@ class NaverBlogAutomation:
             
             self._update_status(f"✅ AI 글 생성 완료! (제목: {title[:30]}...)")
             
-            # Gemini 탭 닫기 및 복귀
+            # Gemini 탭 닫기 및 복귀 (탭 유지 모드에서는 닫지 않고 블로그 탭으로만 복귀)
             try:
-                if self.gemini_tab_handle and self.driver:
+                if self.gemini_mode == "web" and self.driver and self.config.get("warm_ai_tabs", True):
+                    self._leave_web_ai_tab()
+                elif self.gemini_tab_handle and self.driver:
                     self.driver.switch_to.window(self.gemini_tab_handle)
                     self.driver.close()
                     self.gemini_tab_handle = None
@@ -794,126 +915,268 @@ class NaverBlogAutomation:
             self._report_error("AI 글 생성", e)
             return None, None
 
-    def _parse_ai_response(self, content):
-        """AI 응답을 제목/서론/소제목/본문으로 분리"""
-        raw = content.strip().replace("\r\n", "\n").replace("\r", "\n")
-        if not raw:
-            return "", "", []
-
-        lines = [line.strip() for line in raw.splitlines()]
-        label_map = {
-            "제목": "title",
-            "서론": "intro",
-            "소제목": "subtitle",
-            "소제목1": "subtitle",
-            "소제목2": "subtitle",
-            "소제목3": "subtitle",
-            "본문": "body",
-            "본문1": "body",
-            "본문2": "body",
-            "본문3": "body",
-        }
-        label_pattern = re.compile(r"^\s*(제목|서론|소제목\s*([1-3])?|본문\s*([1-3])?)\s*[:：]?\s*$")
-        label_prefix_pattern = re.compile(r"^\s*(제목|서론|소제목\s*([1-3])?|본문\s*([1-3])?)\s*[:：.]?\s+(.+)$")
-        has_labels = any(line in label_map or label_pattern.match(line) or label_prefix_pattern.match(line) for line in lines)
-        if has_labels:
-            title = ""
-            intro = ""
-            sections = []
-            current = None
-            buffer = []
-
-            def flush():
-                nonlocal title, intro, sections, buffer, current
-                text = "\n".join([b for b in buffer if b.strip()]).strip()
-                if not text:
-                    buffer = []
-                    return
-                if current == "title":
-                    title = text.splitlines()[0].strip()
-                elif current == "intro":
-                    intro = text
-                elif current == "subtitle":
-                    sections.append([text.splitlines()[0].strip(), ""])
-                elif current == "body":
-                    if not sections:
-                        sections.append(["", text])
-                    else:
-                        if sections[-1][1]:
-                            sections[-1][1] += "\n" + text
-                        else:
-                            sections[-1][1] = text
-                buffer = []
-
-            for line in lines:
-                # 라벨 단독 라인 (제목/서론/소제목1/본문2 등)
-                if line in label_map or label_pattern.match(line):
-                    label_key = line
-                    if label_key not in label_map:
-                        label_key = label_pattern.match(line).group(1).replace(" ", "")
-                    flush()
-                    current = label_map[label_key]
-                    continue
-                # 라벨 + 내용이 같은 줄에 있는 경우 (예: "제목: ...")
-                prefix_match = label_prefix_pattern.match(line)
-                if prefix_match:
-                    label_key = prefix_match.group(1).replace(" ", "")
-                    flush()
-                    current = label_map[label_key]
-                    buffer.append(prefix_match.group(4))
-                    continue
-                buffer.append(line)
-            flush()
-            return title, intro, [(s[0], s[1]) for s in sections]
-
-        compact_lines = [line for line in lines if line]
-        if len(compact_lines) >= 8:
-            title = compact_lines[0].strip()
-            intro = compact_lines[1].strip()
-            sections = [
-                (compact_lines[2].strip(), compact_lines[3].strip()),
-                (compact_lines[4].strip(), compact_lines[5].strip()),
-                (compact_lines[6].strip(), compact_lines[7].strip()),
-            ]
-            if len(compact_lines) > 8:
-                extra = "\n".join(compact_lines[8:]).strip()
-                if extra:
-                    sub, body = sections[-1]
-                    body = (body + "\n" + extra).strip() if body else extra
-                    sections[-1] = (sub, body)
-            return title, intro, sections
-
-        paragraphs = [p.strip() for p in re.split(r"\n\s*\n+", raw) if p.strip()]
-        if not paragraphs:
-            return "", "", []
-
-        title = paragraphs[0].splitlines()[0].strip()
-        intro = paragraphs[1].strip() if len(paragraphs) > 1 else ""
-        rest = paragraphs[2:] if len(paragraphs) > 2 else []
-        sections = []
-        i = 0
-        while i < len(rest):
-            subtitle = rest[i].splitlines()[0].strip()
-            body = rest[i + 1].strip() if i + 1 < len(rest) else ""
-            sections.append((subtitle, body))
-            i += 2
-        return title, intro, sections
-
-    def _build_body_text(self, intro, sections):
-        """서론/소제목/본문을 본문 문자열로 구성"""
-        lines = []
-        if intro:
-            intro_line = " ".join(intro.splitlines()).strip()
-            if intro_line:
-                lines.append(intro_line)
-        for subtitle, body in sections:
-            sub_line = " ".join(subtitle.splitlines()).strip()
-            body_line = " ".join(body.splitlines()).strip()
-            if sub_line:
-                lines.append(sub_line)
-            if body_line:
-                lines.append(body_line)
-        return "\n".join(lines)
+    def _generate_with_failover(self, keyword, full_prompt, model_name, result_folder, timestamp):
+        """라우터가 정한 순서로 AI 백엔드를 시도해 (제목, 본문, 응답한 백엔드) 반환 (모두 실패하면 (None, None, None))
+
+        예외/빈 응답/제목·본문 추출 실패를 해당 백엔드의 실패로 기록하고 다음 백엔드로 넘어간다.
+        """
+        request_id = uuid.uuid4().hex
+        request_started = time.monotonic()
+        multiple = len(self.ai_backends) > 1
+
+        def attempt(backend, previous):
+            self._wait_if_paused()
+            name = BACKEND_NAMES.get(backend, backend)
+            if previous is None:
+                self._update_status(f"🔄 AI에게 글 생성 요청 중... (모델: {model_name if backend == 'gemini_api' else name})")
+                if multiple:
+                    print(f"🧭 AI 백엔드 선택: {self.ai_router.describe(backend)}")
+            else:
+                self._update_status(
+                    f"🔀 {BACKEND_NAMES.get(previous, previous)} 실패 - {self.ai_router.describe(backend)}(으)로 전환합니다"
+                )
+            self._begin_ai_call()
+            try:
+                content = self._call_ai_backend(backend, keyword, full_prompt)
+            except StopRequested:
+                self._metrics_local.usage = None
+                raise
+            except Exception as e:
+                self._update_status(f"⚠️ {name} 호출 오류: {type(e).__name__}: {e}")
+                content = ""
+            # 정지로 중단된 호출은 백엔드 실패로 기록하지 않음
+            try:
+                self._wait_if_paused()
+            except StopRequested:
+                self._metrics_local.usage = None
+                raise
+            if not content or not content.strip():
+                self._update_status(f"❌ AI 응답이 비어 있습니다 ({name})")
+                return None
+            title, body = self._parse_ai_content(keyword, content, result_folder, timestamp)
+            return (title, body) if title and body else None
+
+        backend, result = self.ai_router.run(
+            self.ai_backends, attempt,
+            on_result=lambda backend, elapsed, ok: self._record_ai_call(request_id, keyword, backend, elapsed, ok),
+        )
+        if result:
+            self.last_ai_error = ""
+            name = BACKEND_NAMES.get(backend, backend)
+            self._update_status(f"⏱️ AI 생성 소요 {time.monotonic() - request_started:.1f}초 ({name})")
+            return result[0], result[1], backend
+
+        if multiple:
+            # 다음 시도에서 다시 선택하도록 실행은 계속 (gemini_web_failed로 중단하지 않음)
+            self.last_ai_error = "ai_backends_failed"
+            self._update_status("❌ 모든 AI 백엔드 실패 - 다음 시도에서 다시 선택합니다")
+        elif self.gemini_mode == "web":
+            self.last_ai_error = "gemini_web_failed"
+        return None, None, None
+
+    def _begin_ai_call(self):
+        """이 스레드에서 시작하는 AI 호출의 토큰/재시도 누적 초기화"""
+        self._metrics_local.usage = {"prompt": 0, "cached": 0, "output": 0, "retries": 0}
+
+    def _record_ai_call(self, request_id, keyword, backend, seconds, ok, share=1.0, retries=True):
+        """AI 호출 하나의 소요 시간/토큰/재시도 수 기록
+
+        share: 일괄 생성에서 글 하나의 몫 (시간/토큰을 나눠 기록), retries=False면 재시도 수는 0으로 기록
+        """
+        usage = getattr(self._metrics_local, "usage", None) or {}
+        model = self.api_model_name if backend == "gemini_api" else backend
+        try:
+            self.ai_metrics.record_call(
+                request_id, keyword, backend, model, ok, seconds * share,
+                retries=usage.get("retries", 0) if retries else 0,
+                prompt_tokens=round(usage.get("prompt", 0) * share),
+                cached_tokens=round(usage.get("cached", 0) * share),
+                output_tokens=round(usage.get("output", 0) * share),
+            )
+        except sqlite3.Error as e:
+            print(f"⚠️ AI 호출 기록 실패: {e}")
+
+    def _call_ai_backend(self, backend, keyword, full_prompt):
+        """백엔드 하나로 AI 응답 원문 생성"""
+        if backend == "gpt_web":
+            return self._generate_content_with_chatgpt_web(full_prompt)
+        if backend == "perplexity_web":
+            return self._generate_content_with_perplexity_web(full_prompt)
+        if backend == "gemini_web":
+            return self._generate_content_with_gemini_web(full_prompt)
+        if self.config.get("gemini_json_mode", False):
+            return self._generate_content_json(full_prompt, keyword)
+        if self.config.get("gemini_stream", False):
+            return self._generate_content_streaming(full_prompt, keyword)
+        system_instruction, request = self._api_prompt(keyword, full_prompt)
+        response = self.gemini_client.generate(
+            request,
+            system_instruction=system_instruction,
+            sleep=self._sleep_with_checks,
+            on_retry=self._on_gemini_retry,
+        )
+        self._log_token_usage(response)
+        return getattr(response, "text", "")  # type: ignore
+
+    def _parse_ai_content(self, keyword, content, result_folder, timestamp):
+        """AI 응답 원문 저장 후 (제목, 본문) 추출 (실패 시 (None, None))"""
+        self._update_status("📝 AI 응답 처리 중...")
+
+        # 원문 저장 (Gemini 복사본)
+        try:
+            raw_filename = f"{keyword}_{timestamp}_raw.txt"
+            raw_filepath = os.path.join(result_folder, raw_filename)
+            with open(raw_filepath, 'w', encoding='utf-8') as f:
+                f.write(content.strip() + "\n")
+            # self._update_status(f"✅ 원문 저장: {raw_filename}")
+        except Exception as e:
+            self._update_status(f"⚠️ 원문 저장 실패: {str(e)}")
+
+        # 제목/서론/소제목/본문 분리
+        title, body = extract_title_body(content)
+        if not title:
+            self._update_status("❌ 제목 추출 실패")
+            return None, None
+        if not body:
+            self._update_status("❌ 본문 추출 실패")
+            return None, None
+        self._update_status("✅ 라벨 제거 완료 - 네이버 글쓰기창에 입력합니다")
+        return title, body
+
+    def _generate_content_streaming(self, prompt, keyword):
+        """Gemini 스트리밍 호출 (제목이 완성되면 본문을 기다리지 않고 썸네일 생성 시작)"""
+        parser = IncrementalLabelParser(
+            on_title=lambda title: self._start_early_thumbnail(title, keyword)
+        )
+        self._update_status("📡 AI 응답 스트리밍 수신 중...")
+        system_instruction, request = self._api_prompt(keyword, prompt)
+        response = self.gemini_client.generate_stream(
+            request,
+            parser.feed,
+            system_instruction=system_instruction,
+            sleep=self._sleep_with_checks,
+            on_retry=self._on_gemini_retry,
+        )
+        self._log_token_usage(response)
+        return parser.close()
+
+    def _generate_content_json(self, prompt, keyword):
+        """JSON 출력 모드: 검증을 통과할 때까지 바로 다시 요청하고 라벨 형식 원문 반환 (실패 시 빈 문자열)
+
+        형식이 틀린 응답을 편집기 입력 단계까지 끌고 가지 않도록 브라우저 작업 전에 거른다.
+        """
+        system_instruction, request = self._api_prompt(keyword, prompt)
+        request += JSON_OUTPUT_NOTE
+        attempts = 1 + max(0, int(self.config.get("gemini_json_retries", 2)))
+        for attempt in range(1, attempts + 1):
+            response = self.gemini_client.generate(
+                request,
+                system_instruction=system_instruction,
+                sleep=self._sleep_with_checks,
+                on_retry=self._on_gemini_retry,
+                generation_config={
+                    "response_mime_type": "application/json",
+                    "response_schema": POST_RESPONSE_SCHEMA,
+                },
+            )
+            self._log_token_usage(response)
+            try:
+                text = response.text
+            except ValueError:
+                # 안전 필터 등으로 텍스트가 없는 응답
+                text = ""
+            try:
+                title, intro, sections = parse_json_response(text, keyword)
+            except InvalidAIResponse as e:
+                if attempt < attempts:
+                    self._update_status(f"⚠️ AI 응답 형식 오류: {e} - 다시 요청합니다 ({attempt}/{attempts - 1})")
+                else:
+                    self._update_status(f"❌ AI 응답 형식 오류: {e}")
+                continue
+            return format_labeled_text(title, intro, sections)
+        return ""
+
+    def _api_prompt(self, keyword, full_prompt):
+        """API 호출용 (시스템 지침, 요청) 반환
+
+        고정 지침은 시스템 지침(컨텍스트 캐시)으로 보내고 요청에는 키워드만 담는다.
+        gemini_system_instruction을 끄면 기존처럼 전체 프롬프트를 그대로 보낸다.
+        """
+        if not self.config.get("gemini_system_instruction", True):
+            return None, full_prompt
+        system_instruction = self.prompt_store.render_system()
+        if not system_instruction:
+            return None, full_prompt
+        return system_instruction, self.prompt_store.render_request(keyword)
+
+    def _log_token_usage(self, response):
+        """응답의 캐시/비캐시 입력 토큰 수와 누적 사용량 기록"""
+        prompt_tokens, cached_tokens, output_tokens = usage_counts(response)
+        usage = getattr(self._metrics_local, "usage", None)
+        if usage is not None:
+            usage["prompt"] += prompt_tokens
+            usage["cached"] += cached_tokens
+            usage["output"] += output_tokens
+        if not prompt_tokens:
+            return
+        total = self.gemini_client.usage.snapshot()
+        self._update_status(
+            f"📊 토큰: 입력 {prompt_tokens:,} (캐시 {cached_tokens:,} / 비캐시 {prompt_tokens - cached_tokens:,}), "
+            f"출력 {output_tokens:,} | 누적 캐시 {total['cached_tokens']:,} / 비캐시 {total['uncached_tokens']:,}"
+        )
+
+    def _start_early_thumbnail(self, title, keyword):
+        """스트리밍 중 받은 제목으로 썸네일을 백그라운드에서 미리 생성"""
+        result = {}
+
+        def render():
+            result["path"] = self.create_thumbnail(title, keyword)
+
+        thread = threading.Thread(target=render, daemon=True)
+        self._early_thumbnails[keyword] = (title, thread, result)
+        thread.start()
+        self._update_status(f"🎨 제목 수신 - 썸네일 미리 생성 시작 (제목: {title[:30]}...)")
+
+    def _take_early_thumbnail(self, title, keyword):
+        """미리 생성한 썸네일 경로 반환 (최종 제목과 다르거나 없으면 None)"""
+        early = self._early_thumbnails.pop(keyword, None)
+        if not early:
+            return None
+        early_title, thread, result = early
+        thread.join()
+        if early_title != title:
+            # 제목이 다른 썸네일은 지우고 최종 제목으로 다시 생성
+            self._remove_early_thumbnail_file(result)
+            return None
+        return result.get("path")
+
+    def _discard_early_thumbnail(self, keyword):
+        """쓰이지 않은 미리 만든 썸네일 정리 (생성 실패/정지 등으로 _take_early_thumbnail을 거치지 않은 경우)"""
+        early = self._early_thumbnails.pop(keyword, None)
+        if not early:
+            return
+        _, thread, result = early
+        thread.join()
+        self._remove_early_thumbnail_file(result)
+
+    @staticmethod
+    def _remove_early_thumbnail_file(result):
+        path = result.get("path")
+        if path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _on_gemini_retry(self, attempt, delay, error):
+        """Gemini API 재시도 안내 (429 요청 한도 초과 / 5xx 서버 오류)"""
+        usage = getattr(self._metrics_local, "usage", None)
+        if usage is not None:
+            usage["retries"] += 1
+        self._update_status(
+            f"⏳ Gemini 요청 한도/서버 오류 ({type(error).__name__}) - "
+            f"{delay:.0f}초 후 재시도 ({attempt}/{GeminiClient.MAX_RETRIES})"
+        )
 
     def _looks_like_status_text(self, text):
         """Gemini 응답이 아닌 상태/로그 텍스트인지 확인"""
@@ -945,33 +1208,114 @@ class NaverBlogAutomation:
 
     def _ensure_gemini_tab(self):
         """Gemini 웹 탭을 준비하고 포커스 (기존 탭 재사용)"""
+        return self._ensure_web_ai_tab("gemini")
+
+    def _ensure_chatgpt_tab(self):
+        """ChatGPT 웹 탭을 준비하고 포커스 (기존 탭 재사용)"""
+        return self._ensure_web_ai_tab("gpt")
+
+    def _ensure_perplexity_tab(self):
+        """Perplexity 웹 탭을 준비하고 포커스 (기존 탭 재사용)"""
+        return self._ensure_web_ai_tab("perplexity")
+
+    def _ensure_web_ai_tab(self, provider):
+        """웹 AI 탭을 준비하고 포커스
+
+        warm_ai_tabs(기본 켜짐)이면 로그인된 탭을 닫지 않고 제공자별로 하나씩 유지하다가,
+        스크립트 한 번으로 상태를 확인하고 페이지 안의 '새 채팅' 버튼으로 초기화해 다시 쓴다.
+        상태가 이상하거나 초기화에 실패하면 주소를 다시 연다.
+        """
         if not self.driver:
             return False
-        gemini_url = "https://gemini.google.com/app?hl=ko"
+        name, _, _, editor_selector, _, response_selectors = self.WEB_AI_TABS[provider]
+        url, domain = self._web_ai_location(provider)
+        handle_attr = f"{provider}_tab_handle"
+        warm = self.config.get("warm_ai_tabs", True)
+        self.web_ai_tab_warm = False
         try:
-            if self.gemini_tab_handle and self.gemini_tab_handle in self.driver.window_handles:
-                self.driver.switch_to.window(self.gemini_tab_handle)
+            handle = getattr(self, handle_attr)
+            if handle and handle in self.driver.window_handles:
+                self.driver.switch_to.window(handle)
+                if warm and self._reset_warm_ai_tab(provider):
+                    self.web_ai_tab_warm = True
+                    self._update_status(f"♻️ {name} 탭 재사용 (새 채팅)")
+                    return True
+                if warm:
+                    self._update_status(f"🔄 {name} 탭 상태 이상 - 다시 불러옵니다")
+                    self.driver.get(url)
             else:
-                # 현재 탭이 비어있으면 그대로 사용
+                # 현재 탭이 비어있으면 그대로 사용 (탭 유지 모드에서는 블로그 작업 탭과 겹치지 않도록 새 탭)
                 try:
                     current_url = (self.driver.current_url or "").lower()
                 except Exception:
                     current_url = ""
-                if current_url.startswith("data:") or current_url.startswith("about:blank"):
+                if not warm and (current_url.startswith("data:") or current_url.startswith("about:blank")):
                     pass
                 else:
                     self.driver.execute_script("window.open('about:blank', '_blank');")
                     self.driver.switch_to.window(self.driver.window_handles[-1])
-                self.gemini_tab_handle = self.driver.current_window_handle
+                setattr(self, handle_attr, self.driver.current_window_handle)
 
-            if "gemini.google.com" not in (self.driver.current_url or ""):
-                self.driver.get(gemini_url)
-            self._update_status("✅ Gemini 탭 준비 완료")
-            time.sleep(2)
+            if domain not in (self.driver.current_url or ""):
+                self.driver.get(url)
+            self._update_status(f"✅ {name} 탭 준비 완료")
+            # 고정 대기 대신 입력창이 보일 때까지만 대기 (로그인 전이면 시간 초과 후 진행)
+            end_time = time.time() + self.AI_TAB_READY_TIMEOUT
+            while time.time() < end_time:
+                state = tab_state(self.driver, editor_selector, response_selectors)
+                if state and state.get("ready") == "complete" and state.get("editor"):
+                    break
+                self._sleep_with_checks(0.3)
             return True
+        except StopRequested:
+            raise
         except Exception as e:
-            self._update_status(f"⚠️ Gemini 탭 열기 실패: {str(e).split(chr(10))[0][:80]}")
+            self._update_status(f"⚠️ {name} 탭 열기 실패: {str(e).split(chr(10))[0][:80]}")
+            return False
+
+    def _web_ai_location(self, provider):
+        """웹 AI 탭 (주소, 도메인), config의 web_ai_urls로 바꿀 수 있음 (대역 페이지 등)"""
+        _, url, domain, _, _, _ = self.WEB_AI_TABS[provider]
+        override = (self.config.get("web_ai_urls") or {}).get(provider)
+        if override:
+            return override, urlparse(override).netloc
+        return url, domain
+
+    def _reset_warm_ai_tab(self, provider):
+        """유지 중인 웹 AI 탭 상태 확인 후 새 채팅으로 초기화, 바로 쓸 수 있으면 True"""
+        _, _, _, editor_selector, new_chat_selector, response_selectors = self.WEB_AI_TABS[provider]
+        _, domain = self._web_ai_location(provider)
+        state = tab_state(self.driver, editor_selector, response_selectors)
+        if not state or domain not in (state.get("host") or "") or state.get("ready") != "complete":
+            return False
+        if not state.get("editor"):
+            # 로그인 만료/오류 페이지 등
             return False
+        if not state.get("responses"):
+            return True
+        if not click_first(self.driver, new_chat_selector):
+            return False
+        end_time = time.time() + self.WARM_TAB_RESET_TIMEOUT
+        while time.time() < end_time:
+            self._sleep_with_checks(0.2)
+            state = tab_state(self.driver, editor_selector, response_selectors)
+            if state and state.get("editor") and not state.get("responses"):
+                return True
+        return False
+
+    def _leave_web_ai_tab(self):
+        """웹 AI 탭은 그대로 두고 블로그 작업 탭으로 전환 (없으면 새 탭)"""
+        ai_handles = {self.gemini_tab_handle, self.gpt_tab_handle, self.perplexity_tab_handle}
+        handles = self.driver.window_handles
+        if self.blog_tab_handle in handles:
+            self.driver.switch_to.window(self.blog_tab_handle)
+            return
+        for handle in handles:
+            if handle not in ai_handles:
+                self.driver.switch_to.window(handle)
+                return
+        self.driver.execute_script("window.open('about:blank', '_blank');")
+        self.driver.switch_to.window(self.driver.window_handles[-1])
 
     def _ensure_blog_tab(self, url=None):
         """블로그 작업용 탭을 준비하고 포커스"""
@@ -1090,171 +1434,86 @@ class NaverBlogAutomation:
                 except Exception:
                     pass
 
-            editor = self._find_gemini_editor(timeout=15)
-            if not editor:
-                self._update_status("❌ Gemini 입력창을 찾을 수 없습니다.")
-                return False
-            
-            # 입력창 찾은 후 안정화 대기
-            time.sleep(5)
-
             for attempt in range(3):
                 try:
-                    # 매 시도마다 에디터 상태 확인 (Stale 대응)
-                    editor = self._find_gemini_editor(timeout=5)
+                    # 매 시도마다 에디터를 다시 찾음 (Stale 대응)
+                    editor = self._find_gemini_editor(timeout=15 if attempt == 0 else 5)
                     if not editor:
                         self._update_status(f"⚠️ 에디터를 찾을 수 없어 재시도합니다 ({attempt+1}/3)")
                         continue
-
-                    # 포커스 및 클릭
-                    try:
-                        self.driver.execute_script("arguments[0].focus();", editor)
-                        time.sleep(0.5)
-                        editor.click()
-                        time.sleep(1) 
-                    except Exception:
-                        pass
-                    
-                    # 내용 지우기
-                    try:
-                        editor.clear()
-                        time.sleep(0.5)
-                    except Exception:
-                        pass
-                    
-                    # 텍스트 입력 (클립보드 붙여넣기 방식 우선)
-                    import pyperclip
-                    pyperclip.copy(prompt)
-                    time.sleep(1) 
-                    
-                    # Ctrl+V
-                    actions = ActionChains(self.driver)
-                    actions.key_down(Keys.CONTROL).send_keys('v').key_up(Keys.CONTROL).perform()
-                    time.sleep(5) 
-                    
-                    # 입력 확인
-                    current_text = self._get_gemini_editor_text(editor)
-                    if not current_text or len(current_text) < 10:
-                        if not self._set_gemini_editor_text(editor, prompt):
-                            editor.send_keys(prompt)
-                        time.sleep(5) 
-                    
-                    current_text = self._get_gemini_editor_text(editor)
-                    if current_text and len(current_text) >= 10:
-                        editor.send_keys(Keys.ENTER)
-                        time.sleep(2) 
+                    if self._submit_web_prompt(editor, prompt, "Gemini", self.GEMINI_RESPONSE_SELECTORS):
                         return True
                 except (TimeoutException, NoSuchElementException, Exception) as e:
                     self._update_status(f"⚠️ 입력 시도 {attempt+1} 실패: {type(e).__name__}")
-                    time.sleep(3)
-                    continue
+                self._sleep_with_checks(1)
+            self._update_status("❌ Gemini 입력창을 찾을 수 없습니다.")
             return False
+        except StopRequested:
+            raise
         except Exception as e:
             self._update_status(f"⚠️ Gemini 프롬프트 입력 실패: {str(e)}")
             return False
 
-    def _get_gemini_editor_text(self, editor):
-        """Gemini 입력창 텍스트 읽기"""
-        try:
-            if editor.get_attribute("contenteditable") == "true":
-                return editor.text.strip()
-            return (editor.get_attribute("value") or "").strip()
-        except Exception:
-            return ""
+    def _submit_web_prompt(self, editor, prompt, provider_name, response_selectors):
+        """클립보드 없이 DOM으로 프롬프트를 넣고, 입력창 내용을 확인한 뒤 Enter로 전송
 
-    def _set_gemini_editor_text(self, editor, text):
-        """Gemini 입력창에 텍스트 설정 (붙여넣기 실패 시 폴백)"""
-        try:
-            return bool(self.driver.execute_script("""
-                const el = arguments[0];
-                const value = arguments[1];
-                if (!el) return false;
-                el.focus();
-                if (el.isContentEditable) {
-                    el.textContent = value;
-                } else {
-                    el.value = value;
-                }
-                el.dispatchEvent(new Event('input', { bubbles: true }));
-                return true;
-            """, editor, text))
-        except Exception:
+        입력창이 비워지거나 새 응답/중지 버튼이 나타나면 전송된 것으로 본다 (고정 대기 없음).
+        """
+        if not set_editor_text(self.driver, editor, prompt):
+            current = read_editor_text(self.driver, editor)
+            self._update_status(f"⚠️ {provider_name} 입력창 입력 확인 실패 ({len(current)}/{len(prompt)}자)")
             return False
+        before_responses = count_responses(self.driver, response_selectors)
+        for _ in range(2):
+            editor.send_keys(Keys.ENTER)
+            if wait_prompt_sent(self.driver, editor, response_selectors, before_responses, timeout=5):
+                self._update_status(f"✅ {provider_name} 프롬프트 전송 완료")
+                return True
+            # 입력창이 그대로이고 응답도 시작되지 않음: 전송 버튼 활성화가 늦어 Enter가 무시된 경우만 한 번 더 시도
+        self._update_status(f"⚠️ {provider_name} 프롬프트 전송 확인 실패")
+        return False
 
-    def _wait_for_gemini_response(self, before_count, timeout=120):
-        """Gemini 응답 텍스트 대기"""
-        selectors = [
-            "div.markdown",
-            "message-content",
-            "div.response-container",
-            "div.model-response",
-            "div[role='article']",
-        ]
-        end_time = time.time() + timeout
-        last_text = ""
-        while time.time() < end_time:
-            self._wait_if_paused()
-            elements = []
-            for selector in selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        break
-                except Exception:
-                    continue
-            if elements and len(elements) > before_count:
-                try:
-                    text = elements[-1].text.strip()
-                except Exception:
-                    text = ""
-                if text:
-                    self._sleep_with_checks(1.5)
-                    try:
-                        text2 = elements[-1].text.strip()
-                    except Exception:
-                        text2 = ""
-                    if text2 == text and text2:
-                        return text2
-                    last_text = text2 or last_text
-            self._sleep_with_checks(1)
-        return last_text
+    def _wait_for_web_answer(self, provider_name, response_selectors, before_responses,
+                             copy_selectors=(), copy_xpath=None, before_copies=0, quiet=1.0, timeout=180):
+        """새 응답이 끝날 때까지 기다린 뒤 응답 노드의 텍스트를 DOM에서 추출 (실패 시 빈 문자열)"""
+        result = self._watch_web_completion(
+            response_selectors=response_selectors,
+            before_responses=before_responses,
+            copy_selectors=copy_selectors,
+            copy_xpath=copy_xpath,
+            before_copies=before_copies,
+            quiet=quiet,
+            timeout=timeout,
+        )
+        content = result["text"].strip()
+        if result["status"] != "done" or not content:
+            return ""
+        if self._looks_like_status_text(content) or self._looks_like_prompt_echo(content):
+            return ""
+        self._update_status(f"✅ {provider_name} 응답 추출 완료")
+        return content
 
-    def _scroll_gemini_to_bottom(self):
-        """Gemini 페이지를 맨 아래로 스크롤"""
-        try:
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(0.5)
-        except Exception:
-            pass
+    def _watch_web_completion(self, **kwargs):
+        """웹 AI 응답 완료 대기 (MutationObserver 기반, 대기 중 일시정지/정지 확인)"""
+        return CompletionWatcher(self.driver).wait(between=self._wait_if_paused, **kwargs)
 
-    def _click_gemini_copy_latest(self):
-        """최신 응답의 복사 버튼 클릭"""
-        try:
-            buttons = self.driver.find_elements(By.CSS_SELECTOR, "copy-button button, button[data-test-id='copy-button'], button[aria-label='복사']")
-            if not buttons:
-                return False
-            buttons[-1].click()
-            return True
-        except Exception:
-            return False
+    def _wait_for_gemini_response(self, before_count, timeout=120):
+        """Gemini 응답 텍스트 대기 (새 응답이 1.5초 동안 바뀌지 않으면 완료)"""
+        result = self._watch_web_completion(
+            response_selectors=self.GEMINI_RESPONSE_SELECTORS,
+            before_responses=before_count,
+            quiet=1.5,
+            timeout=timeout,
+        )
+        return result["text"]
 
     def _count_gemini_copy_buttons(self):
         """Gemini 복사 버튼 개수"""
         try:
-            return len(self.driver.find_elements(By.CSS_SELECTOR, "copy-button button, button[data-test-id='copy-button'], button[aria-label='복사']"))
+            return len(self.driver.find_elements(By.CSS_SELECTOR, self.GEMINI_COPY_SELECTOR))
         except Exception:
             return 0
 
-    def _wait_for_gemini_copy_button(self, before_count, timeout=120):
-        """Gemini 응답 복사 버튼 появление 대기"""
-        end_time = time.time() + timeout
-        while time.time() < end_time:
-            self._wait_if_paused()
-            if self._count_gemini_copy_buttons() > before_count:
-                return True
-            self._sleep_with_checks(1)
-        return False
-
     def _generate_content_with_gemini_web(self, prompt):
         """Gemini 웹앱을 사용해 콘텐츠 생성 (로그인 포함)"""
         try:
@@ -1272,12 +1531,11 @@ class NaverBlogAutomation:
                 self.last_ai_error = "gemini_web_failed"
                 return ""
 
-            # 로그인 확인 및 진행
+            # 로그인 확인 및 진행 (재사용 탭은 상태 확인에서 입력창을 이미 확인함)
             self._update_status("🔐 Gemini 로그인 상태 확인 중...")
-            time.sleep(3)
 
             # 이미 에디터가 보이면 로그인 스킵
-            if self._find_gemini_editor(timeout=2):
+            if self.web_ai_tab_warm or self._find_gemini_editor(timeout=3):
                 self._update_status("✅ 이미 로그인 되어 있습니다 (에디터 감지)")
             else:
                 # 로그인 버튼이 있는지 확인
@@ -1392,12 +1650,7 @@ class NaverBlogAutomation:
                          self._update_status(f"⚠️ 로그인 절차 중 오류: {str(e)}")
 
             # self._update_status("🔄 Gemini 웹앱 입력창 확인 중...")
-            before_count = 0
-            try:
-                before_count = len(self.driver.find_elements(By.CSS_SELECTOR, "div.markdown"))
-            except Exception:
-                before_count = 0
-
+            before_count = count_responses(self.driver, self.GEMINI_RESPONSE_SELECTORS)
             before_copy_count = self._count_gemini_copy_buttons()
             
             self._update_status("📤 프롬프트 입력 중...")
@@ -1407,18 +1660,13 @@ class NaverBlogAutomation:
                 return ""
 
             self._update_status("🔄 Gemini 응답 대기 중...")
-            content = ""
-            if self._wait_for_gemini_copy_button(before_copy_count, timeout=180):
-                self._scroll_gemini_to_bottom()
-                if self._click_gemini_copy_latest():
-                    time.sleep(0.3)
-                    try:
-                        copied = pyperclip.paste().strip()
-                        if copied and not self._looks_like_status_text(copied) and not self._looks_like_prompt_echo(copied):
-                            content = copied
-                            self._update_status("✅ Gemini 응답 복사 완료")
-                    except Exception:
-                        pass
+            content = self._wait_for_web_answer(
+                "Gemini",
+                self.GEMINI_RESPONSE_SELECTORS,
+                before_count,
+                copy_selectors=(self.GEMINI_COPY_SELECTOR,),
+                before_copies=before_copy_count,
+            )
             if not content:
                 self._update_status("📝 응답 텍스트 직접 추출 중...")
                 content = self._wait_for_gemini_response(before_count, timeout=120)
@@ -1452,6 +1700,7 @@ class NaverBlogAutomation:
                 return ""
 
             self._update_status("🔄 ChatGPT 입력창 확인 중...")
+            before_count = count_responses(self.driver, self.CHATGPT_RESPONSE_SELECTORS)
             before_copy_count = self._count_chatgpt_copy_buttons()
             
             self._update_status("📤 프롬프트 입력 중...")
@@ -1460,17 +1709,13 @@ class NaverBlogAutomation:
                 return ""
 
             self._update_status("🔄 ChatGPT 응답 대기 중...")
-            content = ""
-            if self._wait_for_chatgpt_copy_button(before_copy_count, timeout=180):
-                if self._click_chatgpt_copy_latest():
-                    time.sleep(0.3)
-                    try:
-                        copied = pyperclip.paste().strip()
-                        if copied and not self._looks_like_status_text(copied) and not self._looks_like_prompt_echo(copied):
-                            content = copied
-                            self._update_status("✅ ChatGPT 응답 복사 완료")
-                    except Exception:
-                        pass
+            content = self._wait_for_web_answer(
+                "ChatGPT",
+                self.CHATGPT_RESPONSE_SELECTORS,
+                before_count,
+                copy_selectors=self.CHATGPT_COPY_SELECTORS,
+                before_copies=before_copy_count,
+            )
             if not content:
                 self._update_status("❌ ChatGPT 응답 대기 실패 - 로그인/네트워크 확인 필요")
             else:
@@ -1497,6 +1742,7 @@ class NaverBlogAutomation:
                 return ""
 
             self._update_status("🔄 Perplexity 입력창 확인 중...")
+            before_count = count_responses(self.driver, (self.PERPLEXITY_RESPONSE_SELECTOR,))
             before_copy_count = self._count_perplexity_copy_buttons()
             
             self._update_status("📤 프롬프트 입력 중...")
@@ -1506,29 +1752,20 @@ class NaverBlogAutomation:
 
             self._update_status("🔄 Perplexity 응답 대기 중...")
             content = ""
-            # 최대 3회 복사 시도
+            # 답변 텍스트가 2초 동안 바뀌지 않으면 DOM에서 바로 추출 (짧으면 최대 3회까지 더 기다림)
             for attempt in range(3):
-                if self._wait_for_perplexity_copy_button(before_copy_count, timeout=180):
-                    # Gemini 로직 차용: 스크롤을 맨 아래로 내려서 최신 버튼 확인
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(0.5)
-                    
-                    # 버튼이 나타나도 텍스트가 완전히 렌더링될 시간을 줌
-                    self._sleep_with_checks(2) 
-                    if self._click_perplexity_copy_latest():
-                        self._sleep_with_checks(0.5)
-                        try:
-                            copied = pyperclip.paste().strip()
-                            # 충분한 길이인지 확인 (최소 200자 이상)
-                            if copied and len(copied) > 200 and not self._looks_like_prompt_echo(copied):
-                                content = copied
-                                self._update_status(f"✅ Perplexity 응답 복사 완료 (길이: {len(content)}자)")
-                                break
-                            else:
-                                self._update_status(f"⚠️ 복사된 내용이 너무 짧음 ({len(copied) if copied else 0}자), 재시도 중... ({attempt+1}/3)")
-                        except Exception:
-                            pass
-                self._sleep_with_checks(3) # 재시도 전 대기
+                answer = self._wait_for_web_answer(
+                    "Perplexity",
+                    (self.PERPLEXITY_RESPONSE_SELECTOR,),
+                    before_count,
+                    copy_xpath=self.PERPLEXITY_COPY_XPATH,
+                    before_copies=before_copy_count,
+                    quiet=2.0,
+                )
+                if len(answer) > 200:
+                    content = answer
+                    break
+                self._update_status(f"⚠️ 추출된 답변이 너무 짧음 ({len(answer)}자), 재시도 중... ({attempt+1}/3)")
 
             if not content:
                 self._update_status("📝 응답 텍스트 직접 추출 시도 중...")
@@ -1553,14 +1790,14 @@ class NaverBlogAutomation:
             self._update_status(f"⚠️ Perplexity 웹 모드 오류: {str(e)}")
             return ""
 
-    def create_thumbnail(self, title):
+    def create_thumbnail(self, title, keyword=None):
         """setting/image 폴더의 jpg를 배경으로 300x300 썸네일 생성"""
         try:
         # 썸네일 기능은 항상 ON
 
             # PIL imports 확인
             try:
-                from PIL import Image, ImageDraw, ImageFont
+                from PIL import ImageDraw
                 # self._update_status("✅ PIL 모듈 로드 성공")
             except ImportError as ie:
                 self._update_status(f"❌ PIL 임포트 실패: {str(ie)}")
@@ -1576,92 +1813,40 @@ class NaverBlogAutomation:
                 self._update_status(f"⚠️ {image_folder} 폴더가 없습니다.")
                 return None
             
-            # jpg 파일 검색
-            jpg_files = [f for f in os.listdir(image_folder) if f.lower().endswith('.jpg')]
+            # jpg 파일 검색 (폴더가 바뀐 경우에만 다시 읽음)
+            background_cache = get_background_cache(os.path.join(self.data_dir, "setting"))
+            jpg_files = background_cache.backgrounds(image_folder)
             
             if not jpg_files:
                 self._update_status(f"⚠️ {image_folder} 폴더에 jpg 파일이 없습니다.")
                 return None
             
             # 첫 번째 jpg 파일 사용
-            source_image_path = os.path.join(image_folder, jpg_files[0])
-            self._update_status(f"📷 배경 이미지: {jpg_files[0]}")
+            source_image_path = jpg_files[0]
+            self._update_status(f"📷 배경 이미지: {os.path.basename(source_image_path)}")
             
-            # 이미지 열기 및 300x300으로 리사이즈
-            img = Image.open(source_image_path)
-            img = img.resize((300, 300), Image.Resampling.LANCZOS)
+            # 300x300으로 줄여 둔 배경 사본 (배경마다 한 번만 디코딩/리사이즈)
+            img = background_cache.get(source_image_path)
             
             # 이미지 위에 텍스트 그리기
             draw = ImageDraw.Draw(img)
             
-            # 제목을 줄바꿈 처리 (글자 수 제한)
-            max_chars_per_line = 10  # 한 줄당 최대 10자 (공백 포함)
-            max_lines = 5  # 최대 5줄
+            # 제목 배치: 여백 안에서 실제 픽셀 폭으로 줄바꿈하고 들어가는 가장 큰 글꼴 크기 선택
             margin = 30  # 테두리 여백 (좌우상하)
-            
-            if ',' in title:
-                # 쉼표가 있으면 쉼표 기준으로 먼저 분리
-                parts = title.split(',')
-                lines = []
-                for part in parts:
-                    part = part.strip()
-                    if part:
-                        # 각 파트가 8자를 넘으면 추가로 분할
-                        if len(part) > max_chars_per_line:
-                            for i in range(0, len(part), max_chars_per_line):
-                                lines.append(part[i:i+max_chars_per_line])
-                        else:
-                            lines.append(part)
-                title_text = '\n'.join(lines[:max_lines])
-            else:
-                # 쉼표가 없으면 글자 수로만 분할
-                lines = []
-                for i in range(0, len(title), max_chars_per_line):
-                    lines.append(title[i:i+max_chars_per_line])
-                title_text = '\n'.join(lines[:max_lines])
-            
-            # 폰트 설정 (고정 크기)
-            font_size = 24  # 폰트 크기 약간 줄임
-            
-            try:
-                # 맑은 고딕 폰트 사용
-                font_path = "C:/Windows/Fonts/malgun.ttf"
-                font = ImageFont.truetype(font_path, font_size)
-            except:
-                # 폰트 로드 실패 시 기본 폰트
-                font = ImageFont.load_default()
-            
-            # 텍스트 바운딩 박스 계산
-            bbox = draw.multiline_textbbox((0, 0), title_text, font=font, align='center', spacing=4)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-            
-            # 중앙 위치 계산 (여백 고려)
             available_width = 300 - (margin * 2)
             available_height = 300 - (margin * 2)
-            x = margin + (available_width - text_width) // 2
-            y = margin + (available_height - text_height) // 2
-            
-            # 텍스트 그림자 (검정색)
-            shadow_offset = 2
-            draw.multiline_text(
-                (x + shadow_offset, y + shadow_offset), 
-                title_text, 
-                fill=(50, 50, 50), 
-                font=font, 
-                align='center',
-                spacing=4
+            font_resolver = get_font_resolver(
+                os.path.join(self.data_dir, "setting"), self.config.get("thumbnail_fonts")
             )
-            
-            # 텍스트 그리기 (흰색)
-            draw.multiline_text(
-                (x, y), 
-                title_text, 
-                fill=(255, 255, 255), 
-                font=font, 
-                align='center',
-                spacing=4
+            layout_engine = TitleLayoutEngine(
+                font_resolver.font,
+                min_size=self.config.get("thumbnail_font_min", MIN_FONT_SIZE),
+                max_size=self.config.get("thumbnail_font_max", MAX_FONT_SIZE),
             )
+            layout = layout_engine.layout(title, available_width, available_height)
+            
+            # 텍스트 그리기 (그림자 → 흰색 본문, 줄마다 가운데 정렬)
+            draw_title(draw, layout, (margin, margin, available_width, available_height))
             
             # 이미지 저장
             result_folder = os.path.join("setting", "result")
@@ -1669,7 +1854,8 @@ class NaverBlogAutomation:
             
             # 파일명 생성 (키워드 사용)
             # 현재 키워드를 파일명으로 사용 (파일명에 사용 불가한 문자 제거)
-            safe_keyword = "".join(c for c in self.current_keyword if c.isalnum() or c in (' ', '-', '_')).strip()
+            keyword = keyword if keyword is not None else self.current_keyword
+            safe_keyword = "".join(c for c in keyword if c.isalnum() or c in (' ', '-', '_')).strip()
             safe_keyword = safe_keyword.replace(' ', '_')  # 공백을 언더스코어로 변경
             filename = f"{safe_keyword}.jpg"
             filepath = os.path.join(result_folder, filename)
@@ -3929,7 +4115,7 @@ class NaverBlogAutomation:
             # 수정: self.data_dir 내부의 setting 폴더 사용 (기존 상위 폴더 참조 제거)
             root_setting = os.path.join(self.data_dir, "setting")
             os.makedirs(root_setting, exist_ok=True)
-            user_data_dir = os.path.join(root_setting, "chrome_profile")
+            user_data_dir = os.path.join(root_setting, self.profile_dirname)
             os.makedirs(user_data_dir, exist_ok=True)
             options.add_argument(f"--user-data-dir={user_data_dir}")
             
@@ -4091,23 +4277,205 @@ class NaverBlogAutomation:
             self._update_status(f"❌ 로그인 실패: {str(e)}")
             return False
 
-    def run(self, is_first_run=True):
-        """전체 프로세스 실행"""
-        try:
-            self._update_status("🚀 자동 포스팅 프로세스 시작!")
-            
+    def run(self, is_first_run=True):
+        """전체 프로세스 실행 (True/False, 임대할 키워드를 기다려야 하면 KEYWORD_WAIT)"""
+        self.keyword_wait_until = None
+        try:
+            result = self._run_posting(is_first_run)
+            if result is False and self.keyword_wait_until:
+                return self.KEYWORD_WAIT
+            return result
+        finally:
+            # 포스팅을 완료하지 못한 키워드는 큐로 되돌림
+            self._release_current_keyword()
+
+    def _prepare_current_post(self):
+        """키워드를 꺼내 AI 글 생성, 썸네일/동영상 제작 후 (제목, 본문, 썸네일, 동영상) 반환"""
+        # 1단계: AI 글 생성
+        self._update_status("📝 [1/5] AI 글 생성 단계")
+        title, content = self.generate_content_with_ai()
+        if not title or not content:
+            if not self.keyword_wait_until:
+                self._update_status("❌ AI 글 생성 실패로 프로세스 중단")
+            return None
+        
+        if self.should_stop:
+            self._update_status("⏹️ 프로세스가 정지되었습니다.")
+            return None
+
+        self._wait_if_paused()
+
+        # 2-1단계: 썸네일 확인 (스트리밍 중 미리 만든 썸네일이 있으면 사용)
+        self._update_status("🎨 [2/5] 썸네일 및 동영상 제작 단계")
+        thumbnail_path = self._take_early_thumbnail(title, self.current_keyword) or self.create_thumbnail(title)
+        if thumbnail_path:
+            self._update_status("✅ 썸네일 확인 완료")
+        else:
+            self._update_status("⚠️ 썸네일 파일 없음 - 계속 진행")
+        
+        # 2-2단계: 동영상 생성 (use_video가 ON이고 썸네일이 있을 경우)
+        video_path = None
+        if self.config.get("use_video", True) and thumbnail_path:
+            try:
+                self._update_status("🎬 [2-2/5] 동영상 생성 단계")
+                video_path = self.create_video_from_thumbnail(thumbnail_path)
+                if video_path:
+                    self._update_status(f"✅ 동영상 생성 완료: {os.path.basename(video_path)}")
+                else:
+                    self._update_status("⚠️ 동영상 생성 실패 (파일 없음)")
+            except Exception as e:
+                # 동영상 생성 실패 시 명확한 에러 표시 후 중단
+                self._update_status(f"❌ 동영상 생성 실패: {str(e)}")
+                return None
+        elif not self.config.get("use_video", True):
+            self._update_status("⚪ 동영상 기능 OFF - 동영상 생성 스킵")
+        
+        if self.should_stop:
+            self._update_status("⏹️ 프로세스가 정지되었습니다.")
+            return None
+        
+        return title, content, thumbnail_path, video_path
+
+    def _take_prepared_post(self):
+        """사전 생성 파이프라인에서 완성된 글을 꺼냄 (제목, 본문, 썸네일, 동영상)"""
+        self._update_status(f"📦 [1/5] 사전 생성된 글 가져오는 중... (준비된 글 {self.pipeline.ready_count}개)")
+        post = None
+        while post is None:
             if self.should_stop:
                 self._update_status("⏹️ 프로세스가 정지되었습니다.")
-                return False
-
+                return None
             self._wait_if_paused()
+            post = self.pipeline.get(timeout=1)
+            if post is None and self.pipeline.exhausted:
+                self.current_keyword = ""
+                self._update_status("❌ 사용 가능한 키워드가 없습니다! 프로그램을 중지합니다.")
+                return None
+        
+        # 키워드 임대를 포스팅 인스턴스가 이어받음 (성공 시 ack, 실패 시 반환)
+        self.current_keyword = post.keyword
+        self.current_keyword_id = post.entry_id
+        self.lease_keeper.add(post.entry_id)
+        print(f"🎯 키워드 사용: {post.keyword}")
+        self._update_status(f"✅ 사전 생성된 글 사용 (제목: {post.title[:30]}...)")
+        return post.title, post.content, post.thumbnail_path, post.video_path
 
-            # 1단계: AI 글 생성
-            self._update_status("📝 [1/5] AI 글 생성 단계")
-            title, content = self.generate_content_with_ai()
+    def prepare_post(self, keyword):
+        """사전 생성 작업자용: 키워드 하나의 글/썸네일/동영상 생성 (실패 시 None)"""
+        try:
+            title, content = self._generate_content_for_keyword(keyword)
             if not title or not content:
-                self._update_status("❌ AI 글 생성 실패로 프로세스 중단")
-                return False
+                return None
+            thumbnail_path = self._take_early_thumbnail(title, keyword) or self.create_thumbnail(title, keyword)
+            video_path = None
+            if self.config.get("use_video", True) and thumbnail_path:
+                video_path = self.create_video_from_thumbnail(thumbnail_path)
+            return title, content, thumbnail_path, video_path
+        finally:
+            # 미리 만든 썸네일 항목이 남지 않도록 정리 (사용했으면 이미 꺼낸 상태)
+            self._discard_early_thumbnail(keyword)
+
+    def generate_content_batch(self, keywords):
+        """여러 키워드의 글을 Gemini 요청 한 번으로 생성 (API 모드 전용)
+
+        검증을 통과한 글만 AI 응답 캐시에 저장하고 {키워드: (제목, 본문)}으로 반환한다.
+        """
+        template_hash = self.prompt_store.template_hash
+        pending = []
+        generated = {}
+        for keyword in keywords:
+            try:
+                cached = self.ai_cache.get_any(keyword, template_hash, self.ai_cache_models)
+            except sqlite3.Error as e:
+                cached = None
+                print(f"⚠️ AI 응답 캐시 조회 실패: {e}")
+            if cached:
+                generated[keyword] = cached
+            else:
+                pending.append(keyword)
+        if not pending:
+            return generated
+        if len(pending) == 1 or self.gemini_mode == "web" or self.gemini_client is None:
+            # 한 개만 남았거나 웹 모드면 단건 생성
+            for keyword in pending:
+                title, body = self._generate_content_for_keyword(keyword)
+                if title and body:
+                    generated[keyword] = (title, body)
+            return generated
+
+        system_instruction = None
+        if self.config.get("gemini_system_instruction", True):
+            system_instruction = self.prompt_store.render_system()
+        if system_instruction:
+            batch_prompt = self.prompt_store.render_batch_request(pending)
+        else:
+            batch_prompt = self.prompt_store.render_batch(pending)
+        if not batch_prompt:
+            self._update_status("❌ 프롬프트 파일을 찾을 수 없습니다")
+            return generated
+        self._update_status(f"🔄 AI에게 글 {len(pending)}개 일괄 생성 요청 중...")
+        started = time.monotonic()
+        self._begin_ai_call()
+        response = self.gemini_client.generate(
+            batch_prompt,
+            system_instruction=system_instruction,
+            timeout=self.gemini_client.timeout * len(pending),
+            sleep=self._sleep_with_checks,
+            on_retry=self._on_gemini_retry,
+            expected_output_tokens=GeminiClient.DEFAULT_OUTPUT_TOKENS * len(pending),
+        )
+        self._log_token_usage(response)
+        content = getattr(response, "text", "") or ""
+        elapsed = time.monotonic() - started
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        result_folder = os.path.join("setting", "result")
+        os.makedirs(result_folder, exist_ok=True)
+        for index, (keyword, parsed) in enumerate(zip(pending, parse_batch_response(content, pending))):
+            # 일괄 호출의 시간/토큰은 글 수로 나눠 키워드별로 기록 (재시도 수는 첫 글에만)
+            self._record_ai_call(
+                uuid.uuid4().hex, keyword, "gemini_api", elapsed, parsed is not None,
+                share=1.0 / len(pending), retries=index == 0,
+            )
+            if parsed is None:
+                self._update_status(f"⚠️ 일괄 생성 결과 검증 실패: {keyword}")
+                continue
+            section, title, body = parsed
+            # 키워드별 원문 저장 (단건 생성과 같은 파일명 형식)
+            try:
+                with open(os.path.join(result_folder, f"{keyword}_{timestamp}_raw.txt"), 'w', encoding='utf-8') as f:
+                    f.write(section + "\n")
+            except Exception as e:
+                self._update_status(f"⚠️ 원문 저장 실패: {str(e)}")
+            try:
+                # 일괄 생성은 Gemini API 전용
+                self.ai_cache.put(keyword, template_hash, backend_model_key("gemini_api", self.api_model_name), title, body)
+            except sqlite3.Error as e:
+                print(f"⚠️ AI 응답 캐시 저장 실패: {e}")
+            generated[keyword] = (title, body)
+        self._update_status(f"✅ 일괄 생성 완료: {len(generated)}/{len(keywords)}개")
+        return generated
+
+    def prepare_posts_batch(self, keywords):
+        """사전 생성 작업자용: 일괄 생성 후 키워드별 썸네일/동영상까지 준비 {키워드: 결과}"""
+        generated = self.generate_content_batch(keywords)
+        prepared = {}
+        for keyword in keywords:
+            if keyword not in generated:
+                continue
+            try:
+                # 캐시에 저장된 글을 사용하므로 AI를 다시 호출하지 않음
+                result = self.prepare_post(keyword)
+            except Exception as e:
+                print(f"⚠️ 사전 생성 오류 ({keyword}): {type(e).__name__}: {e}")
+                result = None
+            if result is not None:
+                prepared[keyword] = result
+        return prepared
+
+    def _run_posting(self, is_first_run):
+        """AI 글 생성부터 발행까지 한 번의 포스팅 수행"""
+        try:
+            self._update_status("🚀 자동 포스팅 프로세스 시작!")
             
             if self.should_stop:
                 self._update_status("⏹️ 프로세스가 정지되었습니다.")
@@ -4115,34 +4483,18 @@ class NaverBlogAutomation:
 
             self._wait_if_paused()
 
-            # 2-1단계: 썸네일 확인
-            self._update_status("🎨 [2/5] 썸네일 및 동영상 제작 단계")
-            thumbnail_path = self.create_thumbnail(title)
-            if thumbnail_path:
-                self._update_status("✅ 썸네일 확인 완료")
+            # 1~2단계: AI 글 생성 및 썸네일/동영상 (사전 생성된 글이 있으면 사용)
+            if self.pipeline is not None:
+                prepared = self._take_prepared_post()
             else:
-                self._update_status("⚠️ 썸네일 파일 없음 - 계속 진행")
-            
-            # 2-2단계: 동영상 생성 (use_video가 ON이고 썸네일이 있을 경우)
-            video_path = None
-            if self.config.get("use_video", True) and thumbnail_path:
                 try:
-                    self._update_status("🎬 [2-2/5] 동영상 생성 단계")
-                    video_path = self.create_video_from_thumbnail(thumbnail_path)
-                    if video_path:
-                        self._update_status(f"✅ 동영상 생성 완료: {os.path.basename(video_path)}")
-                    else:
-                        self._update_status("⚠️ 동영상 생성 실패 (파일 없음)")
-                except Exception as e:
-                    # 동영상 생성 실패 시 명확한 에러 표시 후 중단
-                    self._update_status(f"❌ 동영상 생성 실패: {str(e)}")
-                    return False
-            elif not self.config.get("use_video", True):
-                self._update_status("⚪ 동영상 기능 OFF - 동영상 생성 스킵")
-            
-            if self.should_stop:
-                self._update_status("⏹️ 프로세스가 정지되었습니다.")
+                    prepared = self._prepare_current_post()
+                finally:
+                    # 미리 만든 썸네일 항목이 남지 않도록 정리 (사용했으면 이미 꺼낸 상태)
+                    self._discard_early_thumbnail(self.current_keyword)
+            if prepared is None:
                 return False
+            title, content, thumbnail_path, video_path = prepared
             
             # 3단계: 브라우저 실행 (첫 실행시에만)
             if is_first_run:
@@ -4186,23 +4538,20 @@ class NaverBlogAutomation:
                 self.move_keyword_to_used(self.current_keyword)
             
             # 남은 키워드 수 확인
-            keywords_file = os.path.join(self.data_dir, "setting", "keywords.txt")
             try:
-                with open(keywords_file, 'r', encoding='utf-8') as f:
-                    remaining_keywords = [line.strip() for line in f if line.strip()]
-                    keyword_count = len(remaining_keywords)
-                    
-                    self._update_status(f"📊 남은 키워드: {keyword_count}개")
-                    
-                    # 30개 미만일 때 경고 (콜백으로 GUI에 전달)
-                    if keyword_count < 30 and keyword_count > 0:
-                        if self.callback:
-                            self.callback(f"⚠️ 경고: 키워드가 {keyword_count}개 남았습니다!")
-                    
-                    # 키워드가 없으면 종료 신호
-                    if keyword_count == 0:
-                        self._update_status("✅ 모든 키워드 포스팅 완료!")
-                        return True
+                keyword_count = self.keyword_store.pending_count()
+                
+                self._update_status(f"📊 남은 키워드: {keyword_count}개")
+                
+                # 30개 미만일 때 경고 (콜백으로 GUI에 전달)
+                if keyword_count < 30 and keyword_count > 0:
+                    if self.callback:
+                        self.callback(f"⚠️ 경고: 키워드가 {keyword_count}개 남았습니다!")
+                
+                # 키워드가 없으면 종료 신호
+                if keyword_count == 0:
+                    self._update_status("✅ 모든 키워드 포스팅 완료!")
+                    return True
             except Exception as e:
                 self._update_status(f"⚠️ 키워드 파일 확인 실패: {str(e)[:50]}")
             
@@ -4244,36 +4593,7 @@ class NaverBlogAutomation:
                 self._update_status("❌ ChatGPT 입력창을 찾을 수 없습니다")
                 return False
             
-            # JavaScript로 직접 입력 (contenteditable div 방식)
-            self.driver.execute_script("""
-                const editor = arguments[0];
-                const text = arguments[1];
-                
-                // 포커스
-                editor.focus();
-                
-                // 기존 내용 삭제
-                editor.innerHTML = '';
-                
-                // 텍스트 입력
-                const p = document.createElement('p');
-                p.textContent = text;
-                editor.appendChild(p);
-                
-                // placeholder 클래스 제거
-                const placeholder = editor.querySelector('.placeholder');
-                if (placeholder) placeholder.remove();
-                
-                // 입력 이벤트 트리거
-                editor.dispatchEvent(new Event('input', { bubbles: true }));
-            """, editor, prompt)
-            
-            time.sleep(0.5)
-            
-            # Enter로 전송
-            editor.send_keys(Keys.ENTER)
-            self._update_status("✅ ChatGPT 프롬프트 전송 성공")
-            return True
+            return self._submit_web_prompt(editor, prompt, "ChatGPT", self.CHATGPT_RESPONSE_SELECTORS)
         except Exception as e:
             error_msg = str(e) if str(e) else type(e).__name__
             self._update_status(f"❌ ChatGPT 프롬프트 전송 실패: {error_msg[:50]}")
@@ -4282,14 +4602,8 @@ class NaverBlogAutomation:
 
     def _count_chatgpt_copy_buttons(self):
         try:
-            # 다양한 복사 버튼 선택자
-            selectors = [
-                "button[data-testid='copy-turn-action-button']",
-                "button[aria-label*='Copy']",
-                "button[aria-label*='복사']",
-            ]
             buttons = []
-            for selector in selectors:
+            for selector in self.CHATGPT_COPY_SELECTORS:
                 try:
                     btns = self.driver.find_elements(By.CSS_SELECTOR, selector)
                     buttons.extend(btns)
@@ -4299,40 +4613,6 @@ class NaverBlogAutomation:
         except Exception:
             return 0
 
-    def _click_chatgpt_copy_latest(self):
-        try:
-            # 다양한 복사 버튼 선택자
-            selectors = [
-                "button[data-testid='copy-turn-action-button']",
-                "button[aria-label*='Copy']",
-                "button[aria-label*='복사']",
-            ]
-            buttons = []
-            for selector in selectors:
-                try:
-                    btns = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    buttons.extend(btns)
-                except:
-                    continue
-            
-            if not buttons:
-                return False
-            
-            # 마지막 버튼 클릭
-            self.driver.execute_script("arguments[0].click();", buttons[-1])
-            return True
-        except Exception:
-            return False
-
-    def _wait_for_chatgpt_copy_button(self, before_count, timeout=180):
-        end_time = time.time() + timeout
-        while time.time() < end_time:
-            self._wait_if_paused()
-            if self._count_chatgpt_copy_buttons() > before_count:
-                return True
-            self._sleep_with_checks(1)
-        return False
-
     def _find_perplexity_editor(self, timeout=12):
         selectors = [
             "div#ask-input[contenteditable='true']",
@@ -4356,49 +4636,30 @@ class NaverBlogAutomation:
             if not editor:
                 return False
             self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", editor)
-            editor.click()
-            ActionChains(self.driver).key_down(Keys.CONTROL).send_keys('a').key_up(Keys.CONTROL).perform()
-            ActionChains(self.driver).send_keys(Keys.BACKSPACE).perform()
-            pyperclip.copy(prompt)
-            ActionChains(self.driver).key_down(Keys.CONTROL).send_keys('v').key_up(Keys.CONTROL).perform()
-            time.sleep(0.2)
-            ActionChains(self.driver).send_keys(Keys.ENTER).perform()
-            return True
+            return self._submit_web_prompt(editor, prompt, "Perplexity", (self.PERPLEXITY_RESPONSE_SELECTOR,))
         except Exception as e:
-            self._update_status(f"?? Perplexity ???? ?? ??: {str(e)}")
+            self._update_status(f"⚠️ Perplexity 프롬프트 입력 실패: {str(e)}")
             return False
 
     def _count_perplexity_copy_buttons(self):
         try:
-            # XPATH로 강력하게 찾기 (aria-label 한/영 지원 및 아이콘 ID 매칭)
-            # 사용자 제공: use xlink:href="#pplx-icon-copy"
-            xpath = "//button[@aria-label='복사' or @aria-label='Copy' or .//use[contains(@href, 'pplx-icon-copy')]]"
-            return len(self.driver.find_elements(By.XPATH, xpath))
+            return len(self.driver.find_elements(By.XPATH, self.PERPLEXITY_COPY_XPATH))
         except Exception:
             return 0
 
-    def _click_perplexity_copy_latest(self):
-        try:
-            xpath = "//button[@aria-label='복사' or @aria-label='Copy' or .//use[contains(@href, 'pplx-icon-copy')]]"
-            buttons = self.driver.find_elements(By.XPATH, xpath)
-            if not buttons:
-                return False
-            self.driver.execute_script("arguments[0].click();", buttons[-1])
-            return True
-        except Exception:
-            return False
-
-    def _wait_for_perplexity_copy_button(self, before_count, timeout=180):
-        end_time = time.time() + timeout
-        while time.time() < end_time:
-            self._wait_if_paused()
-            if self._count_perplexity_copy_buttons() > before_count:
-                return True
-            self._sleep_with_checks(1)
-        return False
+    def quit_driver(self):
+        """이 인스턴스의 브라우저 종료 (웹 AI 전용 브라우저 정리용)"""
+        driver = self.driver
+        self.driver = None
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"⚠️ 브라우저 종료 실패: {e}")
 
     def close(self):
         """브라우저 종료 (프로그램 종료 시에도 브라우저 유지)"""
+        self.lease_keeper.stop()
         if self.driver:
             self._update_status("✅ 프로그램 종료 (브라우저는 계속 실행됩니다)")
             # self.driver.quit()  # 브라우저는 종료하지 않음
@@ -4429,8 +4690,8 @@ from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                               QComboBox, QGroupBox, QTabWidget, QMessageBox,
                               QListView, QButtonGroup, QDialog,
                                QFrame, QScrollArea, QStackedWidget,
-                              QSizePolicy, QSplashScreen)
-from PyQt6.QtCore import Qt, pyqtSignal, QThread, QTimer
+                              QSizePolicy, QSplashScreen, QFileDialog)
+from PyQt6.QtCore import Qt, pyqtSignal, QThread, QTimer, QFileSystemWatcher
 from PyQt6.QtGui import QFont, QIcon, QPalette, QColor, QPixmap, QPainter
 
 # 네이버 컬러 팔레트
@@ -4608,6 +4869,10 @@ class NaverBlogGUI(QMainWindow):
     # 시그널 정의 (스레드에서 메인 스레드로 신호 전달)
     countdown_signal = pyqtSignal(int)
     progress_signal = pyqtSignal(str, bool)  # 진행 상황 업데이트용 (메시지, 덮어쓰기 여부)
+    keyword_count_signal = pyqtSignal(int)  # 남은 키워드 개수 변경 알림
+    settings_status_signal = pyqtSignal(str)  # 설정 탭 진행 현황 업데이트 (백그라운드 작업용)
+    
+    PIPELINE_JOIN_TIMEOUT = 60  # 재시작 시 이전 사전 생성 작업자 종료 대기 시간 (초)
     
     def __init__(self):
         super().__init__()
@@ -4640,6 +4905,13 @@ class NaverBlogGUI(QMainWindow):
             self.base_dir = os.path.dirname(os.path.abspath(__file__))
             self.data_dir = self.base_dir
         
+        # 키워드 큐 (keywords.txt와 동기화, 포스팅 스레드와 같은 인스턴스 공유)
+        self.keyword_store = get_keyword_store(self.data_dir)
+        self.ai_metrics = AIMetricsStore(self.data_dir)  # AI 호출 기록 (사용량 요약 표시용)
+        self.post_pipeline = None  # AI 글 사전 생성 파이프라인
+        self.post_generators = []  # 사전 생성 작업자별 자동화 인스턴스 (웹 AI 전용 브라우저 소유)
+        self._stopping_pipeline = None  # 정지했지만 작업자(브라우저 정리 포함)가 아직 끝나지 않았을 수 있는 파이프라인
+        
         # 초기 크기 및 위치 설정
         self.setGeometry(100, 100, 750, 600)
         self.setMinimumSize(0, 0)  # 최소 크기 제한 해제 (확실하게 적용)
@@ -4653,6 +4925,8 @@ class NaverBlogGUI(QMainWindow):
         # 시그널 연결
         self.countdown_signal.connect(self.start_countdown)
         self.progress_signal.connect(self._update_progress_status_safe)
+        self.keyword_count_signal.connect(self._update_keyword_count_display)
+        self.settings_status_signal.connect(self._update_settings_status)
         
         # 아이콘 설정 (모든 창에 적용)
         # 1. base_dir (내부 리소스) 확인
@@ -4822,6 +5096,7 @@ class NaverBlogGUI(QMainWindow):
         # GUI 구성
         self._create_gui()
         self._apply_config()
+        self._setup_keyword_watcher()
     
     def load_config(self):
         """설정 파일 로드 (UTF-8)"""
@@ -5404,6 +5679,16 @@ class NaverBlogGUI(QMainWindow):
         
         status_card.content_layout.addLayout(interval_status_layout)
         
+        # AI 사용량 요약 (최근 글 기준 글당 토큰/소요 시간, 자세한 값은 툴팁)
+        ai_usage_layout = QHBoxLayout()
+        self.ai_usage_label = QLabel("📊 AI 사용량: 기록 없음")
+        self.ai_usage_label.setFont(QFont(self.font_family, 13))
+        self.ai_usage_label.setStyleSheet(f"color: #000000; border: none;")
+        ai_usage_layout.addWidget(self.ai_usage_label)
+        ai_usage_layout.addStretch()
+        
+        status_card.content_layout.addLayout(ai_usage_layout)
+        
 
         
         # 썸네일 기능 상태
@@ -6314,6 +6599,13 @@ class NaverBlogGUI(QMainWindow):
             }}
         """)
         keyword_open_btn.clicked.connect(lambda: self.open_file("setting/keywords.txt"))
+        
+        self.keyword_import_btn = QPushButton("📥 가져오기")
+        self.keyword_import_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.keyword_import_btn.setFixedSize(90, 24)
+        self.keyword_import_btn.setStyleSheet(keyword_open_btn.styleSheet())
+        self.keyword_import_btn.clicked.connect(self.import_keywords_bulk)
+        keyword_layout.addWidget(self.keyword_import_btn)
         keyword_layout.addWidget(keyword_open_btn)
         
         file_grid.addWidget(keyword_widget, 0, 0)
@@ -6955,48 +7247,15 @@ class NaverBlogGUI(QMainWindow):
         """)
 
         # 키워드 개수
-        keyword_count = self.count_keywords()
-        self.keyword_count_label.setText(f"📦 키워드 개수: {keyword_count}개")
-        
-        if keyword_count > 0:
-            self.keyword_count_label.setStyleSheet(f"color: #000000; border: none;")
-            self.keyword_setup_btn.setText("변경하기")
-            self.keyword_setup_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {NAVER_GREEN};
-                    color: white;
-                    border: none;
-                    border-radius: 5px;
-                    padding: 3px 10px;
-                    font-size: 13px;
-                }}
-                QPushButton:hover {{
-                    background-color: #00C73C;
-                }}
-            """)
-            self.keyword_setup_btn.show()
-        else:
-            self.keyword_count_label.setStyleSheet(f"color: #000000; border: none;")
-            self.keyword_setup_btn.setText("설정하기")
-            self.keyword_setup_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {NAVER_RED};
-                    color: white;
-                    border: none;
-                    border-radius: 5px;
-                    padding: 3px 10px;
-                    font-size: 13px;
-                }}
-                QPushButton:hover {{
-                    background-color: #D32F2F;
-                }}
-            """)
-            self.keyword_setup_btn.show()
+        self._update_keyword_count_display(self.count_keywords())
         
         # 발행 간격
         interval_text = self._get_interval_display_text()
         self.interval_label.setText(f"⏱️ 발행 간격: {interval_text}분")
         
+        # AI 사용량 요약
+        self._update_ai_usage_display()
+        
         # 썸네일 폴더 JPG 존재 여부 상태
         thumbnail_dir = os.path.join(self.data_dir, "setting", "image")
         has_jpg = False
@@ -7134,6 +7393,33 @@ class NaverBlogGUI(QMainWindow):
                 }}
             """)
     
+    def _update_ai_usage_display(self):
+        """최근 AI 호출 기록으로 글당 토큰/소요 시간 표시 (할당량 산정용)"""
+        try:
+            summary = self.ai_metrics.summary()
+        except sqlite3.Error as e:
+            print(f"⚠️ AI 사용량 조회 실패: {e}")
+            return
+        if not summary["succeeded"]:
+            self.ai_usage_label.setText("📊 AI 사용량: 기록 없음")
+            self.ai_usage_label.setToolTip("")
+            return
+        self.ai_usage_label.setText(
+            f"📊 AI 사용량: 글당 {summary['tokens_per_post']:,.0f}토큰 · "
+            f"{summary['seconds_per_post']:.1f}초 (최근 {summary['succeeded']}개)"
+        )
+        backends = ", ".join(
+            f"{BACKEND_NAMES.get(backend, backend)} {count}개" for backend, count in summary["backends"].items()
+        )
+        self.ai_usage_label.setToolTip(
+            f"최근 요청 {summary['requests']}개 중 성공 {summary['succeeded']}개 (발행 {summary['posted']}개)\n"
+            f"글당 소요 시간: 평균 {summary['seconds_per_post']:.1f}초 / p95 {summary['p95_seconds']:.1f}초\n"
+            f"글당 토큰: {summary['tokens_per_post']:,.0f} (입력+출력)\n"
+            f"예상 비용: 글당 ${summary['cost_per_post']:.4f} / 합계 ${summary['total_cost']:.4f}\n"
+            f"API 재시도: {summary['retries']}회\n"
+            f"백엔드: {backends}"
+        )
+
     def _update_license_info(self):
         """라이선스 정보 업데이트"""
         try:
@@ -7172,13 +7458,71 @@ class NaverBlogGUI(QMainWindow):
             self.license_period_label.setText("📅 사용기간: 확인 실패")
             self.license_period_label.setStyleSheet(f"color: #D32F2F; border: none;")
     
+    def _update_keyword_count_display(self, keyword_count):
+        """키워드 개수 상태 표시 (keyword_count_signal로 메인 스레드에서 호출)"""
+        self.keyword_count_label.setText(f"📦 키워드 개수: {keyword_count}개")
+        
+        if keyword_count > 0:
+            self.keyword_count_label.setStyleSheet(f"color: #000000; border: none;")
+            self.keyword_setup_btn.setText("변경하기")
+            self.keyword_setup_btn.setStyleSheet(f"""
+                QPushButton {{
+                    background-color: {NAVER_GREEN};
+                    color: white;
+                    border: none;
+                    border-radius: 5px;
+                    padding: 3px 10px;
+                    font-size: 13px;
+                }}
+                QPushButton:hover {{
+                    background-color: #00C73C;
+                }}
+            """)
+            self.keyword_setup_btn.show()
+        else:
+            self.keyword_count_label.setStyleSheet(f"color: #000000; border: none;")
+            self.keyword_setup_btn.setText("설정하기")
+            self.keyword_setup_btn.setStyleSheet(f"""
+                QPushButton {{
+                    background-color: {NAVER_RED};
+                    color: white;
+                    border: none;
+                    border-radius: 5px;
+                    padding: 3px 10px;
+                    font-size: 13px;
+                }}
+                QPushButton:hover {{
+                    background-color: #D32F2F;
+                }}
+            """)
+            self.keyword_setup_btn.show()
+    
+    def _setup_keyword_watcher(self):
+        """keywords.txt / 키워드 DB 변경 감시 (다른 프로그램·프로세스에서 수정한 경우)"""
+        # 포스팅 스레드의 변경은 개수 알림으로, 외부 변경은 파일 감시로 반영
+        self.keyword_store.add_count_listener(self.keyword_count_signal.emit)
+        self.keyword_watcher = QFileSystemWatcher(self)
+        for path in (self.keyword_store.keywords_file, self.keyword_store.db_path):
+            if os.path.exists(path):
+                self.keyword_watcher.addPath(path)
+        self.keyword_watcher.fileChanged.connect(self._on_keyword_file_changed)
+    
+    def _on_keyword_file_changed(self, path):
+        """감시 중인 키워드 파일 변경 시 개수 갱신"""
+        # 편집기가 파일을 교체 저장하면 감시 목록에서 빠지므로 다시 등록
+        if os.path.exists(path) and path not in self.keyword_watcher.files():
+            self.keyword_watcher.addPath(path)
+        try:
+            # 변경이 없으면 캐시 값 반환, 변경 시 keyword_count_signal로 표시 갱신
+            self.keyword_store.pending_count()
+        except Exception as e:
+            print(f"⚠️ 키워드 개수 갱신 실패: {e}")
+    
     def count_keywords(self):
         """키워드 개수 카운트"""
         try:
-            keywords_file = os.path.join(self.data_dir, "setting", "keywords.txt")
-            if os.path.exists(keywords_file):
-                with open(keywords_file, "r", encoding="utf-8") as f:
-                    return len([line.strip() for line in f if line.strip() and not line.strip().startswith('#')])
+            if os.path.exists(self.keyword_store.keywords_file):
+                return self.keyword_store.pending_count()
         except:
             pass
         return 0
@@ -7551,6 +7895,13 @@ class NaverBlogGUI(QMainWindow):
                 self._update_settings_status(f"❌ 폴더 열기 실패: {str(e)}")
             return
         
+        # 키워드 파일은 큐의 최신 상태로 내보낸 후 열기
+        if "keywords.txt" in filename and os.path.exists(file_path):
+            try:
+                self.keyword_store.export_keywords_file()
+            except Exception as e:
+                self._update_settings_status(f"⚠️ 키워드 내보내기 실패: {str(e)}")
+        
         # 파일인 경우
         if not os.path.exists(file_path):
             # 파일이 없으면 생성
@@ -7582,6 +7933,44 @@ class NaverBlogGUI(QMainWindow):
         except Exception as e:
             self._update_settings_status(f"❌ 파일 열기 실패: {str(e)}")
     
+    def import_keywords_bulk(self):
+        """대용량 키워드 목록을 백그라운드에서 대기열에 추가"""
+        source_path, _ = QFileDialog.getOpenFileName(
+            self, "가져올 키워드 파일 선택", self.data_dir, "텍스트 파일 (*.txt);;모든 파일 (*)"
+        )
+        if not source_path:
+            return
+        
+        self.keyword_import_btn.setEnabled(False)
+        self._update_settings_status(f"📥 키워드 가져오기 시작: {os.path.basename(source_path)}")
+        
+        last_step = {"value": -1}
+        
+        def report(done, total, stats):
+            percent = done * 100 // total if total else 100
+            # 로그가 넘치지 않도록 10% 단위로만 표시
+            if percent // 10 == last_step["value"]:
+                return
+            last_step["value"] = percent // 10
+            self.settings_status_signal.emit(
+                f"⏳ 키워드 가져오는 중... {percent}% (읽음 {stats['read']:,} / 추가 {stats['added']:,})"
+            )
+        
+        def run_import():
+            try:
+                stats = self.keyword_store.bulk_import(source_path, progress=report)
+                self.settings_status_signal.emit(
+                    f"✅ 키워드 {stats['added']:,}개 추가 "
+                    f"(중복 제외: 대기 {stats['pending_duplicates']:,} / 사용 {stats['used_duplicates']:,})"
+                )
+            except Exception as e:
+                self.settings_status_signal.emit(f"❌ 키워드 가져오기 실패: {str(e)}")
+            finally:
+                # 버튼 상태는 메인 스레드에서 변경
+                QTimer.singleShot(0, self, lambda: self.keyword_import_btn.setEnabled(True))
+        
+        threading.Thread(target=run_import, daemon=True).start()
+    
     def save_api_key(self):
         """API 키 저장"""
         gemini_key = self.gemini_api_entry.text().strip()
@@ -7863,6 +8252,11 @@ class NaverBlogGUI(QMainWindow):
         def run_automation():
             # 무한 반복 (is_running이 False가 될 때까지)
             is_first_run_flag = is_first_start
+            keyword_waited = False  # 키워드 대기 후에는 인스턴스를 다시 만들지 않음
+            
+            # 사전 생성 파이프라인 (API 모드에서 pregenerate_posts > 0일 때만)
+            if self.post_pipeline is None:
+                self._start_post_pipeline(api_key)
             
             while self.is_running and not self.stop_requested:
                 try:
@@ -7873,7 +8267,7 @@ class NaverBlogGUI(QMainWindow):
                     external_link_text = self.link_text_entry.text() if self.use_link_checkbox.isChecked() else ""
                     
                     # 첫 실행시 또는 인스턴스가 없을 때 자동화 인스턴스 생성
-                    if is_first_run_flag or not self.automation:
+                    if (is_first_run_flag and not keyword_waited) or not self.automation:
                         # 블로그 주소 처음 (아이디만 있으면 전체 URL로 변환)
                         blog_address = self.config.get("blog_address", "")
                         related_posts_title = self.config.get("related_posts_title", "함께 보면 좋은 글")
@@ -7902,6 +8296,8 @@ class NaverBlogGUI(QMainWindow):
                         if not is_first_run_flag:
                             print("⚠️ 자동화 인스턴스가 없어서 재생성했습니다")
                     
+                    self.automation.pipeline = self.post_pipeline
+                    
                     # 자동화 실행
                     if not is_first_run_flag:
                         print(f"🔄 [DEBUG] automation.run(is_first_run={is_first_run_flag}) 호출")
@@ -7911,6 +8307,14 @@ class NaverBlogGUI(QMainWindow):
                     # 첫 실행 플래그 해제 (두 번째부터는 False)
                     is_first_run_flag = False
                     
+                    # 예약 키워드만 남았거나 다른 작업자가 모두 임대 중인 경우: 실패/소진이 아니므로 브라우저를 유지한 채 대기 후 재시도
+                    if result == NaverBlogAutomation.KEYWORD_WAIT:
+                        keyword_waited = True
+                        # 첫 실행에서 기다렸다면 브라우저가 아직 없으므로 다음 시도를 첫 실행으로 처리
+                        is_first_run_flag = self.automation.driver is None
+                        self._wait_for_keyword(self.automation.keyword_wait_until)
+                        continue
+                    
                     # 실패 시 원인 구분하여 처리
                     if result is False:
                         if self.stop_requested or not self.is_running:
@@ -7972,33 +8376,31 @@ class NaverBlogGUI(QMainWindow):
                     
                     # 남은 키워드 수 확인 및 30개 미만 경고
                     try:
-                        keywords_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "setting", "keywords.txt")
-                        with open(keywords_file, 'r', encoding='utf-8') as f:
-                            remaining_keywords = [line.strip() for line in f if line.strip()]
-                            keyword_count = len(remaining_keywords)
+                        keyword_count = self.keyword_store.pending_count()
+                        
+                        if keyword_count < 30 and keyword_count > 0:
+                            # 30개 미만 경고창
+                            QTimer.singleShot(100, lambda: self.show_message(
+                                "⚠️ 경고",
+                                f"키워드가 {keyword_count}개 남았습니다!\n\n키워드를 추가하시기 바랍니다.",
+                                "warning"
+                            ))
+                        elif keyword_count == 0:
+                            # 키워드 소진 시 자동 중지
+                            self.update_progress_status("✅ 모든 키워드 포스팅 완료!")
+                            self.is_running = False
+                            self.start_btn.setEnabled(True)
+                            self.stop_btn.setEnabled(False)
+                            self.pause_btn.setEnabled(False)
+                            self.resume_btn.setEnabled(False)
+                            self.keyword_store.export_keywords_file()
                             
-                            if keyword_count < 30 and keyword_count > 0:
-                                # 30개 미만 경고창
-                                QTimer.singleShot(100, lambda: self.show_message(
-                                    "⚠️ 경고",
-                                    f"키워드가 {keyword_count}개 남았습니다!\n\n키워드를 추가하시기 바랍니다.",
-                                    "warning"
-                                ))
-                            elif keyword_count == 0:
-                                # 키워드 소진 시 자동 중지
-                                self.update_progress_status("✅ 모든 키워드 포스팅 완료!")
-                                self.is_running = False
-                                self.start_btn.setEnabled(True)
-                                self.stop_btn.setEnabled(False)
-                                self.pause_btn.setEnabled(False)
-                                self.resume_btn.setEnabled(False)
-                                
-                                QTimer.singleShot(100, lambda: self.show_message(
-                                    "✅ 완료",
-                                    "모든 키워드의 포스팅이 완료되었습니다!",
-                                    "info"
-                                ))
-                                break
+                            QTimer.singleShot(100, lambda: self.show_message(
+                                "✅ 완료",
+                                "모든 키워드의 포스팅이 완료되었습니다!",
+                                "info"
+                            ))
+                            break
                     except Exception as e:
                         print(f"⚠️ 키워드 파일 확인 실패: {e}")
                     
@@ -8021,15 +8423,106 @@ class NaverBlogGUI(QMainWindow):
                     self.pause_btn.setEnabled(False)
                     self.start_btn.setEnabled(True)
                     break
+            
+            # 포스팅 루프 종료 시 사전 생성도 정지
+            if not self.is_running:
+                self._stop_post_pipeline()
         
         thread = threading.Thread(target=run_automation, daemon=True)
         thread.start()
     
+    def _start_post_pipeline(self, api_key):
+        """AI 글 사전 생성 작업자 시작 (브라우저 포스팅 중에 다음 글을 미리 생성)"""
+        depth = int(self.config.get("pregenerate_posts", 0) or 0)
+        web_mode = self.config.get("gemini_mode", "api") == "web"
+        separate_browser = web_mode and self.config.get("web_ai_separate_browser", False)
+        if web_mode and not separate_browser:
+            # 웹 AI가 포스팅 브라우저를 같이 쓰면 생성과 발행을 겹칠 수 없음
+            return
+        if separate_browser:
+            depth = max(depth, 1)
+        if depth <= 0:
+            return
+        previous = self._stopping_pipeline
+        if previous is not None:
+            # 이전 작업자가 AI 전용 브라우저(같은 프로필)를 닫기 전에 새로 띄우면 프로필 사용 중 오류가 나므로 종료 대기
+            if not previous.join(timeout=self.PIPELINE_JOIN_TIMEOUT):
+                self.update_progress_status("⚠️ 이전 사전 생성 작업자가 아직 종료되지 않아 이번에는 순차 생성으로 진행합니다")
+                return
+            self._stopping_pipeline = None
+        try:
+            workers = max(1, int(self.config.get("pregenerate_workers", 1) or 1))
+            if separate_browser:
+                # 웹 AI 전용 브라우저(별도 프로필)는 작업자 스레드 하나가 소유 (Selenium 세션은 스레드 하나에서만 사용)
+                workers = 1
+            # 생성 인스턴스는 현재 키워드/오류/스트리밍 썸네일 상태를 가지므로 작업자마다 따로 만듦
+            generators = [
+                NaverBlogAutomation(
+                    naver_id=self.naver_id_entry.text(),
+                    naver_pw=self.naver_pw_entry.text(),
+                    api_key=api_key,
+                    callback=self._log_generator_message,  # 로그인/AI 로그인 필요 안내를 GUI에 표시
+                    config=self.config
+                )
+                for _ in range(workers)
+            ]
+            on_exit = None
+            if separate_browser:
+                generators[0].profile_dirname = NaverBlogAutomation.AI_PROFILE_DIRNAME
+                on_exit = generators[0].quit_driver
+            self.post_pipeline = PostPipeline(
+                [(generator.prepare_post, generator.prepare_posts_batch) for generator in generators],
+                self.keyword_store,
+                depth=depth,
+                status=self.log_message,
+                batch_size=self.config.get("batch_generation_size", 1),
+                on_exit=on_exit,
+            )
+            self.post_generators = generators
+            self.post_pipeline.start()
+            if separate_browser:
+                self.log_message("🌐 웹 AI 전용 브라우저에서 다음 글을 미리 생성합니다")
+        except Exception as e:
+            self.post_pipeline = None
+            self.update_progress_status(f"⚠️ 사전 생성 시작 실패 - 순차 생성으로 진행: {e}")
+    
+    def _stop_post_pipeline(self):
+        """사전 생성 작업자 정지 (사용하지 않은 글의 키워드는 대기열로 반환)"""
+        pipeline = self.post_pipeline
+        generators = self.post_generators
+        self.post_pipeline = None
+        self.post_generators = []
+        for generator in generators:
+            # 웹 AI 대기 중인 작업자가 바로 빠져나오도록 정지 표시 (브라우저는 작업자 스레드가 종료 시 닫음)
+            generator.should_stop = True
+        if pipeline is not None:
+            try:
+                pipeline.stop()
+            except Exception as e:
+                print(f"⚠️ 사전 생성 정지 실패: {e}")
+            # 작업자 스레드는 진행 중인 생성을 마치고 on_exit에서 브라우저를 닫음 (다음 시작 시 종료 대기)
+            self._stopping_pipeline = pipeline
+    
+    def _log_generator_message(self, message, overwrite=False):
+        """사전 생성 인스턴스 로그 (덮어쓰는 진행률 메시지는 포스팅 로그와 섞이지 않도록 터미널에만 출력)"""
+        if overwrite or message.startswith("KEYWORD_"):
+            return
+        self.log_message(f"[사전 생성] {message}")
+    
+    def _wait_for_keyword(self, until):
+        """임대할 키워드가 생길 때까지 대기 (정지 요청 시 바로 반환)"""
+        until_text = datetime.fromtimestamp(until).strftime("%H:%M:%S")
+        self.update_progress_status(f"⏰ 지금 발행할 키워드가 없습니다 - {until_text}에 다시 확인합니다")
+        print(f"⏰ 키워드 대기: {until_text}까지")
+        while self.is_running and not self.stop_requested and time.time() < until:
+            time.sleep(1)
+    
     def stop_posting(self):
         """포스팅 정지"""
         self.is_running = False
         self.is_paused = False
         self.stop_requested = True
+        self._stop_post_pipeline()
         
         # 실행 중인 자동화 인스턴스 정지
         if self.automation:
@@ -8051,6 +8544,11 @@ class NaverBlogGUI(QMainWindow):
         self.resume_btn.setEnabled(False)
         self.update_progress_status("⏹️ 포스팅을 정지했습니다.")
         print("⏹️ 포스팅을 정지했습니다.")
+        # 남은 키워드를 keywords.txt에 반영
+        try:
+            self.keyword_store.export_keywords_file()
+        except Exception as e:
+            print(f"⚠️ 키워드 내보내기 실패: {e}")
         # UI 상태 갱신 (키워드 개수 등)
         self.update_status_display()
     
@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('setting/david153.ico', 'setting')],
-    hiddenimports=['PyQt6.QtCore', 'PyQt6.QtGui', 'PyQt6.QtWidgets', 'PyQt6.sip', 'license_check'],
+    hiddenimports=['PyQt6.QtCore', 'PyQt6.QtGui', 'PyQt6.QtWidgets', 'PyQt6.sip', 'license_check', 'keyword_store', 'prompt_store', 'post_pipeline', 'ai_response_parser', 'ai_cache', 'gemini_client', 'web_completion', 'ai_router', 'ai_metrics', 'background_cache', 'font_resolver', 'thumbnail_render'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+AI 응답 캐시 모듈 (SQLite 기반)
+
+(키워드, 프롬프트 템플릿 해시, 모델)을 키로 파싱이 끝난 제목/본문을 setting/ai_cache.db에 보관한다.
+글 생성 후 편집기/업로드/발행 단계에서 실패해 같은 키워드를 다시 시도할 때
+AI를 다시 호출하지 않고 캐시된 글을 사용한다. 항목은 TTL이 지나면 무시되며,
+포스팅에 성공한 키워드의 항목은 삭제한다.
+
+prewarm_from_results()는 setting/result의 기존 *_raw.txt 파일로 캐시를 미리 채운다 (prewarm_ai_cache.py).
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime
+
+from keyword_store import normalize_keyword
+
+# AI 글 생성 시 저장하는 원문 파일명: {키워드}_{YYYYmmdd_HHMMSS}_raw.txt
+RAW_FILE_PATTERN = re.compile(r"^(?P<keyword>.+)_(?P<stamp>\d{8}_\d{6})_raw\.txt$")
+
+
+def model_key(config, api_model="gemini-2.5-flash-lite"):
+    """설정(config.json)에 따른 캐시용 모델 식별자 (API 모델명 또는 web-제공자)"""
+    config = config or {}
+    if config.get("gemini_mode", "api") == "web":
+        provider = (config.get("web_ai_provider", "gemini") or "gemini").lower()
+        return f"web-{provider}"
+    return api_model
+
+
+# 웹 AI 백엔드 → 캐시용 모델 식별자 (model_key와 같은 web-제공자 형식)
+WEB_BACKEND_MODELS = {
+    "gemini_web": "web-gemini",
+    "gpt_web": "web-gpt",
+    "perplexity_web": "web-perplexity",
+}
+
+
+def backend_model_key(backend, api_model="gemini-2.5-flash-lite"):
+    """실제로 응답한 백엔드의 캐시용 모델 식별자 (백엔드 전환 시 설정이 아닌 응답한 쪽 기준으로 저장)"""
+    return WEB_BACKEND_MODELS.get(backend, api_model)
+
+
+class AIResponseCache:
+    """키워드 + 템플릿 해시 + 모델 기준 AI 응답 캐시"""
+
+    DB_FILENAME = "ai_cache.db"
+    DEFAULT_TTL = 7 * 24 * 3600  # result 폴더 보관 기간과 동일 (1주일)
+
+    def __init__(self, data_dir, ttl=None):
+        self.setting_dir = os.path.join(data_dir, "setting")
+        os.makedirs(self.setting_dir, exist_ok=True)
+        self.db_path = os.path.join(self.setting_dir, self.DB_FILENAME)
+        self.ttl = ttl or self.DEFAULT_TTL
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self):
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=DELETE")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    cache_key TEXT PRIMARY KEY,
+                    norm_keyword TEXT NOT NULL,
+                    template_hash TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    body TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_keyword ON responses (norm_keyword)")
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def cache_key(keyword, template_hash, model):
+        """캐시 키 (정규화한 키워드 기준이므로 공백/대소문자 차이는 같은 항목)"""
+        source = "\x1f".join((normalize_keyword(keyword), template_hash or "", model or ""))
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def get(self, keyword, template_hash, model):
+        """TTL 이내의 캐시된 (제목, 본문) 반환, 없으면 None"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT title, body FROM responses WHERE cache_key = ? AND created_at >= ?",
+                (self.cache_key(keyword, template_hash, model), time.time() - self.ttl),
+            ).fetchone()
+        finally:
+            conn.close()
+        return (row[0], row[1]) if row else None
+
+    def get_any(self, keyword, template_hash, models):
+        """models 중 어느 모델로든 TTL 이내에 캐시된 가장 최근 (제목, 본문) 반환, 없으면 None"""
+        keys = [self.cache_key(keyword, template_hash, model) for model in models]
+        if not keys:
+            return None
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                f"SELECT title, body FROM responses WHERE cache_key IN ({', '.join('?' * len(keys))}) "
+                "AND created_at >= ? ORDER BY created_at DESC LIMIT 1",
+                (*keys, time.time() - self.ttl),
+            ).fetchone()
+        finally:
+            conn.close()
+        return (row[0], row[1]) if row else None
+
+    def put(self, keyword, template_hash, model, title, body, created_at=None):
+        """파싱이 끝난 제목/본문 저장 (같은 키는 덮어씀)"""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(cache_key, norm_keyword, template_hash, model, title, body, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.cache_key(keyword, template_hash, model),
+                    normalize_keyword(keyword),
+                    template_hash or "",
+                    model or "",
+                    title,
+                    body,
+                    created_at or time.time(),
+                ),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def discard_keyword(self, keyword):
+        """포스팅에 성공한 키워드의 캐시 항목 삭제 (모든 템플릿/모델)"""
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM responses WHERE norm_keyword = ?", (normalize_keyword(keyword),))
+            conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def prewarm_from_results(self, result_dir, template_hash, model, parse, skip=None, progress=None):
+        """result 폴더의 *_raw.txt 파일로 캐시 채우기, 추가한 개수 반환
+
+        parse(원문)은 (제목, 본문)을 반환해야 하며, 파일명의 시각을 생성 시각으로 사용하므로
+        TTL이 지난 원문은 건너뛴다. 같은 키워드의 원문이 여러 개면 가장 최근 것을 사용한다.
+        skip(키워드)가 True인 키워드(이미 발행한 키워드 등)는 넣지 않는다.
+        """
+        if not os.path.isdir(result_dir):
+            return 0
+        latest = {}
+        for name in os.listdir(result_dir):
+            match = RAW_FILE_PATTERN.match(name)
+            if not match:
+                continue
+            try:
+                created_at = datetime.strptime(match.group("stamp"), "%Y%m%d_%H%M%S").timestamp()
+            except ValueError:
+                continue
+            keyword = match.group("keyword")
+            key = normalize_keyword(keyword)
+            if key not in latest or latest[key][0] < created_at:
+                latest[key] = (created_at, keyword, name)
+
+        min_created = time.time() - self.ttl
+        added = 0
+        candidates = [
+            item for item in latest.values()
+            if item[0] >= min_created and not (skip and skip(item[1]))
+        ]
+        for index, (created_at, keyword, name) in enumerate(candidates, 1):
+            try:
+                with open(os.path.join(result_dir, name), "r", encoding="utf-8") as f:
+                    content = f.read()
+                title, body = parse(content)
+            except Exception as e:
+                print(f"⚠️ 원문 읽기 실패: {name} ({e})")
+                continue
+            if title and body:
+                self.put(keyword, template_hash, model, title, body, created_at=created_at)
+                added += 1
+            if progress:
+                progress(index, len(candidates), keyword)
+        return added
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+AI 호출 기록 모듈 (SQLite 기반)
+
+글 생성 요청마다 백엔드 호출 하나를 한 행으로 setting/ai_metrics.db에 남긴다.
+(키워드, 요청 ID, 백엔드, 모델, 성공 여부, 소요 시간, 재시도 수, 입력/캐시/출력 토큰, 예상 비용)
+백엔드를 바꿔 가며 다시 시도한 호출은 같은 요청 ID로 묶이며, 발행에 성공한 키워드는 posted로 표시한다.
+
+summary()는 최근 요청들의 글당 토큰/소요 시간을 집계하여 GUI에서 할당량 산정에 사용한다.
+"""
+
+import os
+import sqlite3
+import time
+
+from keyword_store import normalize_keyword
+
+# 모델별 100만 토큰당 가격 (USD): (입력, 캐시된 입력, 출력), 설정의 gemini_prices로 덮어쓸 수 있음
+DEFAULT_PRICES = {
+    "gemini-2.5-flash-lite": (0.10, 0.025, 0.40),
+    "gemini-2.5-flash": (0.30, 0.075, 2.50),
+}
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+class AIMetricsStore:
+    """AI 호출 기록 저장소"""
+
+    DB_FILENAME = "ai_metrics.db"
+    RETENTION = 90 * 24 * 3600  # 기록 보관 기간 (90일)
+    SUMMARY_WINDOW = 50  # summary() 기본 집계 요청 수
+
+    def __init__(self, data_dir, prices=None):
+        setting_dir = os.path.join(data_dir, "setting")
+        os.makedirs(setting_dir, exist_ok=True)
+        self.db_path = os.path.join(setting_dir, self.DB_FILENAME)
+        self.prices = dict(DEFAULT_PRICES)
+        for model, price in (prices or {}).items():
+            self.prices[model] = tuple(price)
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self):
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=DELETE")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ai_calls (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    request_id TEXT NOT NULL,
+                    keyword TEXT NOT NULL,
+                    norm_keyword TEXT NOT NULL,
+                    backend TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    ok INTEGER NOT NULL,
+                    seconds REAL NOT NULL,
+                    retries INTEGER NOT NULL DEFAULT 0,
+                    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+                    cached_tokens INTEGER NOT NULL DEFAULT 0,
+                    output_tokens INTEGER NOT NULL DEFAULT 0,
+                    cost REAL NOT NULL DEFAULT 0,
+                    posted INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_ai_calls_request ON ai_calls (request_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_ai_calls_keyword ON ai_calls (norm_keyword)")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def estimate_cost(self, model, prompt_tokens, cached_tokens, output_tokens):
+        """예상 비용 (USD, 가격을 모르는 모델/웹 AI는 0)"""
+        price = self.prices.get(model)
+        if not price:
+            return 0.0
+        input_price, cached_price, output_price = price
+        uncached = max(0, prompt_tokens - cached_tokens)
+        return (uncached * input_price + cached_tokens * cached_price + output_tokens * output_price) / 1_000_000
+
+    def record_call(self, request_id, keyword, backend, model, ok, seconds, retries=0,
+                    prompt_tokens=0, cached_tokens=0, output_tokens=0):
+        """백엔드 호출 하나 기록"""
+        cost = self.estimate_cost(model, prompt_tokens, cached_tokens, output_tokens)
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT INTO ai_calls (request_id, keyword, norm_keyword, backend, model, ok, seconds, retries, "
+                "prompt_tokens, cached_tokens, output_tokens, cost, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    request_id, keyword, normalize_keyword(keyword), backend, model or "", int(bool(ok)),
+                    float(seconds), int(retries), int(prompt_tokens), int(cached_tokens), int(output_tokens),
+                    cost, time.time(),
+                ),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def mark_posted(self, keyword):
+        """발행에 성공한 키워드의 마지막 성공 요청을 posted로 표시하고 오래된 기록 정리"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT request_id FROM ai_calls WHERE norm_keyword = ? AND ok = 1 ORDER BY id DESC LIMIT 1",
+                (normalize_keyword(keyword),),
+            ).fetchone()
+            if row:
+                conn.execute("UPDATE ai_calls SET posted = 1 WHERE request_id = ?", (row[0],))
+            conn.execute("DELETE FROM ai_calls WHERE created_at < ?", (time.time() - self.RETENTION,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def discard_keyword(self, keyword):
+        """키워드의 호출 기록 삭제 (벤치마크 등 실제 사용이 아닌 기록 정리용), 삭제한 행 수 반환"""
+        conn = self._connect()
+        try:
+            cursor = conn.execute("DELETE FROM ai_calls WHERE norm_keyword = ?", (normalize_keyword(keyword),))
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def summary(self, limit=None):
+        """최근 limit개 요청 집계
+
+        {requests, succeeded, posted, tokens_per_post, seconds_per_post, p95_seconds,
+         cost_per_post, total_cost, retries, backends: {백엔드: 성공 요청 수}}
+        글당 값은 성공한 요청 기준이며, 실패 후 다른 백엔드로 성공한 요청은 실패한 호출의 시간/토큰도 포함한다.
+        """
+        limit = limit or self.SUMMARY_WINDOW
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                """
+                SELECT request_id, MAX(ok), MAX(posted), SUM(seconds), SUM(retries),
+                       SUM(prompt_tokens + output_tokens), SUM(cost),
+                       MAX(CASE WHEN ok = 1 THEN backend END)
+                FROM ai_calls
+                WHERE request_id IN (
+                    SELECT request_id FROM ai_calls GROUP BY request_id ORDER BY MAX(id) DESC LIMIT ?
+                )
+                GROUP BY request_id
+                """,
+                (limit,),
+            ).fetchall()
+        finally:
+            conn.close()
+
+        succeeded = [row for row in rows if row[1]]
+        seconds = [row[3] for row in succeeded]
+        backends = {}
+        for row in succeeded:
+            backends[row[7]] = backends.get(row[7], 0) + 1
+        count = len(succeeded)
+        total_cost = sum(row[6] for row in rows)
+        return {
+            "requests": len(rows),
+            "succeeded": count,
+            "posted": sum(1 for row in rows if row[2]),
+            "tokens_per_post": sum(row[5] for row in succeeded) / count if count else 0.0,
+            "seconds_per_post": sum(seconds) / count if count else 0.0,
+            "p95_seconds": _percentile(seconds, 0.95),
+            "cost_per_post": sum(row[6] for row in succeeded) / count if count else 0.0,
+            "total_cost": total_cost,
+            "retries": sum(row[4] for row in rows),
+            "backends": backends,
+        }
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+"""
+AI 응답 파싱 모듈
+
+Gemini/ChatGPT/Perplexity 응답 원문을 제목/서론/소제목/본문으로 분리하고
+네이버 글쓰기에 입력할 본문 문자열로 구성한다.
+자동화 본체와 캐시 미리 채우기 도구(prewarm_ai_cache.py)가 함께 사용한다.
+
+JSON 출력 모드(gemini_json_mode)에서는 POST_RESPONSE_SCHEMA로 응답 구조를 지정하고
+parse_json_response()로 검증하여, 형식이 틀린 응답은 브라우저 작업 전에 바로 다시 요청한다.
+"""
+
+import json
+import re
+
+# 라벨 줄 형식: "제목", "소제목 2:", "본문3" (단독) / "제목: 내용" (같은 줄, 내용은 group 2)
+LABEL_PATTERN = re.compile(r"^(제목|서론|소제목\s*[1-3]?|본문\s*[1-3]?)\s*(?:[:：]?\s*$|[:：.]?\s+(.+)$)")
+# 라벨 첫 글자 → 구간 종류 (정규식 검사 전 빠른 거르기용)
+LABEL_KINDS = {"제": "title", "서": "intro", "소": "subtitle", "본": "body"}
+
+
+def _store_section(kind, lines, parsed, sections):
+    """라벨 구간 하나를 반영 (parsed = [제목, 서론])"""
+    if kind == "title":
+        parsed[0] = lines[0]
+    elif kind == "intro":
+        parsed[1] = "\n".join(lines)
+    elif kind == "subtitle":
+        sections.append([lines[0], ""])
+    elif kind == "body":
+        text = "\n".join(lines)
+        if not sections:
+            sections.append(["", text])
+        elif sections[-1][1]:
+            sections[-1][1] += "\n" + text
+        else:
+            sections[-1][1] = text
+
+
+def _split_paragraphs(raw):
+    """빈 줄(공백만 있는 줄 포함) 기준 문단 목록"""
+    paragraphs = []
+    current = []
+    for segment in raw.split("\n"):
+        if segment.strip():
+            current.append(segment)
+        elif current:
+            paragraphs.append("\n".join(current).strip())
+            current = []
+    if current:
+        paragraphs.append("\n".join(current).strip())
+    return paragraphs
+
+
+def parse_ai_response(content):
+    """AI 응답을 제목/서론/소제목/본문으로 분리
+
+    줄을 한 번만 훑으면서 라벨 구간 파싱과 빈 줄을 뺀 줄 목록 수집을 함께 한다.
+    라벨이 하나라도 있으면 라벨 기준 결과를, 없으면 줄 수에 따라
+    "제목/서론/소제목·본문 x3" 줄 배치 또는 문단 배치로 나눈다.
+    """
+    raw = content.strip().replace("\r\n", "\n").replace("\r", "\n")
+    if not raw:
+        return "", "", []
+
+    parsed = ["", ""]
+    sections = []
+    compact_lines = []
+    kind = None  # 현재 라벨 구간 (첫 라벨 이전 내용은 버림)
+    buffer = []
+    labeled = False
+    for line in raw.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        compact_lines.append(line)
+        if line[0] in LABEL_KINDS:
+            match = LABEL_PATTERN.match(line)
+            if match:
+                labeled = True
+                if buffer:
+                    _store_section(kind, buffer, parsed, sections)
+                    buffer = []
+                kind = LABEL_KINDS[line[0]]
+                if match.group(2):
+                    buffer.append(match.group(2))
+                continue
+        if kind:
+            buffer.append(line)
+    if labeled:
+        if buffer:
+            _store_section(kind, buffer, parsed, sections)
+        return parsed[0], parsed[1], [(subtitle, body) for subtitle, body in sections]
+
+    if len(compact_lines) >= 8:
+        title = compact_lines[0]
+        intro = compact_lines[1]
+        sections = [
+            (compact_lines[2], compact_lines[3]),
+            (compact_lines[4], compact_lines[5]),
+            (compact_lines[6], compact_lines[7]),
+        ]
+        if len(compact_lines) > 8:
+            subtitle, body = sections[-1]
+            sections[-1] = (subtitle, body + "\n" + "\n".join(compact_lines[8:]))
+        return title, intro, sections
+
+    # 빈 줄을 뺀 줄이 8개 미만인 짧은 응답만 여기까지 오므로 다시 나눠도 부담이 없음
+    paragraphs = _split_paragraphs(raw)
+    title = paragraphs[0].splitlines()[0].strip()
+    intro = paragraphs[1] if len(paragraphs) > 1 else ""
+    rest = paragraphs[2:]
+    sections = []
+    for i in range(0, len(rest), 2):
+        subtitle = rest[i].splitlines()[0].strip()
+        body = rest[i + 1] if i + 1 < len(rest) else ""
+        sections.append((subtitle, body))
+    return title, intro, sections
+
+
+def build_body_text(intro, sections):
+    """서론/소제목/본문을 본문 문자열로 구성"""
+    lines = []
+    if intro:
+        intro_line = " ".join(intro.splitlines()).strip()
+        if intro_line:
+            lines.append(intro_line)
+    for subtitle, body in sections:
+        sub_line = " ".join(subtitle.splitlines()).strip()
+        body_line = " ".join(body.splitlines()).strip()
+        if sub_line:
+            lines.append(sub_line)
+        if body_line:
+            lines.append(body_line)
+    return "\n".join(lines)
+
+
+def extract_title_body(content):
+    """AI 응답에서 (제목, 본문) 추출, 실패한 항목은 빈 문자열"""
+    title, intro, sections = parse_ai_response(content)
+    if not title:
+        for line in content.splitlines():
+            if line.strip():
+                title = line.strip()
+                break
+    if not title:
+        return "", ""
+
+    body = build_body_text(intro, sections)
+    if not body:
+        # 폴백: 줄바꿈 기준으로 제목/본문 분리
+        fallback_lines = [line.strip() for line in content.splitlines() if line.strip()]
+        if len(fallback_lines) >= 2:
+            body = "\n".join(fallback_lines[1:])
+    return title, body
+
+
+# 여러 키워드 동시 생성 응답의 글 구간 ("===== 글 N 시작 | 키워드: ... =====" ~ "===== 글 N 끝 =====")
+BATCH_BLOCK_PATTERN = re.compile(
+    r"^=+\s*글\s*(\d+)\s*시작[^\n]*\n(.*?)^=+\s*글\s*\1\s*끝\s*=+\s*$",
+    re.MULTILINE | re.DOTALL,
+)
+MIN_BODY_CHARS = 200  # 이보다 짧은 본문은 잘린 응답으로 보고 실패 처리
+
+
+def _compact(text):
+    return "".join(text.split()).casefold()
+
+
+def parse_batch_response(content, keywords):
+    """여러 키워드 동시 생성 응답을 키워드 순서대로 (원문 구간, 제목, 본문) 목록으로 분리
+
+    구분선이 없거나, 본문이 너무 짧거나, 제목에 해당 키워드가 없는 글은 None으로 반환한다.
+    """
+    blocks = {}
+    for match in BATCH_BLOCK_PATTERN.finditer(content.replace("\r\n", "\n")):
+        blocks.setdefault(int(match.group(1)), match.group(2).strip())
+
+    results = []
+    for index, keyword in enumerate(keywords, 1):
+        section = blocks.get(index)
+        if not section:
+            results.append(None)
+            continue
+        title, body = extract_title_body(section)
+        if not title or len(body) < MIN_BODY_CHARS or _compact(keyword) not in _compact(title):
+            results.append(None)
+            continue
+        results.append((section, title, body))
+    return results
+
+
+class InvalidAIResponse(ValueError):
+    """AI 응답이 요구한 형식/조건을 만족하지 않음 (다시 요청 대상)"""
+
+
+# JSON 출력 모드 응답 스키마 (Gemini response_schema, OpenAPI 형식)
+POST_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "title": {"type": "STRING"},
+        "intro": {"type": "STRING"},
+        "sections": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "subtitle": {"type": "STRING"},
+                    "body": {"type": "STRING"},
+                },
+                "required": ["subtitle", "body"],
+            },
+        },
+    },
+    "required": ["title", "intro", "sections"],
+}
+MIN_JSON_SECTIONS = 3  # prompt_output_form.txt의 소제목/본문 3세트
+MAX_TITLE_CHARS = 100
+_CODE_FENCE_PATTERN = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
+
+
+def _required_text(data, key, where):
+    value = data.get(key)
+    if not isinstance(value, str) or not value.strip():
+        raise InvalidAIResponse(f"{where}{key} 항목이 비어 있음")
+    return value.strip()
+
+
+def parse_json_response(content, keyword=None):
+    """JSON 출력 모드 응답을 검증하여 (제목, 서론, [(소제목, 본문), ...]) 반환
+
+    JSON이 아니거나, 필수 항목이 비었거나, 제목에 키워드가 없거나 너무 길거나,
+    소제목/본문 세트가 모자라거나 본문이 너무 짧으면 InvalidAIResponse를 발생시킨다.
+    """
+    text = (content or "").strip()
+    fence = _CODE_FENCE_PATTERN.match(text)
+    if fence:
+        text = fence.group(1)
+    try:
+        data = json.loads(text)
+    except ValueError as e:
+        raise InvalidAIResponse(f"JSON 형식이 아님 ({e})")
+    if not isinstance(data, dict):
+        raise InvalidAIResponse("JSON 최상위가 객체가 아님")
+
+    title = " ".join(_required_text(data, "title", "").split())
+    if len(title) > MAX_TITLE_CHARS:
+        raise InvalidAIResponse(f"제목이 너무 김 ({len(title)}자)")
+    if keyword and _compact(keyword) not in _compact(title):
+        raise InvalidAIResponse("제목에 키워드가 없음")
+    intro = _required_text(data, "intro", "")
+
+    raw_sections = data.get("sections")
+    if not isinstance(raw_sections, list) or len(raw_sections) < MIN_JSON_SECTIONS:
+        raise InvalidAIResponse(f"소제목/본문이 {MIN_JSON_SECTIONS}세트 미만")
+    sections = []
+    for index, item in enumerate(raw_sections, 1):
+        if not isinstance(item, dict):
+            raise InvalidAIResponse(f"sections[{index}]가 객체가 아님")
+        subtitle = " ".join(_required_text(item, "subtitle", f"sections[{index}].").split())
+        sections.append((subtitle, _required_text(item, "body", f"sections[{index}].")))
+
+    if len(build_body_text(intro, sections)) < MIN_BODY_CHARS:
+        raise InvalidAIResponse("본문이 너무 짧음")
+    return title, intro, sections
+
+
+def format_labeled_text(title, intro, sections):
+    """제목/서론/소제목/본문을 라벨 형식 원문으로 구성 (*_raw.txt 저장용)
+
+    내용이 라벨처럼 보이는 줄로 시작해도 섞이지 않도록 "라벨: 내용" 한 줄로 쓴다.
+    줄바꿈은 build_body_text()와 같이 공백으로 합치므로 다시 파싱해도 같은 제목/본문이 된다.
+    """
+    def line(label, text):
+        return f"{label}: {' '.join(text.splitlines()).strip()}"
+
+    lines = [line("제목", title), line("서론", intro)]
+    for index, (subtitle, body) in enumerate(sections, 1):
+        number = index if index <= 3 else ""
+        lines.append(line(f"소제목{number}", subtitle))
+        lines.append(line(f"본문{number}", body))
+    return "\n".join(lines)
+
+
+class IncrementalLabelParser:
+    """스트리밍 응답을 조각 단위로 받아 제목/서론/소제목N/본문N 구간을 순서대로 알림
+
+    on_title(제목)은 제목 줄이 완성되는 즉시(본문을 기다리지 않고) 한 번 호출된다.
+    on_section(라벨, 내용)은 다음 라벨이 시작되거나 close()될 때 구간마다 호출된다.
+    최종 제목/본문은 close()가 반환하는 전체 원문을 extract_title_body()로 다시 파싱해 얻는다.
+    """
+
+    def __init__(self, on_title=None, on_section=None):
+        self.on_title = on_title
+        self.on_section = on_section
+        self.title = ""
+        self._chunks = []
+        self._pending = ""
+        self._label = None
+        self._lines = []
+
+    def feed(self, chunk):
+        """응답 조각 추가 (완성된 줄만 처리)"""
+        if not chunk:
+            return
+        self._chunks.append(chunk)
+        text = (self._pending + chunk).replace("\r\n", "\n").replace("\r", "\n")
+        lines = text.split("\n")
+        self._pending = lines.pop()
+        for line in lines:
+            self._handle_line(line.strip())
+
+    def close(self):
+        """남은 줄을 처리하고 전체 원문 반환"""
+        if self._pending:
+            self._handle_line(self._pending.strip())
+            self._pending = ""
+        self._flush()
+        return "".join(self._chunks)
+
+    def _handle_line(self, line):
+        match = LABEL_PATTERN.match(line) if line and line[0] in LABEL_KINDS else None
+        if match:
+            self._flush()
+            self._label = "".join(match.group(1).split())
+            line = (match.group(2) or "").strip()
+        if not line:
+            return
+        self._lines.append(line)
+        if self._label in ("제목", None) and not self.title:
+            # 제목은 첫 줄만 사용하므로 줄이 끝나는 즉시 알림 (라벨 없는 응답은 첫 줄이 제목)
+            self.title = line
+            if self.on_title:
+                self.on_title(line)
+
+    def _flush(self):
+        if self._label and self._lines and self.on_section:
+            self.on_section(self._label, "\n".join(self._lines))
+        self._lines = []
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+AI 백엔드 라우터 모듈
+
+Gemini API / Gemini 웹 / ChatGPT 웹 / Perplexity 웹 백엔드별로 최근 WINDOW회 호출의
+응답 시간(p50/p95)과 오류율을 기록하고, 요청마다 가장 빠른 정상 백엔드부터 시도할 순서를 정한다.
+한 백엔드가 실패하면 같은 요청 안에서 다음 백엔드로 넘어가며(failover),
+연속으로 실패한 백엔드는 점점 길어지는 대기 시간(cooldown) 동안 뒤로 미룬다.
+
+같은 프로그램 안의 포스팅 인스턴스와 사전 생성 인스턴스가 통계를 공유하도록
+get_ai_router()로 하나의 라우터를 사용한다.
+"""
+
+import threading
+import time
+from collections import deque
+
+# 백엔드 ID → 표시 이름
+BACKEND_NAMES = {
+    "gemini_api": "Gemini API",
+    "gemini_web": "Gemini 웹",
+    "gpt_web": "ChatGPT 웹",
+    "perplexity_web": "Perplexity 웹",
+}
+
+# 웹 AI 제공자(web_ai_provider) → 백엔드 ID
+WEB_BACKENDS = {
+    "gemini": "gemini_web",
+    "gpt": "gpt_web",
+    "perplexity": "perplexity_web",
+}
+
+
+def percentile(values, fraction):
+    """정렬된 목록의 백분위 값 (가장 가까운 순위 방식, 비어 있으면 None)"""
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, int(round(fraction * (len(values) - 1)))))
+    return values[index]
+
+
+def configured_backends(config, has_api_key):
+    """설정에 따른 백엔드 후보 목록 (첫 번째가 기본 백엔드)
+
+    웹 백엔드는 브라우저를 가진 웹 모드(gemini_mode=web)에서만 사용한다.
+    Gemini API는 API 키가 있을 때만 후보가 된다. ai_backends 목록이 있으면 그 순서와 범위로 제한하고,
+    ai_failover를 끄면 기본 백엔드 하나만 사용한다.
+    """
+    config = config or {}
+    if config.get("gemini_mode", "api") == "web":
+        provider = (config.get("web_ai_provider", "gemini") or "gemini").lower()
+        primary = WEB_BACKENDS.get(provider, "gemini_web")
+        available = [primary] + [backend for backend in WEB_BACKENDS.values() if backend != primary]
+        if has_api_key:
+            available.append("gemini_api")
+    else:
+        available = ["gemini_api"]
+    if not config.get("ai_failover", True):
+        return available[:1]
+    preferred = config.get("ai_backends")
+    if preferred:
+        ordered = [backend for backend in preferred if backend in available]
+        if ordered:
+            return ordered
+    return available
+
+
+class BackendStats:
+    """백엔드 하나의 최근 호출 기록 (응답 시간은 성공한 호출만 집계)"""
+
+    def __init__(self, window):
+        self.samples = deque(maxlen=window)  # (응답 시간, 성공 여부)
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+
+    def latencies(self):
+        return sorted(latency for latency, ok in self.samples if ok)
+
+    def error_rate(self):
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, ok in self.samples if not ok) / len(self.samples)
+
+
+class AIRouter:
+    """응답 시간/오류율 기반 AI 백엔드 선택기 (스레드 안전)"""
+
+    WINDOW = 20  # 통계에 쓰는 최근 호출 수
+    MIN_SAMPLES = 4  # 오류율로 비정상 판정하기 위한 최소 호출 수
+    MAX_ERROR_RATE = 0.5  # 이 오류율을 넘으면 비정상
+    BASE_COOLDOWN = 60  # 연속 실패 시 첫 대기 시간 (초), 실패마다 2배
+    MAX_COOLDOWN = 900
+
+    def __init__(self, window=None):
+        self.window = window or self.WINDOW
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _get(self, backend):
+        stats = self._stats.get(backend)
+        if stats is None:
+            stats = self._stats[backend] = BackendStats(self.window)
+        return stats
+
+    def _healthy(self, stats, now):
+        if stats.cooldown_until > now:
+            return False
+        return len(stats.samples) < self.MIN_SAMPLES or stats.error_rate() <= self.MAX_ERROR_RATE
+
+    def order(self, backends):
+        """시도할 순서로 정렬한 백엔드 목록
+
+        정상 백엔드 중 기록이 있는 것은 p50이 빠른 순서(같으면 p95),
+        기록이 없는 것은 그 뒤에 설정 순서대로 둔다. 비정상 백엔드는 대기 시간이 먼저 끝나는 순서로 맨 뒤에 둔다.
+        """
+        now = time.monotonic()
+        with self._lock:
+            measured, unmeasured, unhealthy = [], [], []
+            for index, backend in enumerate(backends):
+                stats = self._get(backend)
+                if not self._healthy(stats, now):
+                    unhealthy.append((stats.cooldown_until, index, backend))
+                    continue
+                latencies = stats.latencies()
+                if latencies:
+                    measured.append((percentile(latencies, 0.5), percentile(latencies, 0.95), index, backend))
+                else:
+                    unmeasured.append(backend)
+        measured.sort()
+        unhealthy.sort()
+        return [item[-1] for item in measured] + unmeasured + [item[-1] for item in unhealthy]
+
+    def record(self, backend, latency, ok):
+        """호출 결과 기록 (실패가 이어지면 대기 시간 설정)"""
+        with self._lock:
+            stats = self._get(backend)
+            stats.samples.append((float(latency), bool(ok)))
+            if ok:
+                stats.consecutive_failures = 0
+                stats.cooldown_until = 0.0
+                return
+            stats.consecutive_failures += 1
+            if stats.consecutive_failures >= 2:
+                cooldown = min(self.MAX_COOLDOWN, self.BASE_COOLDOWN * 2 ** (stats.consecutive_failures - 2))
+                stats.cooldown_until = time.monotonic() + cooldown
+
+    def run(self, backends, call, on_result=None):
+        """order() 순서로 백엔드를 시도하는 failover 루프, 처음 성공한 (백엔드, 결과) 반환 (모두 실패하면 (None, None))
+
+        call(backend, previous)는 성공하면 결과를, 실패하면 None(빈 값)을 반환한다. previous는 직전에 실패한 백엔드.
+        호출마다 소요 시간과 성공 여부를 기록하고 on_result(backend, elapsed, ok)를 호출한다.
+        call이 던진 예외(정지 요청 등)는 실패로 기록하지 않고 그대로 전달한다.
+        """
+        previous = None
+        for backend in self.order(backends):
+            started = time.monotonic()
+            result = call(backend, previous)
+            elapsed = time.monotonic() - started
+            ok = bool(result)
+            self.record(backend, elapsed, ok)
+            if on_result:
+                on_result(backend, elapsed, ok)
+            if ok:
+                return backend, result
+            previous = backend
+        return None, None
+
+    def snapshot(self, backend):
+        """백엔드 통계 {calls, p50, p95, error_rate, healthy}"""
+        now = time.monotonic()
+        with self._lock:
+            stats = self._get(backend)
+            latencies = stats.latencies()
+            return {
+                "calls": len(stats.samples),
+                "p50": percentile(latencies, 0.5),
+                "p95": percentile(latencies, 0.95),
+                "error_rate": stats.error_rate(),
+                "healthy": self._healthy(stats, now),
+            }
+
+    def describe(self, backend):
+        """상태 메시지용 통계 요약"""
+        snap = self.snapshot(backend)
+        name = BACKEND_NAMES.get(backend, backend)
+        if snap["p50"] is None:
+            return f"{name} (기록 없음)"
+        return (
+            f"{name} (p50 {snap['p50']:.1f}초 / p95 {snap['p95']:.1f}초, "
+            f"오류율 {snap['error_rate']:.0%})"
+        )
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_ai_router():
+    """프로그램 전체에서 공유하는 AIRouter 반환"""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = AIRouter()
+    return _router
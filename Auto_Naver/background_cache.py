@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+썸네일 배경 이미지 캐시 모듈
+
+setting/image의 배경 JPG(카메라 원본 4000px급)를 글마다 다시 디코딩/LANCZOS 축소하지 않도록
+배경마다 한 번만 300x300으로 줄여 둔다. 키는 (경로, mtime, 크기)이므로 파일을 바꾸면 자동으로 다시 만든다.
+
+- 메모리: 최근 사용한 배경 MAX_ITEMS개 (LRU)
+- 디스크: setting/image_cache에 바로 쓸 수 있는 PNG 타일 (프로그램을 다시 켜도 디코딩 없이 사용)
+- 원본 디코딩은 JPEG draft 모드로 목표 크기에 가까운 축소 배율(1/2~1/8)로 읽은 뒤 LANCZOS로 맞춘다.
+
+배경 폴더 목록도 폴더 mtime이 바뀔 때만 다시 읽는다. 썸네일은 get()이 돌려준 사본 위에 글자만 그리면 된다.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_SIZE = (300, 300)
+BACKGROUND_EXTENSIONS = (".jpg",)
+
+
+class BackgroundImageCache:
+    """배경 이미지 → 썸네일 크기 RGB 이미지 캐시 (스레드 안전)"""
+
+    MAX_ITEMS = 8  # 메모리에 둘 배경 수
+    TILE_DIRNAME = "image_cache"
+
+    def __init__(self, setting_dir, size=DEFAULT_SIZE, max_items=None):
+        self.size = tuple(size)
+        self.tile_dir = os.path.join(setting_dir, self.TILE_DIRNAME)
+        self.max_items = max_items or self.MAX_ITEMS
+        self._images = OrderedDict()  # (경로, mtime_ns, 크기) → PIL.Image
+        self._listings = {}  # 폴더 → (폴더 mtime_ns, 배경 파일 목록)
+        self._lock = threading.Lock()
+
+    def backgrounds(self, folder):
+        """폴더의 배경 파일 경로 목록 (기존과 같은 os.listdir 순서, 폴더가 바뀐 경우에만 다시 읽음)"""
+        try:
+            mtime = os.stat(folder).st_mtime_ns
+        except OSError:
+            return []
+        with self._lock:
+            cached = self._listings.get(folder)
+            if cached and cached[0] == mtime:
+                return list(cached[1])
+        names = [name for name in os.listdir(folder) if name.lower().endswith(BACKGROUND_EXTENSIONS)]
+        paths = [os.path.join(folder, name) for name in names]
+        with self._lock:
+            self._listings[folder] = (mtime, paths)
+        return list(paths)
+
+    def _tile_path(self, path, mtime):
+        source = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+        version = hashlib.sha1(f"{mtime}|{self.size[0]}x{self.size[1]}".encode("utf-8")).hexdigest()[:12]
+        return os.path.join(self.tile_dir, f"{source}_{version}.png"), source
+
+    def get(self, path):
+        """썸네일 크기로 줄인 배경의 사본 (그 위에 그려도 캐시는 바뀌지 않음)"""
+        mtime = os.stat(path).st_mtime_ns
+        key = (os.path.abspath(path), mtime, self.size)
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                return image.copy()
+            # 같은 배경을 여러 작업자가 동시에 처음 요청해도 한 번만 디코딩
+            image = self._load_tile(path, mtime)
+            if image is None:
+                image = self._decode(path)
+                self._save_tile(path, mtime, image)
+            self._images[key] = image
+            while len(self._images) > self.max_items:
+                self._images.popitem(last=False)
+            return image.copy()
+
+    def prewarm(self, folder):
+        """폴더의 첫 배경(썸네일에 쓰는 배경)을 미리 준비"""
+        paths = self.backgrounds(folder)
+        if paths:
+            self.get(paths[0])
+
+    def _decode(self, path):
+        from PIL import Image
+
+        with Image.open(path) as source:
+            # JPEG는 목표 크기 이상을 유지하는 가장 작은 배율로 디코딩 (4000px → 500px 수준)
+            source.draft("RGB", self.size)
+            image = source.convert("RGB")
+        return image.resize(self.size, Image.Resampling.LANCZOS)
+
+    def _load_tile(self, path, mtime):
+        from PIL import Image
+
+        tile_path, _ = self._tile_path(path, mtime)
+        if not os.path.exists(tile_path):
+            return None
+        try:
+            with Image.open(tile_path) as tile:
+                image = tile.convert("RGB")
+        except Exception as e:
+            print(f"⚠️ 배경 타일 읽기 실패 - 다시 생성합니다: {e}")
+            return None
+        return image if image.size == self.size else None
+
+    def _save_tile(self, path, mtime, image):
+        tile_path, source = self._tile_path(path, mtime)
+        try:
+            os.makedirs(self.tile_dir, exist_ok=True)
+            temp_path = f"{tile_path}.tmp"
+            image.save(temp_path, "PNG")
+            os.replace(temp_path, tile_path)
+            # 같은 원본의 이전 버전 타일 삭제
+            for name in os.listdir(self.tile_dir):
+                if name.startswith(f"{source}_") and os.path.join(self.tile_dir, name) != tile_path:
+                    os.remove(os.path.join(self.tile_dir, name))
+        except OSError as e:
+            print(f"⚠️ 배경 타일 저장 실패: {e}")
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_background_cache(setting_dir, size=DEFAULT_SIZE):
+    """setting 폴더/크기별 공유 캐시 (포스팅/사전 생성 인스턴스가 함께 사용)"""
+    key = (os.path.abspath(setting_dir), tuple(size))
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = BackgroundImageCache(setting_dir, size)
+            _caches[key] = cache
+    return cache
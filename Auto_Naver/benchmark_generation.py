@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+AI 글 생성 처리량 벤치마크 (네트워크/할당량 없이 대역 서버 사용)
+mock_llm_server.py를 같은 프로세스에서 띄우고 NaverBlogAutomation의 실제 글 생성 경로
+(프롬프트 → Gemini API 또는 웹 AI 탭 → 파싱 → 캐시/결과 저장)를 키워드 N개로 실행하여
+글당 소요 시간(p50/p95)과 분당 처리량을 출력한다.
+
+키워드 대기열은 건드리지 않으며, 실행이 끝나면 벤치마크 키워드의 결과 파일, 캐시 항목, AI 호출 기록을 지운다
+(대역 서버의 지연/비용이 GUI 사용량 요약에 실제 사용량으로 섞이지 않도록).
+웹 모드는 Chrome이 필요하며 별도 프로필(setting/chrome_profile_bench)을 사용한다.
+
+사용법: python benchmark_generation.py [--posts 10] [--workers 1] [--mode api|stream|json|web]
+        [--provider gemini|gpt|perplexity] [--latency 1.5] [--token-rate 300] [--error-rate 0]
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import mock_llm_server
+from ai_router import percentile
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MAIN_SCRIPT = os.path.join(BASE_DIR, "Auto_Naver_Blog_V5.1.py")
+BENCH_PROFILE_DIRNAME = "chrome_profile_bench"
+WEB_PAGES = {"gemini": "gemini", "gpt": "chatgpt", "perplexity": "perplexity"}
+
+
+def load_app():
+    """파일명에 점이 있는 본체 스크립트를 모듈로 불러옴 (GUI는 실행되지 않음)"""
+    spec = importlib.util.spec_from_file_location("auto_naver_app", MAIN_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench_config(args, base_url):
+    config = {
+        "gemini_mode": "web" if args.mode == "web" else "api",
+        "web_ai_provider": args.provider,
+        "gemini_api_endpoint": base_url,
+        "web_ai_urls": {provider: f"{base_url}/web/{page}" for provider, page in WEB_PAGES.items()},
+        "gemini_stream": args.mode == "stream",
+        "gemini_json_mode": args.mode == "json",
+        "ai_failover": args.failover,
+        "gemini_rpm": 10000,
+        "gemini_tpm": 100000000,
+    }
+    if args.workers > 1:
+        config["gemini_max_concurrency"] = args.workers
+    return config
+
+
+def cleanup(automation, keywords):
+    """벤치마크 키워드의 결과 파일/캐시 항목/AI 호출 기록 삭제"""
+    result_dir = os.path.join("setting", "result")
+    names = os.listdir(result_dir) if os.path.isdir(result_dir) else []
+    for keyword in keywords:
+        try:
+            automation.ai_cache.discard_keyword(keyword)
+        except Exception as e:
+            print(f"⚠️ 캐시 정리 실패 ({keyword}): {e}")
+        try:
+            automation.ai_metrics.discard_keyword(keyword)
+        except Exception as e:
+            print(f"⚠️ 호출 기록 정리 실패 ({keyword}): {e}")
+        for name in names:
+            if name.startswith(f"{keyword}_"):
+                try:
+                    os.remove(os.path.join(result_dir, name))
+                except OSError:
+                    pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI 글 생성 처리량 벤치마크 (대역 서버)")
+    parser.add_argument("--posts", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=1, help="동시 생성 수 (웹 모드는 1 고정)")
+    parser.add_argument("--mode", choices=("api", "stream", "json", "web"), default="api")
+    parser.add_argument("--provider", choices=sorted(WEB_PAGES), default="gemini")
+    parser.add_argument("--failover", action="store_true", help="백엔드 전환(ai_failover) 사용")
+    parser.add_argument("--latency", type=float, default=1.5)
+    parser.add_argument("--jitter", type=float, default=0.3)
+    parser.add_argument("--token-rate", type=float, default=300.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--web-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    if args.mode == "web":
+        args.workers = 1
+
+    os.chdir(BASE_DIR)  # 결과 폴더(setting/result)는 작업 폴더 기준
+    settings = mock_llm_server.MockSettings(
+        latency=args.latency,
+        jitter=args.jitter,
+        token_rate=args.token_rate,
+        error_rate=args.error_rate,
+        web_error_rate=args.web_error_rate,
+        seed=args.seed,
+    )
+    server = mock_llm_server.serve(port=0, settings=settings, quiet=True)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"🧪 대역 서버: {base_url}")
+
+    app = load_app()
+    config = bench_config(args, base_url)
+    automations = []
+    for _ in range(args.workers):
+        automation = app.NaverBlogAutomation(
+            naver_id="", naver_pw="", api_key="mock-key", callback=None, config=config
+        )
+        automation.profile_dirname = BENCH_PROFILE_DIRNAME
+        automations.append(automation)
+
+    stamp = time.strftime("%H%M%S")
+    keywords = [f"벤치마크{stamp} 키워드{index}" for index in range(1, args.posts + 1)]
+    durations = []
+    failures = 0
+    lock = threading.Lock()
+
+    def run(index):
+        nonlocal failures
+        automation = automations[index % len(automations)]
+        started = time.perf_counter()
+        title, body = automation._generate_content_for_keyword(keywords[index])
+        elapsed = time.perf_counter() - started
+        with lock:
+            if title and body:
+                durations.append(elapsed)
+            else:
+                failures += 1
+        print(f"  {'✅' if title and body else '❌'} {keywords[index]}: {elapsed:.2f}초")
+
+    started = time.perf_counter()
+    try:
+        if args.workers > 1:
+            with ThreadPoolExecutor(max_workers=args.workers) as pool:
+                list(pool.map(run, range(args.posts)))
+        else:
+            for index in range(args.posts):
+                run(index)
+    finally:
+        total = time.perf_counter() - started
+        cleanup(automations[0], keywords)
+        for automation in automations:
+            automation.quit_driver()
+        server.shutdown()
+
+    ordered = sorted(durations)
+    print(f"\n📊 모드 {args.mode}{'/' + args.provider if args.mode == 'web' else ''}, 작업자 {args.workers}")
+    print(f"   성공 {len(durations)} / 실패 {failures}, 전체 {total:.1f}초, 분당 {len(durations) / total * 60:.1f}개")
+    if ordered:
+        print(f"   글당 p50 {percentile(ordered, 0.5):.2f}초 / p95 {percentile(ordered, 0.95):.2f}초")
+    print(f"   서버 통계: {json.dumps(settings.stats, ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+AI 응답 파서 벤치마크 / 회귀 검사 도구
+*_raw.txt 원문을 이전 파서와 현재 파서(ai_response_parser.parse_ai_response)로 각각 파싱하여
+결과가 같은지 확인하고 처리 시간을 비교
+
+사용법: python benchmark_parser.py [원문 폴더 ...] [--repeat N]
+(폴더를 지정하지 않으면 setting/result와 ../Auto_WP를 검사, 결과가 다르면 종료 코드 1)
+"""
+
+import os
+import re
+import sys
+import time
+from ai_response_parser import parse_ai_response
+
+
+def legacy_parse_ai_response(content):
+    """이전 파서 (비교 기준, 원본 그대로 보존)"""
+    raw = content.strip().replace("\r\n", "\n").replace("\r", "\n")
+    if not raw:
+        return "", "", []
+
+    lines = [line.strip() for line in raw.splitlines()]
+    label_map = {
+        "제목": "title",
+        "서론": "intro",
+        "소제목": "subtitle",
+        "소제목1": "subtitle",
+        "소제목2": "subtitle",
+        "소제목3": "subtitle",
+        "본문": "body",
+        "본문1": "body",
+        "본문2": "body",
+        "본문3": "body",
+    }
+    label_pattern = re.compile(r"^\s*(제목|서론|소제목\s*([1-3])?|본문\s*([1-3])?)\s*[:：]?\s*$")
+    label_prefix_pattern = re.compile(r"^\s*(제목|서론|소제목\s*([1-3])?|본문\s*([1-3])?)\s*[:：.]?\s+(.+)$")
+    has_labels = any(line in label_map or label_pattern.match(line) or label_prefix_pattern.match(line) for line in lines)
+    if has_labels:
+        title = ""
+        intro = ""
+        sections = []
+        current = None
+        buffer = []
+
+        def flush():
+            nonlocal title, intro, sections, buffer, current
+            text = "\n".join([b for b in buffer if b.strip()]).strip()
+            if not text:
+                buffer = []
+                return
+            if current == "title":
+                title = text.splitlines()[0].strip()
+            elif current == "intro":
+                intro = text
+            elif current == "subtitle":
+                sections.append([text.splitlines()[0].strip(), ""])
+            elif current == "body":
+                if not sections:
+                    sections.append(["", text])
+                else:
+                    if sections[-1][1]:
+                        sections[-1][1] += "\n" + text
+                    else:
+                        sections[-1][1] = text
+            buffer = []
+
+        for line in lines:
+            # 라벨 단독 라인 (제목/서론/소제목1/본문2 등)
+            if line in label_map or label_pattern.match(line):
+                label_key = line
+                if label_key not in label_map:
+                    label_key = label_pattern.match(line).group(1).replace(" ", "")
+                flush()
+                current = label_map[label_key]
+                continue
+            # 라벨 + 내용이 같은 줄에 있는 경우 (예: "제목: ...")
+            prefix_match = label_prefix_pattern.match(line)
+            if prefix_match:
+                label_key = prefix_match.group(1).replace(" ", "")
+                flush()
+                current = label_map[label_key]
+                buffer.append(prefix_match.group(4))
+                continue
+            buffer.append(line)
+        flush()
+        return title, intro, [(s[0], s[1]) for s in sections]
+
+    compact_lines = [line for line in lines if line]
+    if len(compact_lines) >= 8:
+        title = compact_lines[0].strip()
+        intro = compact_lines[1].strip()
+        sections = [
+            (compact_lines[2].strip(), compact_lines[3].strip()),
+            (compact_lines[4].strip(), compact_lines[5].strip()),
+            (compact_lines[6].strip(), compact_lines[7].strip()),
+        ]
+        if len(compact_lines) > 8:
+            extra = "\n".join(compact_lines[8:]).strip()
+            if extra:
+                sub, body = sections[-1]
+                body = (body + "\n" + extra).strip() if body else extra
+                sections[-1] = (sub, body)
+        return title, intro, sections
+
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n+", raw) if p.strip()]
+    if not paragraphs:
+        return "", "", []
+
+    title = paragraphs[0].splitlines()[0].strip()
+    intro = paragraphs[1].strip() if len(paragraphs) > 1 else ""
+    rest = paragraphs[2:] if len(paragraphs) > 2 else []
+    sections = []
+    i = 0
+    while i < len(rest):
+        subtitle = rest[i].splitlines()[0].strip()
+        body = rest[i + 1].strip() if i + 1 < len(rest) else ""
+        sections.append((subtitle, body))
+        i += 2
+    return title, intro, sections
+
+
+def collect_raw_files(folders):
+    """폴더(하위 폴더 포함)의 *_raw.txt 경로 목록"""
+    paths = []
+    for folder in folders:
+        if not os.path.isdir(folder):
+            print(f"⚠️ 폴더 없음 (건너뜀): {folder}")
+            continue
+        for root, _, names in os.walk(folder):
+            paths.extend(os.path.join(root, name) for name in names if name.endswith("_raw.txt"))
+    return sorted(paths)
+
+
+def time_parser(parse, contents, repeat):
+    """전체 원문을 repeat번 파싱하는 데 걸린 시간 (초)"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for content in contents:
+            parse(content)
+    return time.perf_counter() - started
+
+
+def main():
+    args = sys.argv[1:]
+    repeat = 200
+    if "--repeat" in args:
+        index = args.index("--repeat")
+        repeat = max(1, int(args[index + 1]))
+        del args[index:index + 2]
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    folders = args or [
+        os.path.join(base_dir, "setting", "result"),
+        os.path.join(os.path.dirname(base_dir), "Auto_WP"),
+    ]
+
+    print("=" * 50)
+    print("AI 응답 파서 벤치마크 / 회귀 검사")
+    print("=" * 50)
+
+    paths = collect_raw_files(folders)
+    if not paths:
+        print("❌ 검사할 *_raw.txt 파일이 없습니다")
+        return 1
+
+    contents = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            contents.append(f.read())
+
+    mismatches = 0
+    for path, content in zip(paths, contents):
+        try:
+            expected = legacy_parse_ai_response(content)
+        except Exception as e:
+            # 이전 파서가 실패하던 입력은 비교 대상에서 제외
+            print(f"ℹ️ 이전 파서 오류 ({type(e).__name__}): {os.path.basename(path)}")
+            continue
+        actual = parse_ai_response(content)
+        if actual != expected:
+            mismatches += 1
+            print(f"❌ 결과 다름: {path}")
+            print(f"   이전: {expected!r:.200}")
+            print(f"   현재: {actual!r:.200}")
+
+    total_bytes = sum(len(content.encode("utf-8")) for content in contents)
+    print(f"\n파일 {len(paths):,}개 ({total_bytes / 1024:.1f} KB), {repeat}회 반복")
+    legacy_time = time_parser(legacy_parse_ai_response, contents, repeat)
+    current_time = time_parser(parse_ai_response, contents, repeat)
+    count = len(contents) * repeat
+    print(f"이전 파서: {legacy_time:.3f}초 (건당 {legacy_time / count * 1e6:.1f}µs)")
+    print(f"현재 파서: {current_time:.3f}초 (건당 {current_time / count * 1e6:.1f}µs)")
+    if current_time > 0:
+        print(f"속도: {legacy_time / current_time:.2f}배")
+
+    if mismatches:
+        print(f"\n❌ 결과가 다른 파일 {mismatches}개")
+        return 1
+    print("\n✅ 모든 파일의 파싱 결과가 같습니다")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+썸네일 글꼴 찾기 모듈
+
+한글을 그릴 수 있는 글꼴을 아래 순서로 찾아 한 번만 결정하고, 크기별 FreeTypeFont를 캐시한다.
+  1) 설정의 thumbnail_fonts (글꼴 파일 경로 목록)
+  2) setting/fonts 폴더의 .ttf/.otf/.ttc (Windows/Linux에서 같은 결과가 필요하면 같은 파일을 여기에 둔다)
+  3) 운영체제별 기본 한글 글꼴 경로 (맑은 고딕, Apple SD 고딕 Neo, 나눔고딕, Noto Sans CJK 등)
+  4) fontconfig (fc-match/fc-list :lang=ko, Linux)
+
+후보마다 '가' 글리프가 실제로 있는지 확인하므로 한글이 없는 글꼴(ImageFont.load_default 등)로
+조용히 넘어가 네모 글자가 찍히는 일을 막는다. 끝내 찾지 못한 경우에만 기본 글꼴을 쓰고 경고를 한 번 출력한다.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import threading
+
+FONT_EXTENSIONS = (".ttf", ".otf", ".ttc")
+FONT_DIRNAME = "fonts"
+
+PLATFORM_FONTS = {
+    "win32": (
+        "C:/Windows/Fonts/malgun.ttf",
+        "C:/Windows/Fonts/NanumGothic.ttf",
+        "C:/Windows/Fonts/gulim.ttc",
+    ),
+    "darwin": (
+        "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+        "/Library/Fonts/NanumGothic.ttf",
+        "/System/Library/Fonts/Supplemental/AppleGothic.ttf",
+    ),
+    "linux": (
+        "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+        "/usr/share/fonts/nanum/NanumGothic.ttf",
+        "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+        "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+        "/usr/share/fonts/google-noto-cjk/NotoSansCJK-Regular.ttc",
+        "/usr/share/fonts/truetype/noto/NotoSansKR-Regular.ttf",
+    ),
+}
+
+_SAMPLE_CHAR = "가"
+_MISSING_CHAR = "\U0010fffd"  # 어떤 글꼴에도 없는 문자 (없는 글리프 모양 비교용)
+
+
+def platform_fonts(platform=None):
+    """운영체제별 기본 한글 글꼴 경로"""
+    platform = platform or sys.platform
+    if platform.startswith("linux"):
+        platform = "linux"
+    return list(PLATFORM_FONTS.get(platform, PLATFORM_FONTS["linux"]))
+
+
+def folder_fonts(folder):
+    """폴더의 글꼴 파일 (이름 순)"""
+    try:
+        names = sorted(os.listdir(folder))
+    except OSError:
+        return []
+    return [os.path.join(folder, name) for name in names if name.lower().endswith(FONT_EXTENSIONS)]
+
+
+def fontconfig_fonts():
+    """fontconfig가 알려주는 한글 글꼴 경로 (fc-match 결과 우선, fontconfig가 없으면 빈 목록)"""
+    paths = []
+    commands = (
+        ["fc-match", "-f", "%{file}", ":lang=ko"],
+        ["fc-list", ":lang=ko", "file"],
+    )
+    for command in commands:
+        if not shutil.which(command[0]):
+            continue
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, timeout=5)
+        except (OSError, subprocess.SubprocessError):
+            continue
+        for line in result.stdout.splitlines():
+            path = line.strip().rstrip(":").strip()
+            if path and path not in paths:
+                paths.append(path)
+    return paths
+
+
+def _glyph_image(font, char):
+    from PIL import Image, ImageDraw
+
+    left, top, right, bottom = font.getbbox(char)
+    image = Image.new("L", (max(1, right - left) + 2, max(1, bottom - top) + 2))
+    ImageDraw.Draw(image).text((1 - left, 1 - top), char, font=font, fill=255)
+    return image
+
+
+def supports_hangul(font):
+    """글꼴에 한글 글리프가 있는지 ('가'가 없는 글리프 모양과 다르게 그려지는지)"""
+    try:
+        sample = _glyph_image(font, _SAMPLE_CHAR)
+        missing = _glyph_image(font, _MISSING_CHAR)
+    except Exception:
+        return False
+    if sample.getbbox() is None:
+        return False
+    return sample.size != missing.size or sample.tobytes() != missing.tobytes()
+
+
+class FontResolver:
+    """한글 글꼴 결정 + 크기별 FreeTypeFont 캐시 (스레드 안전)"""
+
+    PROBE_SIZE = 24
+
+    def __init__(self, candidates, use_fontconfig=True):
+        self.candidates = list(candidates)
+        self.use_fontconfig = use_fontconfig
+        self._path = None
+        self._resolved = False
+        self._fonts = {}  # 크기 → 글꼴
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        """사용할 글꼴 파일 경로 (없으면 None)"""
+        with self._lock:
+            self._resolve()
+            return self._path
+
+    def _resolve(self):
+        if self._resolved:
+            return
+        from PIL import ImageFont
+
+        self._resolved = True
+        candidates = list(self.candidates)
+        if self.use_fontconfig:
+            candidates += [path for path in fontconfig_fonts() if path not in candidates]
+        for path in candidates:
+            if not os.path.isfile(path):
+                continue
+            try:
+                font = ImageFont.truetype(path, self.PROBE_SIZE)
+            except OSError:
+                continue
+            if supports_hangul(font):
+                self._path = path
+                self._fonts[self.PROBE_SIZE] = font
+                print(f"🔤 썸네일 글꼴: {path}")
+                return
+        print("⚠️ 한글 글꼴을 찾지 못했습니다 - setting/fonts 폴더에 .ttf 글꼴을 넣어주세요 (기본 글꼴은 한글이 깨집니다)")
+
+    def font(self, size):
+        """크기별 글꼴 (같은 크기는 다시 읽지 않음, 한글 글꼴이 없으면 기본 글꼴)"""
+        from PIL import ImageFont
+
+        size = int(size)
+        with self._lock:
+            self._resolve()
+            font = self._fonts.get(size)
+            if font is None:
+                if self._path:
+                    font = ImageFont.truetype(self._path, size)
+                else:
+                    try:
+                        font = ImageFont.load_default(size=size)
+                    except TypeError:
+                        # Pillow 10.1 이전
+                        font = ImageFont.load_default()
+                self._fonts[size] = font
+            return font
+
+
+_resolvers = {}
+_resolvers_lock = threading.Lock()
+
+
+def get_font_resolver(setting_dir, configured=None):
+    """설정된 글꼴 + setting/fonts + 운영체제 기본 경로 순서의 공유 FontResolver
+
+    후보 목록은 처음 한 번만 만들므로 setting/fonts에 글꼴을 추가하면 프로그램을 다시 시작해야 한다.
+    """
+    if isinstance(configured, str):
+        configured = [configured]
+    configured = tuple(configured or ())
+    key = (os.path.abspath(setting_dir), configured)
+    with _resolvers_lock:
+        resolver = _resolvers.get(key)
+        if resolver is None:
+            candidates = list(configured)
+            candidates += folder_fonts(os.path.join(setting_dir, FONT_DIRNAME))
+            candidates += platform_fonts()
+            resolver = FontResolver(candidates, use_fontconfig=sys.platform != "win32")
+            _resolvers[key] = resolver
+    return resolver
@@ -0,0 +1,381 @@
+# -*- coding: utf-8 -*-
+"""
+Gemini API 클라이언트 모듈
+
+같은 API 키/모델을 쓰는 모든 호출(포스팅 스레드, 사전 생성 작업자)이 하나의 클라이언트를 공유하여
+분당 요청 수(RPM)/분당 토큰 수(TPM) 버킷과 동시 요청 수 제한을 함께 지킨다.
+429/5xx 응답은 지터를 섞은 지수 백오프로 재시도하며, 호출마다 전체 마감 시간(deadline)을 둔다.
+
+키워드와 무관한 고정 지침은 시스템 지침(system_instruction)으로 보내고, 가능하면 명시적 컨텍스트 캐시
+(CachedContent)로 만들어 요청마다 다시 보내지 않는다. 캐시 생성은 잠금 밖에서 한 스레드만 수행하고,
+그동안이나 생성에 실패한 경우(최소 토큰 미달, 미지원 모델, 일시적 429/5xx 등)에는 그 호출만 일반 시스템 지침으로
+대신한 뒤 백오프 후 다시 만든다. 응답의 캐시/비캐시 입력 토큰 수는 usage에 누적한다.
+
+google.generativeai는 실제 호출 시점에만 불러온다.
+"""
+
+import hashlib
+import random
+import threading
+import time
+from datetime import timedelta
+
+# 재시도 대상 HTTP 상태 코드 / 예외 이름 (google.api_core.exceptions)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = {
+    "ResourceExhausted",
+    "TooManyRequests",
+    "InternalServerError",
+    "BadGateway",
+    "ServiceUnavailable",
+    "GatewayTimeout",
+    "DeadlineExceeded",
+}
+
+
+class GeminiDeadlineExceeded(Exception):
+    """마감 시간 안에 응답을 받지 못함 (대기/재시도 포함)"""
+    pass
+
+
+class GeminiStreamInterrupted(Exception):
+    """스트리밍 응답을 일부 받은 뒤 연결이 끊어짐 (중복 전달을 막기 위해 재시도하지 않음)"""
+    pass
+
+
+def is_retryable_error(error):
+    """429/5xx 등 잠시 후 다시 시도하면 되는 오류인지 확인"""
+    code = getattr(error, "code", None)
+    if callable(code):
+        # grpc 오류는 code()가 상태 객체를 반환
+        code = None
+    if isinstance(code, int) and code in RETRYABLE_STATUS:
+        return True
+    return type(error).__name__ in RETRYABLE_ERRORS
+
+
+def estimate_tokens(text):
+    """요청 토큰 수 대략 추정 (한글은 글자당 1토큰 안팎, 영문은 4글자당 1토큰 안팎)"""
+    if not text:
+        return 0
+    ascii_count = sum(1 for ch in text if ord(ch) < 128)
+    return (len(text) - ascii_count) + ascii_count // 4 + 1
+
+
+def usage_counts(response):
+    """응답의 (입력 토큰, 그중 캐시된 토큰, 출력 토큰) 반환 (사용량 정보가 없으면 0)"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return 0, 0, 0
+    prompt = getattr(usage, "prompt_token_count", 0) or 0
+    cached = getattr(usage, "cached_content_token_count", 0) or 0
+    output = getattr(usage, "candidates_token_count", 0) or 0
+    return prompt, cached, output
+
+
+class TokenUsageStats:
+    """누적 토큰 사용량 (캐시/비캐시 입력 토큰 구분, 스레드 안전)"""
+
+    def __init__(self):
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.output_tokens = 0
+        self._lock = threading.Lock()
+
+    def record(self, response):
+        """응답 하나의 사용량을 누적하고 (입력, 캐시, 출력) 토큰 수 반환"""
+        prompt, cached, output = usage_counts(response)
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += prompt
+            self.cached_tokens += cached
+            self.output_tokens += output
+        return prompt, cached, output
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_tokens": self.cached_tokens,
+                "uncached_tokens": self.prompt_tokens - self.cached_tokens,
+                "output_tokens": self.output_tokens,
+            }
+
+
+class TokenBucket:
+    """분당 허용량 기준 토큰 버킷 (스레드 안전)"""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount):
+        """amount만큼 차감하고 사용 가능해질 때까지 기다려야 하는 시간(초) 반환
+
+        미리 차감하므로 기다리는 동안 다른 스레드가 같은 몫을 가져가지 않는다.
+        """
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def adjust(self, delta):
+        """예상치와 실제 사용량 차이 보정 (양수면 추가 차감, 음수면 반환)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class GeminiClient:
+    """RPM/TPM 제한, 동시 요청 제한, 재시도, 마감 시간을 적용한 Gemini 호출 계층"""
+
+    DEFAULT_RPM = 15
+    DEFAULT_TPM = 250000
+    DEFAULT_CONCURRENCY = 2
+    DEFAULT_TIMEOUT = 180  # 호출 1회(대기/재시도 포함) 마감 시간 (초)
+    DEFAULT_OUTPUT_TOKENS = 4096  # 응답 토큰 예상치 (TPM 예약용)
+    CONTEXT_CACHE_TTL = 3600  # 시스템 지침 컨텍스트 캐시 유지 시간 (초)
+    CONTEXT_CACHE_MARGIN = 300  # 만료 이만큼 전에 새 캐시 생성 (초)
+    CACHE_RETRY_DELAY = 60  # 컨텍스트 캐시 생성 실패 후 다시 시도하기까지 대기 (초, 실패할 때마다 2배)
+    MAX_RETRIES = 5
+    BASE_DELAY = 2.0
+    MAX_DELAY = 60.0
+
+    def __init__(self, model_name, rpm=None, tpm=None, max_concurrency=None, timeout=None, context_cache=True):
+        self.model_name = model_name
+        self.timeout = timeout or self.DEFAULT_TIMEOUT
+        self.context_cache = context_cache
+        self.usage = TokenUsageStats()
+        self._system_models = {}  # 시스템 지침 해시 → (캐시 모델, 새로 만들 시각)
+        self._plain_models = {}  # 시스템 지침 해시 → 캐시 없이 지침만 적용한 모델
+        self._cache_inflight = set()  # 컨텍스트 캐시를 만드는 중인 지침 해시
+        self._cache_failures = {}  # 시스템 지침 해시 → (연속 실패 수, 다시 시도할 시각)
+        self.request_bucket = TokenBucket(rpm or self.DEFAULT_RPM)
+        self.token_bucket = TokenBucket(tpm or self.DEFAULT_TPM)
+        self._semaphore = threading.BoundedSemaphore(max_concurrency or self.DEFAULT_CONCURRENCY)
+        self._model = None
+        self._model_lock = threading.Lock()
+
+    @property
+    def model(self):
+        """genai.GenerativeModel (처음 사용할 때 생성, genai.configure는 호출하는 쪽에서 수행)"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    import google.generativeai as genai
+                    self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    def model_for(self, system_instruction=None):
+        """시스템 지침을 적용한 모델 반환 (컨텍스트 캐시가 만료되기 전에 새로 생성)
+
+        캐시 생성(네트워크 요청)은 잠금 밖에서 한 스레드만 수행하며, 다른 스레드는 기다리지 않고
+        아직 유효한 이전 캐시나 일반 시스템 지침 모델을 사용한다.
+        """
+        if not system_instruction:
+            return self.model
+        key = hashlib.sha256(system_instruction.encode("utf-8")).hexdigest()
+        now = time.monotonic()
+        with self._model_lock:
+            entry = self._system_models.get(key)
+            if entry and entry[1] > now:
+                return entry[0]
+            # 교체 시각이 지났어도 서버 캐시는 CONTEXT_CACHE_MARGIN 동안 유효
+            current = entry[0] if entry and entry[1] + self.CONTEXT_CACHE_MARGIN > now else None
+            failures, retry_at = self._cache_failures.get(key, (0, 0.0))
+            create = self.context_cache and key not in self._cache_inflight and retry_at <= now
+            if create:
+                self._cache_inflight.add(key)
+        if create:
+            model = self._create_cached_model(system_instruction)
+            with self._model_lock:
+                self._cache_inflight.discard(key)
+                if model is not None:
+                    # 템플릿이 바뀌면 이전 지침의 모델은 더 쓰지 않음 (서버 캐시는 TTL로 만료)
+                    refresh_at = time.monotonic() + self.CONTEXT_CACHE_TTL - self.CONTEXT_CACHE_MARGIN
+                    self._system_models = {key: (model, refresh_at)}
+                    self._cache_failures.pop(key, None)
+                    return model
+                delay = min(self.CONTEXT_CACHE_TTL, self.CACHE_RETRY_DELAY * (2 ** failures))
+                self._cache_failures = {key: (failures + 1, time.monotonic() + delay)}
+                print(f"⚠️ 이번 요청은 일반 시스템 지침을 사용합니다 ({delay // 60}분 후 컨텍스트 캐시 재시도)")
+        return current or self._plain_model(key, system_instruction)
+
+    def _plain_model(self, key, system_instruction):
+        """컨텍스트 캐시 없이 시스템 지침만 적용한 모델 (네트워크 요청 없음)"""
+        with self._model_lock:
+            model = self._plain_models.get(key)
+            if model is None:
+                import google.generativeai as genai
+                model = genai.GenerativeModel(self.model_name, system_instruction=system_instruction)
+                self._plain_models = {key: model}
+            return model
+
+    def _create_cached_model(self, system_instruction):
+        """시스템 지침 컨텍스트 캐시를 만들어 모델 반환 (실패 시 None)"""
+        import google.generativeai as genai
+        try:
+            name = self.model_name if self.model_name.startswith("models/") else f"models/{self.model_name}"
+            cache = genai.caching.CachedContent.create(
+                model=name,
+                display_name="auto-naver-prompt",
+                system_instruction=system_instruction,
+                ttl=timedelta(seconds=self.CONTEXT_CACHE_TTL),
+            )
+            model = genai.GenerativeModel.from_cached_content(cached_content=cache)
+        except Exception as e:
+            print(f"⚠️ 컨텍스트 캐시를 만들 수 없습니다: {type(e).__name__}: {e}")
+            return None
+        print(f"✅ 프롬프트 지침 컨텍스트 캐시 생성 ({self.CONTEXT_CACHE_TTL // 60}분 유지)")
+        return model
+
+    @staticmethod
+    def _remaining(deadline):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise GeminiDeadlineExceeded("Gemini 응답 마감 시간을 초과했습니다")
+        return remaining
+
+    def _wait(self, seconds, deadline, sleep):
+        if seconds <= 0:
+            return
+        if seconds >= self._remaining(deadline):
+            raise GeminiDeadlineExceeded("요청 한도 대기 시간이 마감 시간을 넘습니다")
+        sleep(seconds)
+
+    def generate(self, prompt, timeout=None, sleep=time.sleep, on_retry=None, call=None,
+                 expected_output_tokens=None, system_instruction=None, **kwargs):
+        """generate_content 호출 후 응답 객체 반환
+
+        system_instruction: 키워드와 무관한 고정 지침 (컨텍스트 캐시 대상)
+        sleep: 대기 함수 (정지 요청 시 예외를 던지는 함수를 넘기면 대기 중에도 중단 가능)
+        on_retry(attempt, delay, error): 재시도 직전 호출
+        call(remaining_seconds): 실제 요청 함수 (기본: model.generate_content)
+        expected_output_tokens: TPM 예약용 응답 토큰 예상치 (여러 글을 한 번에 요청할 때 크게 지정)
+        """
+        deadline = time.monotonic() + (timeout or self.timeout)
+        expected_tokens = (
+            estimate_tokens(system_instruction) + estimate_tokens(prompt)
+            + (expected_output_tokens or self.DEFAULT_OUTPUT_TOKENS)
+        )
+        if call is None:
+            base_options = dict(kwargs.pop("request_options", None) or {})
+
+            def call(remaining):
+                options = dict(base_options)
+                options.setdefault("timeout", remaining)
+                model = self.model_for(system_instruction)
+                return model.generate_content(prompt, request_options=options, **kwargs)
+
+        attempt = 0
+        while True:
+            self._wait(self.request_bucket.reserve(1), deadline, sleep)
+            try:
+                self._wait(self.token_bucket.reserve(expected_tokens), deadline, sleep)
+                if not self._semaphore.acquire(timeout=self._remaining(deadline)):
+                    raise GeminiDeadlineExceeded("동시 요청 슬롯을 얻지 못했습니다")
+                try:
+                    response = call(self._remaining(deadline))
+                finally:
+                    self._semaphore.release()
+            except Exception as e:
+                # 응답을 받지 못한 요청(거절/오류/마감 시간 초과/정지)은 사용량을 알 수 없으므로 TPM 예약분 반환
+                self.token_bucket.adjust(-expected_tokens)
+                if isinstance(e, GeminiDeadlineExceeded) or not is_retryable_error(e) or attempt >= self.MAX_RETRIES:
+                    raise
+                error = e
+            else:
+                self._settle_tokens(response, expected_tokens)
+                return response
+
+            # 지터를 섞은 지수 백오프
+            attempt += 1
+            delay = random.uniform(self.BASE_DELAY, min(self.MAX_DELAY, self.BASE_DELAY * (2 ** attempt)))
+            if on_retry:
+                on_retry(attempt, delay, error)
+            self._wait(delay, deadline, sleep)
+
+    def generate_stream(self, prompt, on_chunk, timeout=None, sleep=time.sleep, on_retry=None,
+                        system_instruction=None, **kwargs):
+        """stream=True로 호출하여 응답 조각이 올 때마다 on_chunk(텍스트) 호출, 응답 객체 반환
+
+        첫 조각을 받기 전의 429/5xx는 generate()와 같이 재시도하며,
+        조각을 전달한 뒤 끊기면 GeminiStreamInterrupted를 발생시킨다.
+        """
+        base_options = dict(kwargs.pop("request_options", None) or {})
+
+        def call(remaining):
+            call_deadline = time.monotonic() + remaining
+            options = dict(base_options)
+            options.setdefault("timeout", remaining)
+            model = self.model_for(system_instruction)
+            response = model.generate_content(prompt, stream=True, request_options=options, **kwargs)
+            emitted = False
+            try:
+                for chunk in response:
+                    try:
+                        text = chunk.text
+                    except ValueError:
+                        # 안전 필터 등으로 텍스트 파트가 없는 조각
+                        text = ""
+                    if text:
+                        emitted = True
+                        on_chunk(text)
+                    if time.monotonic() > call_deadline:
+                        raise GeminiDeadlineExceeded("Gemini 스트리밍 응답 마감 시간을 초과했습니다")
+            except GeminiDeadlineExceeded:
+                raise
+            except Exception as e:
+                if emitted and is_retryable_error(e):
+                    raise GeminiStreamInterrupted(f"스트리밍 응답이 중간에 끊어졌습니다: {e}") from e
+                raise
+            return response
+
+        return self.generate(
+            prompt, timeout=timeout, sleep=sleep, on_retry=on_retry, call=call,
+            system_instruction=system_instruction,
+        )
+
+    def _settle_tokens(self, response, expected_tokens):
+        """응답의 실제 토큰 사용량으로 TPM 버킷 보정 및 사용량 누적"""
+        self.usage.record(response)
+        usage = getattr(response, "usage_metadata", None)
+        total = getattr(usage, "total_token_count", None) if usage is not None else None
+        if total:
+            self.token_bucket.adjust(total - expected_tokens)
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_gemini_client(api_key, model_name, config=None):
+    """API 키/모델별 공유 GeminiClient 반환 (할당량은 키/모델 단위로 적용되므로 공유)"""
+    config = config or {}
+    key = (api_key or "", model_name)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = GeminiClient(
+                model_name,
+                rpm=config.get("gemini_rpm"),
+                tpm=config.get("gemini_tpm"),
+                max_concurrency=config.get("gemini_max_concurrency"),
+                timeout=config.get("gemini_timeout"),
+                context_cache=config.get("gemini_context_cache", True),
+            )
+            _clients[key] = client
+    return client
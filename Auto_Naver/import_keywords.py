@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+키워드 대량 가져오기 도구
+수십만~수백만 줄의 키워드 목록을 setting/keywords.txt 대기열에 추가
+
+사용법: python import_keywords.py <키워드목록.txt> [데이터 폴더]
+"""
+
+import os
+import sys
+import time
+from keyword_store import get_keyword_store
+
+
+def main():
+    print("=" * 50)
+    print("네이버 블로그 자동화 - 키워드 대량 가져오기")
+    print("=" * 50)
+
+    if len(sys.argv) > 1:
+        source_path = sys.argv[1]
+    else:
+        source_path = input("\n가져올 키워드 파일 경로를 입력하세요: ").strip().strip('"')
+
+    if not source_path or not os.path.isfile(source_path):
+        print(f"❌ 파일을 찾을 수 없습니다: {source_path}")
+        return
+
+    data_dir = sys.argv[2] if len(sys.argv) > 2 else os.path.dirname(os.path.abspath(__file__))
+    store = get_keyword_store(data_dir)
+    print(f"\n대상 폴더: {store.setting_dir}")
+    print(f"가져오기 전 남은 키워드: {store.pending_count():,}개\n")
+
+    started = time.time()
+
+    def report(done, total, stats):
+        percent = done * 100 // total if total else 100
+        print(f"\r⏳ {percent:3d}% | 읽음 {stats['read']:,} | 추가 {stats['added']:,}", end="", flush=True)
+
+    stats = store.bulk_import(source_path, progress=report)
+    print()
+    print(f"\n✅ 가져오기 완료 ({time.time() - started:.1f}초)")
+    print(f"추가: {stats['added']:,}개")
+    print(f"중복 제외 (대기 중/목록 내): {stats['pending_duplicates']:,}개")
+    print(f"중복 제외 (이미 사용): {stats['used_duplicates']:,}개")
+    print(f"현재 남은 키워드: {store.pending_count():,}개")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\n프로그램이 중단되었습니다.")
+    except Exception as e:
+        print(f"\n오류 발생: {e}")
+
+    if len(sys.argv) <= 1:
+        input("\n\nEnter 키를 눌러 종료...")
@@ -0,0 +1,913 @@
+# -*- coding: utf-8 -*-
+"""
+키워드 큐 저장소 모듈 (SQLite 기반)
+
+keywords.txt를 매 포스팅마다 다시 쓰지 않고 setting/keyword_queue.db에 보관하여
+키워드 대여(lease)/완료(ack)를 상수 시간에 처리한다.
+keywords.txt는 사용자가 편집하는 평문 파일로 유지되며,
+파일이 변경되면 다시 가져오고(import) 편집 전에 내보낸다(export).
+
+키워드는 TTL이 있는 임대(lease) 방식으로 꺼낸다. 같은 data_dir(공유 폴더 포함)을
+바라보는 여러 프로세스가 SQLite 잠금으로 직렬화되어 같은 키워드를 동시에 가져가지 않으며,
+임대 중 프로세스가 죽으면 TTL 만료 후 다른 작업자가 다시 가져간다.
+
+사용한 키워드는 정규화(공백/대소문자/한글 NFC) 해시 색인으로 관리하여,
+이미 발행한 키워드가 다시 등록되면 가져오기/임대 시점에 O(1)로 걸러낸다.
+
+keyword_order가 "priority"이면 우선순위/발행 가능 시각/카테고리를 반영한
+힙 기반 스케줄러(KeywordScheduler)로 다음 키워드를 O(log n)에 고른다.
+keywords.txt의 한 줄은 "키워드 | 우선순위 | 발행가능시각 | 카테고리" 형식이며
+키워드 외의 항목은 모두 생략할 수 있다.
+
+대용량 목록은 bulk_import()로 청크 단위 스트리밍하여 추가한다 (import_keywords.py).
+
+남은 키워드 개수는 메모리에 보관하고 keywords.txt와 DB 파일의 mtime/크기가
+바뀐 경우에만 다시 센다. 같은 프로세스에서는 get_keyword_store()로
+하나의 인스턴스를 공유하여 GUI와 포스팅 스레드가 같은 값을 읽는다.
+"""
+
+import hashlib
+import heapq
+import os
+import socket
+import sqlite3
+import threading
+import time
+import unicodedata
+import uuid
+from collections import namedtuple
+from datetime import datetime
+
+STATUS_PENDING = "pending"
+STATUS_LEASED = "leased"
+STATUS_USED = "used"
+STATUS_DUPLICATE = "duplicate"
+
+ORDER_FIFO = "fifo"
+ORDER_PRIORITY = "priority"
+
+BULK_CHUNK_SIZE = 50000  # 대량 가져오기 시 한 번에 처리하는 줄 수
+
+_DATETIME_FORMATS = ("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d")
+
+# lease() 결과: 임대한 키워드 + 그 임대에서 건너뛴(또는 경고만 한) 이미 사용한 키워드 목록
+Lease = namedtuple("Lease", "entry_id keyword skipped")
+
+
+def normalize_keyword(keyword):
+    """중복 비교용 키워드 정규화 (한글 NFC, 대소문자, 연속 공백 통일)"""
+    text = unicodedata.normalize("NFC", keyword or "")
+    return " ".join(text.casefold().split())
+
+
+def keyword_hash(keyword):
+    """정규화된 키워드의 고정 길이 해시"""
+    return hashlib.blake2b(normalize_keyword(keyword).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def parse_keyword_line(line):
+    """keywords.txt 한 줄을 (키워드, 우선순위, 발행가능시각(epoch), 카테고리)로 분리
+
+    예) "크리스마스 선물 추천 | 10 | 2026-12-01 | 시즌"
+    """
+    parts = [part.strip() for part in line.split("|")]
+    keyword = parts[0]
+    priority = 0
+    not_before = 0.0
+    category = ""
+    if len(parts) > 1 and parts[1]:
+        try:
+            priority = int(parts[1])
+        except ValueError:
+            priority = 0
+    if len(parts) > 2 and parts[2]:
+        for fmt in _DATETIME_FORMATS:
+            try:
+                not_before = datetime.strptime(parts[2], fmt).timestamp()
+                break
+            except ValueError:
+                continue
+    if len(parts) > 3:
+        category = parts[3]
+    return keyword, priority, not_before, category
+
+
+def format_keyword_line(keyword, priority=0, not_before=0.0, category=""):
+    """parse_keyword_line의 역변환 (기본값만 있으면 키워드만 기록)"""
+    if not priority and not not_before and not category:
+        return keyword
+    fields = [keyword, str(priority or 0)]
+    fields.append(datetime.fromtimestamp(not_before).strftime("%Y-%m-%d %H:%M") if not_before else "")
+    fields.append(category or "")
+    while fields and not fields[-1]:
+        fields.pop()
+    return " | ".join(fields)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_keyword_store(data_dir, lease_ttl=None, skip_duplicates=None, order_mode=None):
+    """data_dir별 공유 KeywordStore 반환 (개수 캐시를 프로세스 전체에서 공유)"""
+    key = os.path.abspath(data_dir)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = KeywordStore(data_dir)
+            _stores[key] = store
+    if lease_ttl:
+        store.lease_ttl = lease_ttl
+    if skip_duplicates is not None:
+        store.skip_duplicates = skip_duplicates
+    if order_mode:
+        store.set_order_mode(order_mode)
+    return store
+
+
+class KeywordScheduler:
+    """우선순위 키워드 스케줄러 (힙 기반)
+
+    - 발행 가능 시각 전의 키워드는 대기 힙에 두었다가 시각이 되면 카테고리별 준비 힙으로 이동
+    - 카테고리별 준비 힙은 (우선순위 내림차순, 등록 순서)로 정렬
+    - 카테고리 선택 점수 = 선두 키워드 우선순위 - spread_weight × 오늘 해당 카테고리 발행 수
+      (우선순위가 비슷하면 하루 동안 카테고리가 고르게 섞이도록 함)
+    """
+
+    def __init__(self, rows, spread_weight=1.0):
+        self.spread_weight = spread_weight
+        self._delayed = []  # (not_before, -priority, id, category)
+        self._ready = {}  # category -> [(-priority, id)]
+        self._served = {}  # category -> 오늘 발행 수
+        self._served_day = datetime.now().date()
+        for entry_id, priority, not_before, category in rows:
+            self.push(entry_id, priority, not_before, category)
+
+    def push(self, entry_id, priority=0, not_before=0.0, category=""):
+        heapq.heappush(self._delayed, (not_before or 0.0, -(priority or 0), entry_id, category or ""))
+
+    def _promote(self, now):
+        """발행 가능 시각이 지난 키워드를 준비 힙으로 이동"""
+        while self._delayed and self._delayed[0][0] <= now:
+            _, neg_priority, entry_id, category = heapq.heappop(self._delayed)
+            heapq.heappush(self._ready.setdefault(category, []), (neg_priority, entry_id))
+
+    def pop(self, now=None):
+        """지금 발행 가능한 최적 키워드 ID 반환 (없으면 None)"""
+        now = now or time.time()
+        self._promote(now)
+        today = datetime.fromtimestamp(now).date()
+        if today != self._served_day:
+            self._served = {}
+            self._served_day = today
+        best_category = None
+        best_score = None
+        for category, heap in self._ready.items():
+            if not heap:
+                continue
+            neg_priority, entry_id = heap[0]
+            score = (-neg_priority - self.spread_weight * self._served.get(category, 0), -entry_id)
+            if best_score is None or score > best_score:
+                best_category, best_score = category, score
+        if best_category is None:
+            return None
+        _, entry_id = heapq.heappop(self._ready[best_category])
+        self._served[best_category] = self._served.get(best_category, 0) + 1
+        return entry_id
+
+    def next_available_at(self):
+        """대기 중 키워드의 가장 빠른 발행 가능 시각 (없으면 None)"""
+        return self._delayed[0][0] if self._delayed else None
+
+
+class KeywordStore:
+    """키워드 큐 관리 클래스"""
+
+    DB_FILENAME = "keyword_queue.db"
+    DEFAULT_LEASE_TTL = 600  # 초 (포스팅 1건 소요 시간보다 넉넉하게)
+
+    def __init__(self, data_dir, lease_ttl=None, skip_duplicates=True, order_mode=ORDER_FIFO):
+        self.setting_dir = os.path.join(data_dir, "setting")
+        os.makedirs(self.setting_dir, exist_ok=True)
+        self.keywords_file = os.path.join(self.setting_dir, "keywords.txt")
+        self.used_keywords_file = os.path.join(self.setting_dir, "used_keywords.txt")
+        self.db_path = os.path.join(self.setting_dir, self.DB_FILENAME)
+        self.lease_ttl = lease_ttl or self.DEFAULT_LEASE_TTL
+        # True: 이미 사용한 키워드는 건너뜀 / False: 경고만 남기고 그대로 사용
+        self.skip_duplicates = skip_duplicates
+        self.last_import_duplicates = 0  # 마지막 가져오기에서 걸러진 중복 개수
+        # 키워드 선택 순서 (fifo: 파일 순서 / priority: 우선순위 스케줄러)
+        self.order_mode = ORDER_FIFO
+        # 스케줄러는 스레드 안전하지 않으므로 포스팅 스레드와 사전 생성 작업자가 잠금으로 공유
+        self._scheduler_lock = threading.Lock()
+        self._scheduler = None
+        self._scheduler_synced_at = None
+        self.set_order_mode(order_mode)
+        # 남은 키워드 개수 캐시 (파일 서명이 바뀔 때만 다시 계산)
+        self._count = None
+        self._count_signature = None
+        self._count_lock = threading.Lock()
+        self._count_listeners = []
+        # 임대 소유자 식별자 (머신 + 프로세스 + 인스턴스)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._init_db()
+
+    # ------------------------------------------------------------------
+    # DB 기본 처리
+    # ------------------------------------------------------------------
+    def _connect(self):
+        """DB 연결 (autocommit 모드, 트랜잭션은 명시적으로 시작)"""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA synchronous=FULL")
+        return conn
+
+    def _init_db(self):
+        """테이블 생성 및 이전 버전 DB 보정"""
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS keywords (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    keyword TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    added_at REAL NOT NULL,
+                    used_at REAL,
+                    logged INTEGER NOT NULL DEFAULT 0,
+                    lease_owner TEXT,
+                    lease_expires REAL,
+                    norm_hash TEXT,
+                    priority INTEGER NOT NULL DEFAULT 0,
+                    not_before REAL NOT NULL DEFAULT 0,
+                    category TEXT NOT NULL DEFAULT ''
+                )
+            """)
+            self._add_missing_columns(conn, "keywords", {
+                "lease_owner": "TEXT",
+                "lease_expires": "REAL",
+                "norm_hash": "TEXT",
+                "priority": "INTEGER NOT NULL DEFAULT 0",
+                "not_before": "REAL NOT NULL DEFAULT 0",
+                "category": "TEXT NOT NULL DEFAULT ''",
+            })
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_keywords_status ON keywords(status, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_keywords_lease ON keywords(status, lease_expires)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute("CREATE TABLE IF NOT EXISTS used_index (hash TEXT PRIMARY KEY) WITHOUT ROWID")
+            # 임대 방식 이전에 처리 중으로 남은 키워드는 대기열로 복귀
+            conn.execute("UPDATE keywords SET status = ? WHERE status = 'inflight'", (STATUS_PENDING,))
+            # 해시가 없는 이전 버전 행 보정
+            missing = conn.execute("SELECT id, keyword FROM keywords WHERE norm_hash IS NULL").fetchall()
+            if missing:
+                conn.executemany(
+                    "UPDATE keywords SET norm_hash = ? WHERE id = ?",
+                    ((keyword_hash(keyword), entry_id) for entry_id, keyword in missing),
+                )
+            self._ensure_pending_hash_index(conn)
+        finally:
+            conn.close()
+        self._flush_used_log()
+        self._load_used_log()
+
+    @staticmethod
+    def _ensure_pending_hash_index(conn):
+        """대기/임대 중 키워드의 정규화 해시 유일 색인 (대량 가져오기의 INSERT OR IGNORE 중복 제외용)
+
+        이전 버전 DB에 같은 키워드가 두 번 대기 중이면 나중 항목을 중복으로 표시한 뒤 만든다.
+        전체 해시 색인(idx_keywords_hash)은 이 정리에만 쓰고 지운다 (가져오기마다 색인 두 개를 갱신하지 않도록).
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_keywords_pending_hash'"
+        ).fetchone()
+        if exists:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_keywords_hash ON keywords(norm_hash)")
+            conn.execute(
+                "UPDATE keywords SET status = ? WHERE status = ? AND EXISTS ("
+                "SELECT 1 FROM keywords k WHERE k.norm_hash = keywords.norm_hash AND k.id != keywords.id "
+                "AND (k.status = ? OR (k.status = ? AND k.id < keywords.id)))",
+                (STATUS_DUPLICATE, STATUS_PENDING, STATUS_LEASED, STATUS_PENDING),
+            )
+            conn.execute(
+                "UPDATE keywords SET status = ? WHERE status = ? AND EXISTS ("
+                "SELECT 1 FROM keywords k WHERE k.norm_hash = keywords.norm_hash AND k.status = ? "
+                "AND k.id < keywords.id)",
+                (STATUS_DUPLICATE, STATUS_LEASED, STATUS_LEASED),
+            )
+            conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_keywords_pending_hash ON keywords(norm_hash) "
+                f"WHERE status IN ('{STATUS_PENDING}', '{STATUS_LEASED}')"
+            )
+            conn.execute("DROP INDEX idx_keywords_hash")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _add_missing_columns(conn, table, columns):
+        """이전 버전 DB에 없는 컬럼 추가"""
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for name, column_type in columns.items():
+            if name not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+
+    def _get_meta(self, conn, key, default=None):
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, conn, key, value):
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    @staticmethod
+    def _file_signature(path):
+        """파일 변경 감지용 서명 (mtime + 크기)"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return ""
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def _load_used_log(self):
+        """used_keywords.txt에서 마지막으로 읽은 위치 이후에 추가된 줄만 색인에 반영"""
+        try:
+            size = os.path.getsize(self.used_keywords_file)
+        except OSError:
+            return
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                offset = int(self._get_meta(conn, "used_log_offset", "0") or 0)
+                if size < offset:
+                    # 파일이 교체/축소된 경우 처음부터 다시 읽음 (INSERT OR IGNORE라 중복 무해)
+                    offset = 0
+                if size > offset:
+                    with open(self.used_keywords_file, "rb") as f:
+                        f.seek(offset)
+                        data = f.read()
+                    # 마지막 줄이 아직 완성되지 않았으면 다음에 읽음
+                    end = data.rfind(b"\n") + 1
+                    hashes = []
+                    for raw in data[:end].splitlines():
+                        keyword = raw.decode("utf-8", errors="replace").lstrip("\ufeff").strip()
+                        if keyword and not keyword.startswith("#"):
+                            hashes.append((keyword_hash(keyword),))
+                    conn.executemany("INSERT OR IGNORE INTO used_index (hash) VALUES (?)", hashes)
+                    self._set_meta(conn, "used_log_offset", offset + end)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def is_used(self, keyword):
+        """이미 사용한 키워드인지 확인 (정규화 해시 색인 조회)"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT 1 FROM used_index WHERE hash = ?", (keyword_hash(keyword),)).fetchone()
+            return row is not None
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _missing_trailing_newline(path):
+        """파일이 줄바꿈 없이 끝나는지 확인 (수동 편집된 로그에 이어 쓰기 전)"""
+        try:
+            with open(path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return False
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b"\n"
+        except OSError:
+            return False
+
+    @staticmethod
+    def _iter_keyword_lines(path):
+        """keywords.txt를 한 줄씩 읽어 (키워드, 우선순위, 발행가능시각, 카테고리) 반환
+
+        전체를 메모리에 올리지 않는다.
+        """
+        with open(path, "r", encoding="utf-8-sig") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    entry = parse_keyword_line(line)
+                    if entry[0]:
+                        yield entry
+
+    def set_order_mode(self, order_mode):
+        """키워드 선택 순서 변경 (fifo / priority)"""
+        order_mode = (order_mode or ORDER_FIFO).lower()
+        if order_mode not in (ORDER_FIFO, ORDER_PRIORITY):
+            order_mode = ORDER_FIFO
+        with self._scheduler_lock:
+            if order_mode != self.order_mode:
+                self.order_mode = order_mode
+                self._scheduler = None
+
+    # ------------------------------------------------------------------
+    # keywords.txt 동기화
+    # ------------------------------------------------------------------
+    def sync(self):
+        """keywords.txt가 마지막 동기화 이후 변경되었으면 대기열을 파일 내용으로 갱신"""
+        signature = self._file_signature(self.keywords_file)
+        if not signature:
+            return False
+        conn = self._connect()
+        try:
+            if self._get_meta(conn, "keywords_file_sig") == signature:
+                return False
+            imported = self._import_keywords_file(conn, signature)
+        finally:
+            conn.close()
+        if imported:
+            self._count = None
+            with self._scheduler_lock:
+                self._scheduler = None
+        return imported
+
+    def _import_keywords_file(self, conn, signature):
+        """keywords.txt를 대기열로 가져오기 (파일이 대기 키워드의 기준)"""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 다른 프로세스가 먼저 가져간 경우 중복 가져오기 방지
+            if self._get_meta(conn, "keywords_file_sig") == signature:
+                conn.execute("COMMIT")
+                return False
+            # 마지막으로 파일을 내보낸 뒤(내보낸 적이 없으면 처음부터) 사용 완료된 키워드는 파일에 아직 남아 있는
+            # 줄이므로, 임대 중인 키워드와 함께 정규화 기준으로 다시 넣지 않음 (중복 개수에도 세지 않음)
+            exported_at = float(self._get_meta(conn, "exported_at", "0") or 0)
+            skip = {
+                row[0] for row in conn.execute(
+                    "SELECT norm_hash FROM keywords WHERE (status = ? AND used_at >= ?) OR status = ?",
+                    (STATUS_USED, exported_at, STATUS_LEASED),
+                )
+            }
+            conn.execute("DELETE FROM keywords WHERE status IN (?, ?)", (STATUS_PENDING, STATUS_DUPLICATE))
+            now = time.time()
+
+            def entries():
+                for kw, priority, not_before, category in self._iter_keyword_lines(self.keywords_file):
+                    norm_hash = keyword_hash(kw)
+                    if norm_hash not in skip:
+                        yield kw, STATUS_PENDING, now, norm_hash, priority, not_before, category
+
+            # 파일 안에서 정규화 기준으로 같은 키워드는 첫 줄만 대기열에 넣음 (대기 중 해시 유일 색인)
+            conn.executemany(
+                "INSERT OR IGNORE INTO keywords (keyword, status, added_at, norm_hash, priority, not_before, category) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                entries(),
+            )
+            # 이미 사용한 키워드는 중복으로 표시 (대기열에서 제외)
+            self.last_import_duplicates = 0
+            if self.skip_duplicates:
+                cursor = conn.execute(
+                    "UPDATE keywords SET status = ? WHERE status = ? AND norm_hash IN (SELECT hash FROM used_index)",
+                    (STATUS_DUPLICATE, STATUS_PENDING),
+                )
+                self.last_import_duplicates = cursor.rowcount
+            self._set_meta(conn, "keywords_file_sig", signature)
+            self._set_meta(conn, "synced_at", now)
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def export_keywords_file(self):
+        """남은 키워드를 keywords.txt로 내보내기 (GUI 편집기에서 열기 전 호출)"""
+        self.sync()
+        conn = self._connect()
+        try:
+            # 내보내는 동안 다른 작업자의 변경을 막음
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT keyword, priority, not_before, category FROM keywords WHERE status IN (?, ?) ORDER BY id",
+                    (STATUS_PENDING, STATUS_LEASED),
+                )
+                tmp_path = self.keywords_file + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    for row in rows:
+                        f.write(format_keyword_line(*row) + "\n")
+                os.replace(tmp_path, self.keywords_file)
+                now = time.time()
+                self._set_meta(conn, "keywords_file_sig", self._file_signature(self.keywords_file))
+                self._set_meta(conn, "synced_at", now)
+                self._set_meta(conn, "exported_at", now)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+        self._refresh_count()
+
+    def bulk_import(self, source_path, progress=None, chunk_size=BULK_CHUNK_SIZE):
+        """대용량 키워드 목록을 대기열 뒤에 추가
+
+        파일을 chunk_size 줄씩 나눠 읽으므로 전체 목록을 메모리에 올리지 않는다.
+        전체를 한 트랜잭션에서 executemany + INSERT OR IGNORE로 넣고, 대기/임대 중 해시 유일 색인으로
+        목록 내부/대기 중 키워드와의 중복을 제외한다. 이미 사용한 키워드는 중복 상태로 넣어 대기열에서 뺀다.
+        추가된 키워드는 keywords.txt 뒤에 이어 쓰므로 전체를 다시 내보내지 않는다.
+        progress(읽은 바이트, 전체 바이트, 통계)는 청크마다 호출된다.
+        """
+        self.sync()
+        stats = {"read": 0, "added": 0, "pending_duplicates": 0, "used_duplicates": 0}
+        total_bytes = os.path.getsize(source_path)
+        skip_used = 1 if self.skip_duplicates else 0
+        insert_sql = (
+            "INSERT OR IGNORE INTO keywords (keyword, status, added_at, norm_hash, priority, not_before, category) "
+            f"VALUES (?, CASE WHEN ? AND EXISTS (SELECT 1 FROM used_index WHERE hash = ?) "
+            f"THEN '{STATUS_DUPLICATE}' ELSE '{STATUS_PENDING}' END, ?, ?, ?, ?, ?)"
+        )
+        conn = self._connect()
+        try:
+            # 무작위 해시 인덱스 갱신이 디스크를 오가지 않도록 캐시를 넉넉히 사용
+            conn.execute("PRAGMA cache_size = -131072")
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM keywords").fetchone()[0]
+                changes_before = conn.total_changes
+                now = time.time()
+                with open(source_path, "r", encoding="utf-8-sig", errors="replace") as f:
+                    while True:
+                        lines = f.readlines(chunk_size * 64)
+                        if not lines:
+                            break
+                        batch = []
+                        for line in lines:
+                            line = line.strip()
+                            if not line or line.startswith("#"):
+                                continue
+                            if "|" in line:
+                                keyword, priority, not_before, category = parse_keyword_line(line)
+                            else:
+                                keyword, priority, not_before, category = line, 0, 0.0, ""
+                            keyword = " ".join(unicodedata.normalize("NFC", keyword).split())
+                            if keyword:
+                                # keyword_hash()와 같은 값 (이미 정규화했으므로 casefold만 적용)
+                                digest = hashlib.blake2b(keyword.casefold().encode("utf-8"), digest_size=16).hexdigest()
+                                batch.append((keyword, skip_used, digest, now, digest, priority, not_before, category))
+                        stats["read"] += len(batch)
+                        conn.executemany(insert_sql, batch)
+                        if progress:
+                            progress(f.buffer.tell(), total_bytes, dict(stats))
+                inserted = conn.total_changes - changes_before
+                stats["used_duplicates"] = conn.execute(
+                    "SELECT COUNT(*) FROM keywords WHERE id > ? AND status = ?", (last_id, STATUS_DUPLICATE)
+                ).fetchone()[0]
+                stats["added"] = inserted - stats["used_duplicates"]
+                stats["pending_duplicates"] = stats["read"] - inserted
+                if stats["added"]:
+                    self._append_keywords_file(conn, last_id)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+        if stats["added"]:
+            self._count = None
+            with self._scheduler_lock:
+                self._scheduler = None
+            self.pending_count()
+        return stats
+
+    def _append_keywords_file(self, conn, after_id):
+        """after_id 이후 추가된 대기 키워드를 keywords.txt 뒤에 이어 쓰고 서명 갱신 (bulk_import 트랜잭션 안에서 호출)
+
+        keywords.txt가 마지막 동기화 이후 바뀌었으면 이어 쓰지 않고 전체를 내보낸다.
+        """
+        rows = conn.execute(
+            "SELECT keyword, priority, not_before, category FROM keywords WHERE id > ? AND status = ? ORDER BY id",
+            (after_id, STATUS_PENDING),
+        )
+        if self._get_meta(conn, "keywords_file_sig") == self._file_signature(self.keywords_file):
+            needs_newline = self._missing_trailing_newline(self.keywords_file)
+            with open(self.keywords_file, "a", encoding="utf-8") as f:
+                if needs_newline:
+                    f.write("\n")
+                f.writelines(format_keyword_line(*row) + "\n" for row in rows)
+        else:
+            rows = conn.execute(
+                "SELECT keyword, priority, not_before, category FROM keywords WHERE status IN (?, ?) ORDER BY id",
+                (STATUS_PENDING, STATUS_LEASED),
+            )
+            tmp_path = self.keywords_file + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.writelines(format_keyword_line(*row) + "\n" for row in rows)
+            os.replace(tmp_path, self.keywords_file)
+            now = time.time()
+            self._set_meta(conn, "synced_at", now)
+            self._set_meta(conn, "exported_at", now)
+        self._set_meta(conn, "keywords_file_sig", self._file_signature(self.keywords_file))
+
+    # ------------------------------------------------------------------
+    # 대기열 조작
+    # ------------------------------------------------------------------
+    def pending_count(self):
+        """남은 키워드 개수 (임대 중 키워드 포함)
+
+        keywords.txt와 DB 파일이 마지막 계산 이후 바뀌지 않았으면 캐시 값을 반환한다.
+        """
+        if self._count is not None and self._state_signature() == self._count_signature:
+            return self._count
+        self.sync()
+        return self._recount()
+
+    def _recount(self):
+        """DB에서 남은 키워드 수를 다시 세어 캐시 갱신
+
+        서명을 세기 전에 읽으므로 세는 도중이나 직후에 다른 프로세스가 바꾼 내용은
+        다음 pending_count()에서 서명이 달라져 다시 센다 (다른 프로세스의 변경을 가리지 않음).
+        """
+        signature = self._state_signature()
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM keywords WHERE status IN (?, ?)",
+                (STATUS_PENDING, STATUS_LEASED),
+            ).fetchone()
+            count = row[0] if row else 0
+        finally:
+            conn.close()
+        self._set_count(count, signature)
+        return count
+
+    @property
+    def cached_count(self):
+        """디스크 접근 없이 마지막으로 알려진 남은 키워드 개수"""
+        return self._count or 0
+
+    def add_count_listener(self, callback):
+        """남은 키워드 개수가 바뀔 때 callback(count) 호출 (호출 스레드 주의)"""
+        self._count_listeners.append(callback)
+
+    def remove_count_listener(self, callback):
+        if callback in self._count_listeners:
+            self._count_listeners.remove(callback)
+
+    def _state_signature(self):
+        """개수 캐시 무효화 기준 (keywords.txt + DB 파일의 mtime/크기)"""
+        return self._file_signature(self.keywords_file), self._file_signature(self.db_path)
+
+    def _set_count(self, count, signature):
+        with self._count_lock:
+            changed = count != self._count
+            self._count = count
+            self._count_signature = signature
+        if changed:
+            for callback in list(self._count_listeners):
+                try:
+                    callback(count)
+                except Exception as e:
+                    print(f"⚠️ 키워드 개수 알림 실패: {e}")
+
+    def _refresh_count(self):
+        """자체 변경 후 캐시 갱신 (이미 센 적이 있을 때만)
+
+        변경 후의 서명만 새로 받고 개수를 더하고 빼면, 그 사이 다른 프로세스가 바꾼 내용까지
+        반영된 것으로 보고 가리게 되므로 색인(status, id)으로 다시 센다.
+        """
+        if self._count is not None:
+            self._recount()
+
+    def lease(self, ttl=None):
+        """다음 키워드를 임대하고 Lease(id, keyword, skipped) 반환, 없으면 None
+
+        임대 기한이 지난 키워드(작업자가 비정상 종료된 경우)를 먼저 회수한다.
+        이미 사용한 키워드는 건너뛰고 skipped에 담아 돌려준다 (여러 스레드가 같은 저장소를 쓰므로 인스턴스에 두지 않음).
+        """
+        self.sync()
+        ttl = ttl or self.lease_ttl
+        skipped = []
+        with self._scheduler_lock:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                now = time.time()
+                while True:
+                    row = conn.execute(
+                        "SELECT id, keyword, norm_hash FROM keywords WHERE status = ? AND lease_expires < ? "
+                        "ORDER BY id LIMIT 1",
+                        (STATUS_LEASED, now),
+                    ).fetchone()
+                    if not row:
+                        if self.order_mode == ORDER_PRIORITY:
+                            row = self._next_scheduled(conn, now)
+                        else:
+                            row = conn.execute(
+                                "SELECT id, keyword, norm_hash FROM keywords WHERE status = ? ORDER BY id LIMIT 1",
+                                (STATUS_PENDING,),
+                            ).fetchone()
+                    if not row:
+                        break
+                    used = conn.execute("SELECT 1 FROM used_index WHERE hash = ?", (row[2],)).fetchone()
+                    if not used:
+                        break
+                    if not self.skip_duplicates:
+                        # 건너뛰지 않는 설정이면 표시만 하고 그대로 사용
+                        skipped.append(row[1])
+                        break
+                    conn.execute(
+                        "UPDATE keywords SET status = ?, lease_owner = NULL, lease_expires = NULL WHERE id = ?",
+                        (STATUS_DUPLICATE, row[0]),
+                    )
+                    skipped.append(row[1])
+                if row:
+                    conn.execute(
+                        "UPDATE keywords SET status = ?, lease_owner = ?, lease_expires = ? WHERE id = ?",
+                        (STATUS_LEASED, self.owner, now + ttl, row[0]),
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                # 스케줄러에서 꺼낸 항목이 반영되지 않았을 수 있으므로 다음 임대 때 다시 구성
+                self._scheduler = None
+                raise
+            finally:
+                conn.close()
+        self._refresh_count()
+        return Lease(row[0], row[1], skipped) if row else None
+
+    def _next_scheduled(self, conn, now):
+        """우선순위 스케줄러에서 다음 대기 키워드 행 조회 (_scheduler_lock 보유 상태에서 호출)"""
+        synced_at = self._get_meta(conn, "synced_at")
+        rebuilt = False
+        if self._scheduler is None or synced_at != self._scheduler_synced_at:
+            # 다른 프로세스가 새로 가져온 경우에도 다시 구성
+            self._rebuild_scheduler(conn, synced_at)
+            rebuilt = True
+        while True:
+            entry_id = self._scheduler.pop(now)
+            if entry_id is None:
+                if rebuilt:
+                    return None
+                # 다른 작업자가 반납한 키워드가 힙에 없을 수 있으므로 한 번 다시 구성
+                self._rebuild_scheduler(conn, synced_at)
+                rebuilt = True
+                continue
+            row = conn.execute(
+                "SELECT id, keyword, norm_hash FROM keywords WHERE id = ? AND status = ?",
+                (entry_id, STATUS_PENDING),
+            ).fetchone()
+            # 다른 작업자가 이미 가져간 항목은 버리고 다음 후보 확인
+            if row:
+                return row
+
+    def _rebuild_scheduler(self, conn, synced_at):
+        rows = conn.execute(
+            "SELECT id, priority, not_before, category FROM keywords WHERE status = ?",
+            (STATUS_PENDING,),
+        ).fetchall()
+        served = self._scheduler._served if self._scheduler is not None else None
+        self._scheduler = KeywordScheduler(rows)
+        if served:
+            # 오늘 카테고리별 발행 수는 유지
+            self._scheduler._served = served
+        self._scheduler_synced_at = synced_at
+
+    def next_available_at(self):
+        """우선순위 모드에서 예약 대기 중인 키워드의 가장 빠른 발행 가능 시각"""
+        with self._scheduler_lock:
+            if self._scheduler is None:
+                return None
+            return self._scheduler.next_available_at()
+
+    def renew(self, entry_id, ttl=None):
+        """임대 기한 연장 (임대를 잃었으면 False)"""
+        ttl = ttl or self.lease_ttl
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "UPDATE keywords SET lease_expires = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                (time.time() + ttl, entry_id, STATUS_LEASED, self.owner),
+            )
+            renewed = cursor.rowcount > 0
+        finally:
+            conn.close()
+        self._refresh_count()
+        return renewed
+
+    def release(self, entry_id):
+        """임대한 키워드를 대기열로 되돌림 (포스팅 실패 시)"""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE keywords SET status = ?, lease_owner = NULL, lease_expires = NULL "
+                "WHERE id = ? AND status = ? AND lease_owner = ?",
+                (STATUS_PENDING, entry_id, STATUS_LEASED, self.owner),
+            )
+            row = conn.execute(
+                "SELECT priority, not_before, category FROM keywords WHERE id = ? AND status = ?",
+                (entry_id, STATUS_PENDING),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row:
+            with self._scheduler_lock:
+                if self._scheduler is not None:
+                    self._scheduler.push(entry_id, *row)
+        self._refresh_count()
+
+    def ack(self, entry_id):
+        """키워드 사용 완료 처리 후 used_keywords.txt에 기록
+
+        임대가 만료되어 다른 작업자가 가져간 경우 False를 반환한다.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.execute(
+                "UPDATE keywords SET status = ?, used_at = ?, logged = 0, lease_owner = NULL, lease_expires = NULL "
+                "WHERE id = ? AND status = ? AND lease_owner = ?",
+                (STATUS_USED, time.time(), entry_id, STATUS_LEASED, self.owner),
+            )
+            acked = cursor.rowcount > 0
+            if acked:
+                conn.execute(
+                    "INSERT OR IGNORE INTO used_index (hash) SELECT norm_hash FROM keywords WHERE id = ?",
+                    (entry_id,),
+                )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        # DB 반영 후 로그 기록 (중간에 종료되어도 다음 실행 시 _flush_used_log가 이어서 기록)
+        self._flush_used_log()
+        self._refresh_count()
+        return acked
+
+    def _flush_used_log(self):
+        """used_keywords.txt에 아직 기록되지 않은 사용 완료 키워드 추가"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT id, keyword FROM keywords WHERE status = ? AND logged = 0 ORDER BY used_at, id",
+                    (STATUS_USED,),
+                ).fetchall()
+                if rows:
+                    needs_newline = self._missing_trailing_newline(self.used_keywords_file)
+                    with open(self.used_keywords_file, "a", encoding="utf-8") as f:
+                        if needs_newline:
+                            f.write("\n")
+                        for _, keyword in rows:
+                            f.write(keyword + "\n")
+                    conn.executemany("UPDATE keywords SET logged = 1 WHERE id = ?", ((row[0],) for row in rows))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+
+class LeaseKeeper:
+    """임대 중인 키워드의 기한을 주기적으로 연장하는 백그라운드 스레드"""
+
+    def __init__(self, store, interval=None, on_lost=None):
+        self.store = store
+        self.interval = interval or max(5, store.lease_ttl / 3)
+        self.on_lost = on_lost
+        self._entries = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def add(self, entry_id):
+        """연장 대상 추가 (스레드가 없으면 시작)"""
+        with self._lock:
+            self._entries.add(entry_id)
+            if self._thread is None or not self._thread.is_alive():
+                self._stop_event.clear()
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def discard(self, entry_id):
+        """연장 대상 제거 (ack/release 후 호출)"""
+        with self._lock:
+            self._entries.discard(entry_id)
+
+    def stop(self):
+        """연장 중지"""
+        self._stop_event.set()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            with self._lock:
+                entries = list(self._entries)
+            for entry_id in entries:
+                try:
+                    renewed = self.store.renew(entry_id)
+                except Exception as e:
+                    print(f"⚠️ 키워드 임대 연장 실패 (id={entry_id}): {e}")
+                    continue
+                if not renewed:
+                    self.discard(entry_id)
+                    if self.on_lost:
+                        self.on_lost(entry_id)
@@ -0,0 +1,88 @@
+// 웹 AI 대역 페이지 공용 스크립트 (mock_llm_server.py가 /web/ 아래에서 제공)
+// 입력창에서 Enter → 입력창 비움 → /mock/answer로 답변 원문 요청 → 지연 후 응답 노드에 조금씩 표시 → 끝나면 복사 버튼 추가
+// 각 페이지는 MockAI.init({...})로 실제 사이트와 같은 선택자의 노드를 만드는 함수를 넘긴다.
+(function () {
+    "use strict";
+
+    const FALLBACK_ANSWER = "제목\n대역 답변, 서버 없이 열린 페이지\n서론\nmock_llm_server.py로 페이지를 열어 주세요.";
+
+    function editorText(editor) {
+        return (editor.isContentEditable ? editor.innerText : editor.value) || "";
+    }
+
+    function clearEditor(editor) {
+        if (editor.isContentEditable) {
+            editor.innerHTML = "<p><br></p>";
+        } else {
+            editor.value = "";
+        }
+        editor.dispatchEvent(new Event("input", {bubbles: true}));
+    }
+
+    async function fetchAnswer(prompt) {
+        try {
+            const response = await fetch("/mock/answer", {
+                method: "POST",
+                headers: {"Content-Type": "application/json"},
+                body: JSON.stringify({prompt: prompt}),
+            });
+            return await response.json();
+        } catch (e) {
+            return {text: FALLBACK_ANSWER, error: false, latency: 0.5, chars_per_second: 600};
+        }
+    }
+
+    function sleep(ms) {
+        return new Promise((resolve) => setTimeout(resolve, ms));
+    }
+
+    function init(options) {
+        const editor = document.querySelector(options.editor);
+        const thread = document.querySelector(options.thread);
+        let busy = false;
+
+        async function submit() {
+            const prompt = editorText(editor).trim();
+            if (!prompt || busy) return;
+            busy = true;
+            clearEditor(editor);
+            if (options.userMessage) thread.appendChild(options.userMessage(prompt));
+
+            const answer = await fetchAnswer(prompt);
+            await sleep(answer.latency * 1000);
+            const {node, body} = options.response();
+            thread.appendChild(node);
+            if (answer.error) {
+                // 오류 주입: 답변이 멈춘 채 복사 버튼이 나타나지 않음
+                body.innerText = "답변을 생성하는 중입니다...";
+                busy = false;
+                return;
+            }
+            // 실제 사이트처럼 조각 단위로 표시 (100ms마다)
+            const perTick = Math.max(1, Math.round(answer.chars_per_second / 10));
+            for (let shown = perTick; ; shown += perTick) {
+                body.innerText = answer.text.slice(0, shown);
+                if (shown >= answer.text.length) break;
+                await sleep(100);
+            }
+            node.appendChild(options.copyButton());
+            busy = false;
+        }
+
+        editor.addEventListener("keydown", (event) => {
+            if (event.key === "Enter" && !event.shiftKey && !event.isComposing) {
+                event.preventDefault();
+                submit();
+            }
+        });
+        for (const button of document.querySelectorAll(options.newChat)) {
+            button.addEventListener("click", (event) => {
+                event.preventDefault();
+                thread.innerHTML = "";
+                clearEditor(editor);
+            });
+        }
+    }
+
+    window.MockAI = {init: init};
+})();
@@ -0,0 +1,498 @@
+# -*- coding: utf-8 -*-
+"""
+오프라인 AI 대역(mock) 서버
+Gemini 할당량을 쓰지 않고 글 생성 파이프라인의 처리량을 재기 위한 로컬 서버
+
+- google.generativeai REST 호출: generateContent / streamGenerateContent / cachedContents
+- 웹 AI 대역 페이지: mock_llm 폴더의 Gemini/ChatGPT/Perplexity 모양 HTML (/web/gemini 등)
+
+응답 지연(첫 토큰까지), 출력 속도(토큰/초), 오류 주입 비율을 지정할 수 있으며
+요청에서 키워드를 찾아 라벨 형식(제목/서론/소제목1/본문1...) 글을 만들어 돌려준다.
+(일괄 요청은 글별 구분선, JSON 출력 모드는 POST_RESPONSE_SCHEMA 형식의 JSON)
+
+config.json 연결:
+    "gemini_api_endpoint": "http://127.0.0.1:8765"
+    "web_ai_urls": {"gemini": "http://127.0.0.1:8765/web/gemini",
+                    "gpt": "http://127.0.0.1:8765/web/chatgpt",
+                    "perplexity": "http://127.0.0.1:8765/web/perplexity"}
+
+사용법: python mock_llm_server.py [--port 8765] [--latency 1.5] [--token-rate 300]
+        [--error-rate 0.1] [--error-status 429] [--web-error-rate 0]
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from prompt_store import BATCH_KEYWORD_TOKEN
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mock_llm")
+WEB_PAGES = {"gemini": "gemini.html", "chatgpt": "chatgpt.html", "perplexity": "perplexity.html"}
+
+CHARS_PER_TOKEN = 2  # 한국어 기준 대략적인 글자/토큰 비율
+STREAM_CHUNK_TOKENS = 20  # 스트리밍 조각 하나의 토큰 수
+DEFAULT_KEYWORD = "테스트 키워드"
+
+_API_PATH = re.compile(r"^/v1\w*/models/(?P<model>[^:/]+):(?P<method>generateContent|streamGenerateContent)$")
+_CACHE_PATH = re.compile(r"^/v1\w*/cachedContents(?:/(?P<id>[^/]+))?$")
+_REQUEST_KEYWORD = re.compile(rf"^{re.escape(BATCH_KEYWORD_TOKEN)}:\s*(.+)$", re.MULTILINE)
+_TITLE_EXAMPLE_KEYWORD = re.compile(r'제목 예시:\s*"(.+?),')
+_BATCH_LIST = re.compile(r"\[키워드 목록\]\n((?:\d+\.\s*.+\n?)+)")
+
+_ERROR_STATUS = {429: "RESOURCE_EXHAUSTED", 500: "INTERNAL", 503: "UNAVAILABLE"}
+
+_SENTENCES = (
+    "{keyword}을(를) 처음 알아보는 분들이 가장 많이 묻는 부분부터 차근차근 정리해 보겠습니다.",
+    "실제로 {keyword}을(를) 준비할 때는 기간과 비용, 필요한 서류를 먼저 확인하는 것이 좋습니다.",
+    "많은 분들이 놓치는 부분은 세부 조건이 해마다 조금씩 바뀐다는 점입니다.",
+    "공식 안내 페이지와 최신 공지를 함께 확인하면 불필요한 시행착오를 줄일 수 있습니다.",
+    "처음에는 복잡해 보여도 순서대로 따라 하면 생각보다 어렵지 않게 마무리할 수 있습니다.",
+    "주변 경험담도 참고가 되지만 개인 상황에 따라 결과가 달라질 수 있다는 점을 기억하세요.",
+)
+_SUBTITLES = ("{keyword} 기본 정보 정리", "{keyword} 준비 과정과 주의할 점", "{keyword} 자주 묻는 질문")
+
+
+def _paragraph(keyword, min_chars, offset=0):
+    lines = []
+    length = 0
+    index = offset
+    while length < min_chars:
+        sentence = _SENTENCES[index % len(_SENTENCES)].format(keyword=keyword)
+        lines.append(sentence)
+        length += len(sentence)
+        index += 1
+    return " ".join(lines)
+
+
+def canned_post(keyword, body_chars=600):
+    """키워드 하나의 (제목, 서론, [(소제목, 본문)...])"""
+    title = f"{keyword}, 꼭 알아야 할 5가지 핵심 정리"
+    intro = _paragraph(keyword, 200)
+    sections = [
+        (subtitle.format(keyword=keyword), _paragraph(keyword, body_chars, offset=index + 1))
+        for index, subtitle in enumerate(_SUBTITLES)
+    ]
+    return title, intro, sections
+
+
+def canned_labeled_text(keyword, body_chars=600):
+    """prompt_output_form.txt 형식의 라벨 글"""
+    title, intro, sections = canned_post(keyword, body_chars)
+    lines = ["제목", title, "서론", intro]
+    for index, (subtitle, body) in enumerate(sections, 1):
+        lines += [f"소제목{index}", subtitle, f"본문{index}", body]
+    return "\n".join(lines)
+
+
+def canned_json_text(keyword, body_chars=600):
+    """JSON 출력 모드(POST_RESPONSE_SCHEMA) 응답"""
+    title, intro, sections = canned_post(keyword, body_chars)
+    return json.dumps({
+        "title": title,
+        "intro": intro,
+        "sections": [{"subtitle": subtitle, "body": body} for subtitle, body in sections],
+    }, ensure_ascii=False)
+
+
+def canned_batch_text(keywords, body_chars=600):
+    """여러 키워드 일괄 요청(BATCH_FRAME) 응답"""
+    blocks = []
+    for index, keyword in enumerate(keywords, 1):
+        blocks.append(
+            f"===== 글 {index} 시작 | 키워드: {keyword} =====\n"
+            f"{canned_labeled_text(keyword, body_chars)}\n"
+            f"===== 글 {index} 끝 ====="
+        )
+    return "\n\n".join(blocks)
+
+
+def find_keywords(prompt):
+    """요청 문장에서 키워드 목록 찾기 (일괄 요청이면 여러 개)"""
+    batch = _BATCH_LIST.search(prompt)
+    if batch:
+        keywords = [re.sub(r"^\d+\.\s*", "", line).strip() for line in batch.group(1).splitlines()]
+        keywords = [keyword for keyword in keywords if keyword]
+        if keywords:
+            return keywords, True
+    for pattern in (_REQUEST_KEYWORD, _TITLE_EXAMPLE_KEYWORD):
+        match = pattern.search(prompt)
+        if match:
+            return [match.group(1).strip()], False
+    return [DEFAULT_KEYWORD], False
+
+
+def answer_for(prompt, json_mode=False, body_chars=600):
+    """요청에 맞는 대역 응답 원문"""
+    keywords, batch = find_keywords(prompt)
+    if batch:
+        return canned_batch_text(keywords, body_chars)
+    if json_mode:
+        return canned_json_text(keywords[0], body_chars)
+    return canned_labeled_text(keywords[0], body_chars)
+
+
+def count_tokens(text):
+    return max(1, len(text or "") // CHARS_PER_TOKEN)
+
+
+def _texts(content):
+    """Content/문자열/목록에서 텍스트 조각만 모음"""
+    if not content:
+        return []
+    if isinstance(content, str):
+        return [content]
+    if isinstance(content, list):
+        return [text for item in content for text in _texts(item)]
+    if isinstance(content, dict):
+        if "text" in content:
+            return [content["text"] or ""]
+        return _texts(content.get("parts"))
+    return []
+
+
+def _field(data, camel, snake):
+    return data.get(camel, data.get(snake))
+
+
+def _timestamp(moment):
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+class MockSettings:
+    """응답 지연/속도/오류 주입 설정과 누적 통계"""
+
+    def __init__(self, latency=1.5, jitter=0.3, token_rate=300.0, error_rate=0.0, error_status=429,
+                 web_error_rate=0.0, body_chars=600, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.token_rate = token_rate
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.web_error_rate = web_error_rate
+        self.body_chars = body_chars
+        self.random = random.Random(seed)
+        self.caches = {}  # 컨텍스트 캐시 이름 → (시스템 지침, 만료 시각, 모델)
+        self.stats = {"requests": 0, "errors": 0, "web_requests": 0, "output_tokens": 0}
+        self.lock = threading.Lock()
+
+    def first_token_delay(self):
+        with self.lock:
+            return max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+
+    def should_fail(self, rate):
+        with self.lock:
+            return rate > 0 and self.random.random() < rate
+
+    def output_seconds(self, tokens):
+        return tokens / self.token_rate if self.token_rate > 0 else 0.0
+
+    def count(self, key, amount=1):
+        with self.lock:
+            self.stats[key] += amount
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    """Gemini REST API + 웹 AI 대역 페이지 요청 처리"""
+
+    server_version = "MockLLM/1.0"
+    settings = None  # MockSettings (serve()에서 지정)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            sys.stderr.write("%s - %s\n" % (self.address_string(), format % args))
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            return json.loads(raw.decode("utf-8") or "{}")
+        except ValueError:
+            return {}
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error_json(self, status, message):
+        self._send_json(status, {"error": {
+            "code": status,
+            "message": message,
+            "status": _ERROR_STATUS.get(status, "UNKNOWN"),
+        }})
+
+    def _send_file(self, path, content_type):
+        try:
+            with open(path, "rb") as f:
+                body = f.read()
+        except OSError:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    # ---- 라우팅 ----
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path.startswith("/web/"):
+            name = path[len("/web/"):]
+            if name in WEB_PAGES:
+                self._send_file(os.path.join(FIXTURE_DIR, WEB_PAGES[name]), "text/html; charset=utf-8")
+            elif name.endswith(".js") and "/" not in name:
+                self._send_file(os.path.join(FIXTURE_DIR, name), "text/javascript; charset=utf-8")
+            else:
+                self.send_error(404)
+            return
+        if path == "/mock/stats":
+            with self.settings.lock:
+                self._send_json(200, dict(self.settings.stats))
+            return
+        match = _CACHE_PATH.match(path)
+        if match and match.group("id"):
+            self._cache_response(match.group("id"))
+            return
+        self.send_error(404)
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        if path == "/mock/answer":
+            self._web_answer()
+            return
+        match = _API_PATH.match(path)
+        if match:
+            self._generate(match.group("model"), stream=match.group("method") == "streamGenerateContent")
+            return
+        match = _CACHE_PATH.match(path)
+        if match and not match.group("id"):
+            self._create_cache()
+            return
+        self.send_error(404)
+
+    def do_PATCH(self):
+        match = _CACHE_PATH.match(urlparse(self.path).path)
+        if not match or not match.group("id"):
+            self.send_error(404)
+            return
+        data = self._read_json()
+        self._touch_cache(match.group("id"), data.get("ttl"))
+        self._cache_response(match.group("id"))
+
+    def do_DELETE(self):
+        match = _CACHE_PATH.match(urlparse(self.path).path)
+        if match and match.group("id"):
+            with self.settings.lock:
+                self.settings.caches.pop(f"cachedContents/{match.group('id')}", None)
+            self._send_json(200, {})
+            return
+        self.send_error(404)
+
+    # ---- 컨텍스트 캐시 ----
+
+    @staticmethod
+    def _ttl_seconds(ttl):
+        try:
+            return float(str(ttl or "3600s").rstrip("s"))
+        except ValueError:
+            return 3600.0
+
+    def _touch_cache(self, cache_id, ttl):
+        name = f"cachedContents/{cache_id}"
+        with self.settings.lock:
+            if name in self.settings.caches:
+                system, _, model = self.settings.caches[name]
+                self.settings.caches[name] = (system, time.time() + self._ttl_seconds(ttl), model)
+
+    def _create_cache(self):
+        data = self._read_json()
+        system = "\n".join(_texts(_field(data, "systemInstruction", "system_instruction")))
+        name = f"cachedContents/{uuid.uuid4().hex[:16]}"
+        with self.settings.lock:
+            self.settings.caches[name] = (
+                system, time.time() + self._ttl_seconds(data.get("ttl")), data.get("model") or "models/mock"
+            )
+        self._cache_response(name.split("/", 1)[1])
+
+    def _cache_response(self, cache_id):
+        name = f"cachedContents/{cache_id}"
+        with self.settings.lock:
+            entry = self.settings.caches.get(name)
+        if entry is None:
+            self._send_error_json(404, f"{name} not found")
+            return
+        system, expires, model = entry
+        now = datetime.now(timezone.utc)
+        self._send_json(200, {
+            "name": name,
+            "model": model,
+            "displayName": "auto-naver-prompt",
+            "createTime": _timestamp(now),
+            "updateTime": _timestamp(now),
+            "expireTime": _timestamp(now + timedelta(seconds=max(0.0, expires - time.time()))),
+            "usageMetadata": {"totalTokenCount": count_tokens(system)},
+        })
+
+    # ---- 글 생성 ----
+
+    def _generate(self, model, stream):
+        settings = self.settings
+        settings.count("requests")
+        data = self._read_json()
+        prompt = "\n".join(_texts(data.get("contents")))
+        system = "\n".join(_texts(_field(data, "systemInstruction", "system_instruction")))
+        cached_name = _field(data, "cachedContent", "cached_content")
+        cached_tokens = 0
+        if cached_name:
+            with settings.lock:
+                entry = settings.caches.get(cached_name)
+            if entry is None:
+                self._send_error_json(404, f"{cached_name} not found")
+                return
+            cached_tokens = count_tokens(entry[0])
+        generation_config = _field(data, "generationConfig", "generation_config") or {}
+        json_mode = _field(generation_config, "responseMimeType", "response_mime_type") == "application/json"
+
+        time.sleep(settings.first_token_delay())
+        if settings.should_fail(settings.error_rate):
+            settings.count("errors")
+            self._send_error_json(settings.error_status, "mock: injected error")
+            return
+
+        text = answer_for(prompt, json_mode=json_mode, body_chars=settings.body_chars)
+        prompt_tokens = count_tokens(prompt) + (count_tokens(system) if system else 0) + cached_tokens
+        output_tokens = count_tokens(text)
+        settings.count("output_tokens", output_tokens)
+        usage = {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": output_tokens,
+            "totalTokenCount": prompt_tokens + output_tokens,
+        }
+        if cached_tokens:
+            usage["cachedContentTokenCount"] = cached_tokens
+
+        if not stream:
+            time.sleep(settings.output_seconds(output_tokens))
+            self._send_json(200, self._response_payload(text, usage))
+            return
+
+        # REST 스트리밍: JSON 배열을 조각별로 이어서 보냄 (Content-Length 없이 연결 종료로 끝 표시)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        step = STREAM_CHUNK_TOKENS * CHARS_PER_TOKEN
+        chunks = [text[start:start + step] for start in range(0, len(text), step)]
+        try:
+            self.wfile.write(b"[")
+            for index, chunk in enumerate(chunks):
+                time.sleep(settings.output_seconds(count_tokens(chunk)))
+                last = index == len(chunks) - 1
+                payload = self._response_payload(chunk, usage if last else None, finished=last)
+                prefix = b"," if index else b""
+                self.wfile.write(prefix + json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+                self.wfile.flush()
+            self.wfile.write(b"]")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    @staticmethod
+    def _response_payload(text, usage, finished=True):
+        candidate = {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}
+        if finished:
+            candidate["finishReason"] = "STOP"
+        payload = {"candidates": [candidate]}
+        if usage:
+            payload["usageMetadata"] = usage
+        return payload
+
+    # ---- 웹 AI 대역 페이지 ----
+
+    def _web_answer(self):
+        """대역 페이지가 프롬프트를 보내면 답변 원문과 표시 속도를 돌려줌 (페이지가 직접 스트리밍)"""
+        settings = self.settings
+        settings.count("web_requests")
+        data = self._read_json()
+        prompt = data.get("prompt") or ""
+        failed = settings.should_fail(settings.web_error_rate)
+        if failed:
+            settings.count("errors")
+        text = "" if failed else answer_for(prompt, body_chars=settings.body_chars)
+        if text:
+            settings.count("output_tokens", count_tokens(text))
+        self._send_json(200, {
+            "text": text,
+            "error": failed,
+            "latency": settings.first_token_delay(),
+            "chars_per_second": settings.token_rate * CHARS_PER_TOKEN,
+        })
+
+
+def serve(host="127.0.0.1", port=8765, settings=None, quiet=False):
+    """대역 서버 생성 (serve_forever()는 호출하는 쪽에서, 테스트/벤치마크에서는 스레드로 실행)"""
+    handler = type("BoundMockLLMHandler", (MockLLMHandler,), {"settings": settings or MockSettings()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.quiet = quiet
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 AI 대역(mock) 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=1.5, help="첫 토큰까지 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=0.3, help="지연 시간 변동 폭 (초)")
+    parser.add_argument("--token-rate", type=float, default=300.0, help="출력 속도 (토큰/초, 0이면 즉시)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="API 오류 주입 비율 (0~1)")
+    parser.add_argument("--error-status", type=int, default=429, choices=sorted(_ERROR_STATUS))
+    parser.add_argument("--web-error-rate", type=float, default=0.0,
+                        help="웹 페이지 무응답 비율 (0~1, 복사 버튼 없이 멈춘 답변으로 시간 초과 경로 확인)")
+    parser.add_argument("--body-chars", type=int, default=600, help="본문 구간별 최소 글자 수")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--quiet", action="store_true", help="요청 로그 생략")
+    args = parser.parse_args()
+
+    settings = MockSettings(
+        latency=args.latency,
+        jitter=args.jitter,
+        token_rate=args.token_rate,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        web_error_rate=args.web_error_rate,
+        body_chars=args.body_chars,
+        seed=args.seed,
+    )
+    server = serve(args.host, args.port, settings, quiet=args.quiet)
+    base = f"http://{args.host}:{args.port}"
+    print(f"🧪 대역 AI 서버 실행: {base}")
+    print(f"   gemini_api_endpoint: {base}")
+    for provider, page in (("gemini", "gemini"), ("gpt", "chatgpt"), ("perplexity", "perplexity")):
+        print(f"   web_ai_urls.{provider}: {base}/web/{page}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"📊 {json.dumps(settings.stats, ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
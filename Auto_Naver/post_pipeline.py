@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+AI 글 사전 생성 파이프라인 모듈
+
+브라우저가 글을 입력/발행하는 동안 백그라운드 작업자가 다음 키워드의
+글(제목/본문), 썸네일, 동영상을 미리 만들어 둔다 (API 모드 전용).
+완성된 글은 최대 depth개까지만 쌓이며, 포스팅 루프가 하나 꺼낼 때마다 다음 글을 생성한다.
+
+키워드는 생성 시작 시점에 임대(lease)하고 LeaseKeeper로 연장하며,
+get()으로 꺼낸 뒤에는 임대 연장 책임이 포스팅 쪽으로 넘어간다.
+정지 시 아직 사용하지 않은 글의 키워드는 대기열로 되돌린다.
+"""
+
+import queue
+import threading
+import time
+
+from keyword_store import LeaseKeeper
+
+
+class PreparedPost:
+    """사전 생성된 글 하나"""
+
+    __slots__ = ("entry_id", "keyword", "title", "content", "thumbnail_path", "video_path", "created_at")
+
+    def __init__(self, entry_id, keyword, title, content, thumbnail_path=None, video_path=None):
+        self.entry_id = entry_id
+        self.keyword = keyword
+        self.title = title
+        self.content = content
+        self.thumbnail_path = thumbnail_path
+        self.video_path = video_path
+        self.created_at = time.time()
+
+
+class PostPipeline:
+    """키워드 임대 → 글 생성 → 썸네일/동영상까지 미리 처리하는 작업자 풀
+
+    producers는 작업자마다 하나씩 (produce, produce_batch) 쌍의 목록이며 작업자 수는 그 길이와 같다.
+    생성 인스턴스(NaverBlogAutomation)는 현재 키워드/마지막 오류/스트리밍 썸네일 등 상태를 잠금 없이 가지므로
+    작업자끼리 같은 인스턴스를 공유하지 않도록 작업자마다 별도 인스턴스의 메서드를 넘긴다.
+    produce(keyword)는 (제목, 본문, 썸네일 경로, 동영상 경로)를 반환하고 실패 시 None을 반환한다.
+    produce_batch(키워드 목록)은 {키워드: 같은 형식의 결과}를 반환하며(None이면 일괄 생성 안 함), 빠진 키워드는
+    실패로 보고 해당 키워드만 대기열로 되돌린다. batch_size는 한 번에 묶을 최대 키워드 수 (depth 이하로 제한됨).
+    on_exit()는 마지막 작업자 스레드가 끝날 때 그 스레드에서 호출된다 (작업자 전용 브라우저 정리 등).
+    """
+
+    IDLE_WAIT = 5  # 임대할 키워드가 없을 때 대기 시간 (초)
+    MAX_BACKOFF = 60  # 연속 실패 시 최대 대기 시간 (초)
+
+    def __init__(self, producers, store, depth=2, status=None, batch_size=1, on_exit=None):
+        self.producers = list(producers)
+        if not self.producers:
+            raise ValueError("producers가 비어 있습니다")
+        self.on_exit = on_exit
+        has_batch = any(produce_batch for _, produce_batch in self.producers)
+        self.batch_size = max(1, int(batch_size or 1)) if has_batch else 1
+        self.store = store
+        self.depth = max(1, int(depth))
+        self.workers = len(self.producers)
+        self.batch_size = min(self.batch_size, self.depth)
+        self.status = status
+        self._ready = queue.Queue()
+        # 완성 대기 + 생성 중인 글 수를 depth로 제한
+        self._slots = threading.Semaphore(self.depth)
+        self._stop_event = threading.Event()
+        self._lease_keeper = LeaseKeeper(store)
+        self._threads = []
+        self._idle_workers = 0
+        self._running_workers = 0
+        self._state_lock = threading.Lock()
+
+    def _notify(self, message):
+        if self.status:
+            try:
+                self.status(message)
+            except Exception:
+                pass
+        print(message)
+
+    def start(self):
+        """작업자 스레드 시작"""
+        if self._threads:
+            return
+        self._running_workers = self.workers
+        for index, producer in enumerate(self.producers):
+            thread = threading.Thread(
+                target=self._run, args=producer, name=f"PostPipeline-{index + 1}", daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+        self._notify(f"📦 사전 생성 시작 (최대 {self.depth}개 미리 준비)")
+
+    @property
+    def ready_count(self):
+        return self._ready.qsize()
+
+    @property
+    def exhausted(self):
+        """모든 작업자가 임대할 키워드를 못 찾았고 남은 글도 없으면 True"""
+        with self._state_lock:
+            idle = self._idle_workers == self.workers
+        return idle and self._ready.empty() and self.store.pending_count() == 0
+
+    def get(self, timeout=None):
+        """완성된 글 하나를 꺼냄 (timeout 내에 없으면 None)"""
+        try:
+            post = self._ready.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        # 임대 연장은 꺼낸 쪽(포스팅 인스턴스)이 이어받음
+        self._lease_keeper.discard(post.entry_id)
+        self._slots.release()
+        return post
+
+    def stop(self):
+        """작업자 정지 및 사용하지 않은 글의 키워드 반환"""
+        self._stop_event.set()
+        # 대기 중인 작업자가 빠져나오도록 슬롯 해제
+        for _ in range(self.workers):
+            self._slots.release()
+        self._drain()
+        self._lease_keeper.stop()
+
+    def join(self, timeout=None):
+        """stop() 후 작업자 스레드(on_exit 포함)가 끝날 때까지 대기, 모두 끝났으면 True"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return not any(thread.is_alive() for thread in self._threads)
+
+    def _drain(self):
+        while True:
+            try:
+                post = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            self._return_keyword(post.entry_id)
+
+    def _return_keyword(self, entry_id):
+        self._lease_keeper.discard(entry_id)
+        try:
+            self.store.release(entry_id)
+        except Exception as e:
+            print(f"⚠️ 사전 생성 키워드 반환 실패: {e}")
+
+    def _set_idle(self, idle):
+        with self._state_lock:
+            self._idle_workers += 1 if idle else -1
+
+    def _lease_entries(self, count):
+        """키워드를 최대 count개 임대"""
+        entries = []
+        while len(entries) < count:
+            try:
+                entry = self.store.lease()
+            except Exception as e:
+                print(f"⚠️ 사전 생성 키워드 임대 실패: {e}")
+                break
+            if entry is None:
+                break
+            self._lease_keeper.add(entry.entry_id)
+            entries.append(entry)
+        return entries
+
+    def _produce(self, keywords, produce, produce_batch):
+        """키워드 목록의 글 생성, 키워드 순서대로 결과(실패 시 None) 목록 반환"""
+        if len(keywords) > 1 and produce_batch:
+            try:
+                results = produce_batch(keywords)
+            except Exception as e:
+                print(f"⚠️ 일괄 사전 생성 오류: {type(e).__name__}: {e}")
+                results = {}
+            return [results.get(keyword) for keyword in keywords]
+        outputs = []
+        for keyword in keywords:
+            try:
+                outputs.append(produce(keyword))
+            except Exception as e:
+                print(f"⚠️ 사전 생성 오류 ({keyword}): {type(e).__name__}: {e}")
+                outputs.append(None)
+        return outputs
+
+    def _run(self, produce, produce_batch):
+        try:
+            self._work(produce, produce_batch)
+        finally:
+            with self._state_lock:
+                self._running_workers -= 1
+                last = self._running_workers == 0
+            if last and self.on_exit:
+                try:
+                    self.on_exit()
+                except Exception as e:
+                    print(f"⚠️ 사전 생성 작업자 정리 실패: {e}")
+
+    def _work(self, produce, produce_batch):
+        failures = 0
+        idle = False
+        while not self._stop_event.is_set():
+            self._slots.acquire()
+            if self._stop_event.is_set():
+                break
+            # 일괄 생성이면 남은 슬롯만큼 키워드를 더 모음 (기다리지 않음)
+            slots = 1
+            while slots < self.batch_size and self._slots.acquire(blocking=False):
+                slots += 1
+            entries = self._lease_entries(slots)
+            for _ in range(slots - len(entries)):
+                self._slots.release()
+            if not entries:
+                if not idle:
+                    idle = True
+                    self._set_idle(True)
+                self._stop_event.wait(self.IDLE_WAIT)
+                continue
+            if idle:
+                idle = False
+                self._set_idle(False)
+
+            results = self._produce([entry.keyword for entry in entries], produce, produce_batch)
+            produced = 0
+            for (entry_id, keyword, _), result in zip(entries, results):
+                if result is None or self._stop_event.is_set():
+                    # 실패한 키워드만 대기열로 되돌림
+                    self._return_keyword(entry_id)
+                    self._slots.release()
+                    continue
+                title, content, thumbnail_path, video_path = result
+                self._ready.put(PreparedPost(entry_id, keyword, title, content, thumbnail_path, video_path))
+                produced += 1
+                self._notify(f"📦 사전 생성 완료: {keyword} (준비된 글 {self.ready_count}개)")
+            if self._stop_event.is_set():
+                # stop()이 비운 뒤에 넣은 글은 여기서 반환
+                self._drain()
+                break
+
+            failed = len(entries) - produced
+            if not failed:
+                failures = 0
+                continue
+            if produced:
+                failures = 0
+                self._notify(f"⚠️ 사전 생성 실패 {failed}개 - 대기열로 되돌림")
+                continue
+            failures += 1
+            backoff = min(self.MAX_BACKOFF, 2 ** failures)
+            names = ", ".join(entry.keyword for entry in entries)
+            self._notify(f"⚠️ 사전 생성 실패: {names[:40]} ({backoff}초 후 재시도)")
+            self._stop_event.wait(backoff)
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+AI 응답 캐시 미리 채우기 도구
+setting/result의 *_raw.txt 원문을 파싱하여 AI 응답 캐시에 등록
+
+사용법: python prewarm_ai_cache.py [데이터 폴더] [원문 폴더]
+"""
+
+import json
+import os
+import sys
+from ai_cache import AIResponseCache, model_key
+from ai_response_parser import extract_title_body
+from keyword_store import get_keyword_store
+from prompt_store import PromptTemplateStore
+
+
+def main():
+    print("=" * 50)
+    print("네이버 블로그 자동화 - AI 응답 캐시 미리 채우기")
+    print("=" * 50)
+
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__))
+    setting_dir = os.path.join(data_dir, "setting")
+    result_dir = sys.argv[2] if len(sys.argv) > 2 else os.path.join(setting_dir, "result")
+
+    config = {}
+    config_path = os.path.join(setting_dir, "config.json")
+    if os.path.exists(config_path):
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+
+    # 현재 프롬프트 템플릿으로 생성한 원문으로 간주
+    prompt_store = PromptTemplateStore(setting_dir)
+    if not prompt_store.available:
+        print("❌ prompt1.txt / prompt2.txt 파일을 찾을 수 없습니다.")
+        return
+
+    cache = AIResponseCache(data_dir, ttl=config.get("ai_cache_ttl"))
+    store = get_keyword_store(data_dir)
+    model = model_key(config)
+    print(f"\n원문 폴더: {result_dir}")
+    print(f"모델: {model} / 템플릿 해시: {prompt_store.template_hash[:12]}\n")
+
+    def report(done, total, keyword):
+        print(f"\r⏳ {done}/{total} {keyword[:30]}", end="", flush=True)
+
+    added = cache.prewarm_from_results(
+        result_dir,
+        prompt_store.template_hash,
+        model,
+        extract_title_body,
+        skip=store.is_used,  # 이미 발행한 키워드는 제외
+        progress=report,
+    )
+    print(f"\n\n✅ 캐시 등록 완료: {added}개")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\n프로그램이 중단되었습니다.")
+    except Exception as e:
+        print(f"\n오류 발생: {e}")
+
+    if len(sys.argv) <= 1:
+        input("\n\nEnter 키를 눌러 종료...")
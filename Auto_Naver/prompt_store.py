@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+프롬프트 템플릿 저장소 모듈
+
+setting/prompt1.txt, prompt2.txt, prompt_output_form.txt를 한 번만 읽어
+전체 프롬프트 틀에 합친 뒤 {keyword}/{keywords} 자리를 기준으로 미리 분할해 둔다.
+키워드마다 문자열 join 한 번으로 프롬프트를 만들므로 수천 개를 미리 생성해도 부담이 없다.
+
+파일은 mtime/크기가 바뀐 경우에만 다시 읽으며, 변경 확인(stat)도 CHECK_INTERVAL 초에 한 번만 한다.
+template_hash는 합쳐진 템플릿 원문의 SHA-256으로, 응답 캐시 등에서 프롬프트 버전 구분에 사용한다.
+
+API 모드에서는 system_prompt.txt와 키워드 자리를 [키워드]로 둔 전체 지침을 시스템 지침(render_system)으로,
+키워드만 담은 짧은 요청(render_request)을 사용자 메시지로 나누어 보낸다.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+
+TEMPLATE_FILES = (
+    ("prompt1", "prompt1.txt"),
+    ("prompt2", "prompt2.txt"),
+    ("output_form", "prompt_output_form.txt"),
+    ("system", "system_prompt.txt"),
+)
+
+# 필수 템플릿 (output_form/system은 없으면 빈 문자열, 하위 호환성)
+REQUIRED_TEMPLATES = ("prompt1", "prompt2")
+
+_PLACEHOLDER_RE = re.compile(r"\{keywords?\}")
+
+_SEPARATOR = "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+FRAME = (
+    "\n"
+    f"{_SEPARATOR}\n"
+    "[프롬프트 1 - 제목과 서론 작성]\n"
+    f"{_SEPARATOR}\n"
+    "\n"
+    "{prompt1}\n"
+    "\n"
+    f"{_SEPARATOR}\n"
+    "[프롬프트 2 - 소제목과 본문 작성]\n"
+    f"{_SEPARATOR}\n"
+    "\n"
+    "{prompt2}\n"
+    "\n"
+    f"{_SEPARATOR}\n"
+    "{output_form}\n"
+)
+
+# 시스템 지침/여러 키워드 일괄 요청에서 템플릿의 {keyword} 자리에 넣는 표시
+BATCH_KEYWORD_TOKEN = "[키워드]"
+
+REQUEST_FRAME = (
+    f"{BATCH_KEYWORD_TOKEN}: {{keyword}}\n"
+    f"지침의 {BATCH_KEYWORD_TOKEN} 자리에 위 키워드를 넣어 글 1개를 작성하세요.\n"
+)
+
+# JSON 출력 모드(gemini_json_mode)에서 요청 끝에 붙이는 안내 (구조는 response_schema로 강제)
+JSON_OUTPUT_NOTE = (
+    "\n[출력 방식]\n"
+    "위 출력 형식의 라벨 대신 title(제목), intro(서론), sections(소제목 subtitle과 본문 body 3세트) 항목을 가진 "
+    "JSON 객체 하나로만 답하세요. 작성 조건은 그대로 지키세요.\n"
+)
+
+BATCH_FRAME = (
+    "\n"
+    f"{_SEPARATOR}\n"
+    "[여러 글 동시 작성 규칙]\n"
+    f"{_SEPARATOR}\n"
+    "\n"
+    f"위 지침의 {BATCH_KEYWORD_TOKEN} 자리에 아래 키워드를 하나씩 넣어 서로 다른 글 {{count}}개를 작성하세요.\n"
+    "각 글은 위 출력 형식을 그대로 따르고, 글마다 반드시 아래와 같이 시작/끝 구분선으로 감싸세요.\n"
+    "구분선 밖에는 아무것도 쓰지 마세요.\n"
+    "\n"
+    "===== 글 1 시작 | 키워드: (1번 키워드) =====\n"
+    "(1번 키워드의 글)\n"
+    "===== 글 1 끝 =====\n"
+    "\n"
+    "[키워드 목록]\n"
+    "{keywords}\n"
+)
+
+
+class PromptTemplateStore:
+    """프롬프트 템플릿 캐시 (파일 변경 시에만 다시 컴파일)"""
+
+    CHECK_INTERVAL = 1.0  # 파일 변경 확인 주기 (초)
+
+    def __init__(self, setting_dir):
+        self.setting_dir = setting_dir
+        self.paths = {key: os.path.join(setting_dir, filename) for key, filename in TEMPLATE_FILES}
+        self.missing = []  # 찾을 수 없는 템플릿 파일 이름
+        self._template_hash = ""
+        self._system_text = ""
+        self._signatures = None
+        self._parts = None  # 키워드 자리로 분할된 전체 프롬프트 조각
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _file_signature(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def refresh(self, force=False):
+        """변경된 템플릿 파일이 있으면 다시 읽어 컴파일, 다시 읽었으면 True"""
+        now = time.monotonic()
+        if not force and self._parts is not None and now - self._last_check < self.CHECK_INTERVAL:
+            return False
+        with self._lock:
+            self._last_check = now
+            signatures = tuple(self._file_signature(path) for path in self.paths.values())
+            if not force and signatures == self._signatures:
+                return False
+            self._compile(signatures)
+            return True
+
+    def _compile(self, signatures):
+        texts = {}
+        missing = []
+        for (key, path), signature in zip(self.paths.items(), signatures):
+            if signature is None:
+                texts[key] = ""
+                missing.append(os.path.basename(path))
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                texts[key] = f.read()
+        self.missing = [name for name in missing if name != "system_prompt.txt"]
+        self._system_text = texts["system"].strip()
+        if all(texts[key] for key in REQUIRED_TEMPLATES):
+            source = FRAME.format(**texts)
+            self._parts = _PLACEHOLDER_RE.split(source)
+            hashed = source if not self._system_text else self._system_text + "\x1f" + source
+            self._template_hash = hashlib.sha256(hashed.encode("utf-8")).hexdigest()
+        else:
+            self._parts = []
+            self._template_hash = ""
+        self._signatures = signatures
+
+    @property
+    def template_hash(self):
+        """현재 템플릿의 SHA-256 (필수 템플릿이 없으면 빈 문자열)"""
+        self.refresh()
+        return self._template_hash
+
+    @property
+    def available(self):
+        """필수 템플릿이 모두 있는지 여부"""
+        self.refresh()
+        return bool(self._parts)
+
+    def render(self, keyword):
+        """키워드를 넣은 전체 프롬프트 반환 (필수 템플릿이 없으면 None)"""
+        self.refresh()
+        parts = self._parts
+        if not parts:
+            return None
+        return keyword.join(parts)
+
+    def render_system(self):
+        """키워드와 무관한 고정 지침 (system_prompt.txt + 키워드 자리를 [키워드]로 둔 전체 프롬프트)"""
+        self.refresh()
+        parts = self._parts
+        if not parts:
+            return None
+        instructions = BATCH_KEYWORD_TOKEN.join(parts)
+        if self._system_text:
+            return f"{self._system_text}\n{instructions}"
+        return instructions
+
+    @staticmethod
+    def render_request(keyword):
+        """시스템 지침과 함께 보내는 키워드별 요청"""
+        return REQUEST_FRAME.format(keyword=keyword)
+
+    @staticmethod
+    def render_batch_request(keywords):
+        """시스템 지침과 함께 보내는 여러 키워드 일괄 요청"""
+        listing = "\n".join(f"{index}. {keyword}" for index, keyword in enumerate(keywords, 1))
+        return BATCH_FRAME.format(count=len(keywords), keywords=listing)
+
+    def render_batch(self, keywords):
+        """여러 키워드의 글을 한 번에 요청하는 프롬프트 (공통 지침은 한 번만 포함)"""
+        self.refresh()
+        parts = self._parts
+        if not parts:
+            return None
+        return BATCH_KEYWORD_TOKEN.join(parts) + self.render_batch_request(keywords)
+
+    def render_many(self, keywords):
+        """여러 키워드의 프롬프트를 한 번에 생성 (미리 생성용)"""
+        self.refresh()
+        parts = self._parts
+        if not parts:
+            return []
+        return [keyword.join(parts) for keyword in keywords]
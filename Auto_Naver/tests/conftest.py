@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""테스트 공용 설정
+
+Auto_Naver 모듈을 최상위 이름(keyword_store 등)으로 가져오도록 경로를 추가하고,
+여러 테스트 파일에서 쓰는 keywords.txt 작성/저장소 생성 도우미와 가짜 시계를 제공한다.
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keyword_store import KeywordStore  # noqa: E402
+
+
+def _write_keywords(data_dir, *lines):
+    path = os.path.join(str(data_dir), "setting", "keywords.txt")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return path
+
+
+@pytest.fixture
+def write_keywords():
+    """write_keywords(data_dir, 줄, ...) → data_dir/setting/keywords.txt 경로"""
+    return _write_keywords
+
+
+@pytest.fixture
+def make_store():
+    """make_store(data_dir, 줄, ..., **옵션) → keywords.txt를 쓰고 만든 KeywordStore"""
+    def make(data_dir, *lines, **kwargs):
+        _write_keywords(data_dir, *lines)
+        return KeywordStore(str(data_dir), **kwargs)
+    return make
+
+
+class FakeClock:
+    """time.monotonic 대체 시계 (now를 직접 옮기거나 sleep으로 진행)"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(request, monkeypatch):
+    """time.monotonic을 FakeClock으로 바꿈
+
+    모듈들은 time.monotonic()을 호출 시점에 조회하므로 time 모듈 하나만 바꾸면 된다.
+    시작 시각은 @pytest.mark.parametrize("clock", [시각], indirect=True)로 지정할 수 있다.
+    """
+    fake = FakeClock(getattr(request, "param", 1000.0))
+    monkeypatch.setattr(time, "monotonic", fake)
+    return fake
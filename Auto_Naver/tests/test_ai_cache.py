@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""ai_cache: 키워드/템플릿/모델 키, 응답한 백엔드 기준 조회, TTL, 결과 폴더로 미리 채우기"""
+
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from ai_cache import AIResponseCache, backend_model_key, model_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AIResponseCache(str(tmp_path))
+
+
+def test_model_keys():
+    assert model_key({}) == "gemini-2.5-flash-lite"
+    assert model_key({"gemini_mode": "api"}, api_model="gemini-2.0-flash") == "gemini-2.0-flash"
+    assert model_key({"gemini_mode": "web", "web_ai_provider": "GPT"}) == "web-gpt"
+    assert backend_model_key("gemini_api", "gemini-2.0-flash") == "gemini-2.0-flash"
+    assert backend_model_key("perplexity_web") == "web-perplexity"
+    # 설정 기준 키와 응답한 백엔드 기준 키가 같은 형식
+    assert backend_model_key("gpt_web") == model_key({"gemini_mode": "web", "web_ai_provider": "gpt"})
+
+
+def test_put_and_get_match_on_normalized_keyword(cache):
+    cache.put("감자 싹  Tip", "t1", "web-gpt", "제목", "본문")
+    assert cache.get(" 감자 싹 tip", "t1", "web-gpt") == ("제목", "본문")
+    assert cache.get("감자 싹 tip", "t2", "web-gpt") is None
+    assert cache.get("감자 싹 tip", "t1", "web-gemini") is None
+
+
+def test_get_any_returns_newest_entry_from_any_backend(cache):
+    now = time.time()
+    cache.put("키워드", "t", "web-gemini", "이전", "본문", created_at=now - 60)
+    cache.put("키워드", "t", "web-gpt", "최근", "본문", created_at=now)
+    cache.put("키워드", "t", "web-perplexity", "제외", "본문", created_at=now + 60)
+    assert cache.get_any("키워드", "t", ["web-gemini", "web-gpt"]) == ("최근", "본문")
+    assert cache.get_any("키워드", "t", []) is None
+
+
+def test_expired_entries_are_ignored_and_removed(tmp_path):
+    cache = AIResponseCache(str(tmp_path), ttl=60)
+    cache.put("오래됨", "t", "m", "제목", "본문", created_at=time.time() - 120)
+    cache.put("사용함", "t", "m", "제목", "본문")
+    assert cache.get("오래됨", "t", "m") is None
+    cache.discard_keyword("사용함")
+    assert cache.get("사용함", "t", "m") is None
+    conn = cache._connect()
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 0
+    finally:
+        conn.close()
+
+
+def test_prewarm_uses_latest_raw_file_per_keyword(cache, tmp_path):
+    result_dir = tmp_path / "result"
+    result_dir.mkdir()
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    (result_dir / "감자_20000101_000000_raw.txt").write_text("너무 오래됨", encoding="utf-8")
+    (result_dir / f"감자_{stamp}_raw.txt").write_text("감자 제목\n감자 본문", encoding="utf-8")
+    (result_dir / f"사용함_{stamp}_raw.txt").write_text("제목\n본문", encoding="utf-8")
+    (result_dir / f"감자_{stamp}.txt").write_text("원문 아님", encoding="utf-8")
+
+    def parse(content):
+        title, _, body = content.partition("\n")
+        return title, body
+
+    added = cache.prewarm_from_results(str(result_dir), "t", "m", parse, skip=lambda keyword: keyword == "사용함")
+    assert added == 1
+    assert cache.get("감자", "t", "m") == ("감자 제목", "감자 본문")
+    assert cache.get("사용함", "t", "m") is None
+    assert not os.path.exists(os.path.join(str(result_dir), "ai_cache.db"))
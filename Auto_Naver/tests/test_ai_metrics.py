@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""ai_metrics: 호출 기록/비용 추정, 요청별 집계, 발행 표시, 벤치마크 기록 삭제"""
+
+import pytest
+
+from ai_metrics import AIMetricsStore
+
+
+@pytest.fixture
+def metrics(tmp_path):
+    return AIMetricsStore(str(tmp_path), prices={"test-model": [1.0, 0.5, 2.0]})
+
+
+def test_estimate_cost(metrics):
+    # 비캐시 600 × 1.0 + 캐시 400 × 0.5 + 출력 1000 × 2.0 (100만 토큰당)
+    assert metrics.estimate_cost("test-model", 1000, 400, 1000) == pytest.approx(2800 / 1_000_000)
+    assert metrics.estimate_cost("gemini-2.5-flash-lite", 1_000_000, 0, 0) == pytest.approx(0.10)
+    assert metrics.estimate_cost("gpt_web", 1000, 0, 1000) == 0.0
+
+
+def test_summary_groups_calls_by_request(metrics):
+    # 요청 1: API 실패 후 웹으로 성공 / 요청 2: API 성공 / 요청 3: 모두 실패
+    metrics.record_call("r1", "감자", "gemini_api", "test-model", False, 2.0, retries=2, prompt_tokens=100)
+    metrics.record_call("r1", "감자", "gemini_web", "gemini_web", True, 8.0)
+    metrics.record_call("r2", "고구마", "gemini_api", "test-model", True, 4.0,
+                        prompt_tokens=300, output_tokens=200)
+    metrics.record_call("r3", "당근", "gemini_api", "test-model", False, 1.0)
+
+    summary = metrics.summary()
+    assert summary["requests"] == 3
+    assert summary["succeeded"] == 2
+    assert summary["seconds_per_post"] == pytest.approx((10.0 + 4.0) / 2)
+    assert summary["tokens_per_post"] == pytest.approx((100 + 500) / 2)
+    assert summary["p95_seconds"] == 10.0
+    assert summary["retries"] == 2
+    assert summary["backends"] == {"gemini_web": 1, "gemini_api": 1}
+    assert summary["total_cost"] == pytest.approx(metrics.estimate_cost("test-model", 400, 0, 200))
+    assert metrics.summary(limit=1)["requests"] == 1
+
+
+def test_mark_posted_flags_last_successful_request(metrics):
+    metrics.record_call("r1", "감자", "gemini_api", "test-model", True, 1.0)
+    metrics.record_call("r2", " 감자 ", "gemini_api", "test-model", True, 1.0)
+    metrics.mark_posted("감자")
+    assert metrics.summary()["posted"] == 1
+
+
+def test_discard_keyword_removes_only_that_keyword(metrics):
+    metrics.record_call("r1", "[벤치마크] 감자", "gemini_api", "test-model", True, 1.0)
+    metrics.record_call("r1", "[벤치마크] 감자", "gpt_web", "gpt_web", False, 1.0)
+    metrics.record_call("r2", "고구마", "gemini_api", "test-model", True, 1.0)
+    assert metrics.discard_keyword("[벤치마크]  감자") == 2
+    assert metrics.summary()["requests"] == 1
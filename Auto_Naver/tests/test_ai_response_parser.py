@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""ai_response_parser: 저장된 *_raw.txt 원문에서 이전 파서와 같은 결과, 라벨/줄/문단 배치, 스트리밍·JSON·일괄 응답"""
+
+import json
+import os
+
+import pytest
+
+from ai_response_parser import (
+    MIN_JSON_SECTIONS,
+    IncrementalLabelParser,
+    InvalidAIResponse,
+    build_body_text,
+    extract_title_body,
+    format_labeled_text,
+    parse_ai_response,
+    parse_batch_response,
+    parse_json_response,
+)
+from benchmark_parser import collect_raw_files, legacy_parse_ai_response
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RAW_FOLDERS = [
+    os.path.join(BASE_DIR, "setting", "result"),
+    os.path.join(os.path.dirname(BASE_DIR), "setting", "result"),
+]
+RAW_FILES = collect_raw_files([folder for folder in RAW_FOLDERS if os.path.isdir(folder)])
+
+LABELED = """제목: 감자 싹 도려내고 먹는 법
+서론
+싹이 난 감자, 버려야 할까요?
+소제목1: 솔라닌이란
+본문1
+싹과 초록 껍질에 많은 독성 성분입니다.
+소제목 2
+손질법
+본문 2: 싹 주변을 1cm 이상 도려냅니다.
+소제목3. 보관법
+본문3
+서늘하고 어두운 곳에 둡니다.
+"""
+
+BODY_TEXT = "충분히 긴 본문입니다. " * 20
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def fixture_id(path):
+    return os.path.basename(path)
+
+
+# ----------------------------------------------------------------------
+# 저장된 원문 회귀 검사
+# ----------------------------------------------------------------------
+@pytest.mark.skipif(not RAW_FILES, reason="*_raw.txt 원문 없음")
+@pytest.mark.parametrize("path", RAW_FILES, ids=fixture_id)
+def test_matches_legacy_parser_on_saved_responses(path):
+    content = read(path)
+    assert parse_ai_response(content) == legacy_parse_ai_response(content)
+
+
+@pytest.mark.skipif(not RAW_FILES, reason="*_raw.txt 원문 없음")
+@pytest.mark.parametrize("path", RAW_FILES, ids=fixture_id)
+def test_extract_title_body_matches_saved_result(path):
+    result_path = path[:-len("_raw.txt")] + ".txt"
+    if not os.path.exists(result_path):
+        pytest.skip("결과 파일 없음")
+    title, body = extract_title_body(read(path))
+    assert read(result_path) == f"제목: {title}\n\n본문:\n{body}\n"
+
+
+@pytest.mark.parametrize("content", [
+    LABELED,
+    LABELED.replace("\n", "\r\n"),
+    "\n".join(f"줄 {i}" for i in range(10)),
+    "제목 줄\n둘째 줄\n\n서론 문단\n\n소제목 A\n\n본문 A\n\n소제목 B",
+    "본문1: 소제목 없이 시작하는 본문",
+    "   \n\n  ",
+    "",
+])
+def test_matches_legacy_parser_on_layouts(content):
+    assert parse_ai_response(content) == legacy_parse_ai_response(content)
+
+
+# ----------------------------------------------------------------------
+# 배치별 결과
+# ----------------------------------------------------------------------
+def test_labeled_response():
+    title, intro, sections = parse_ai_response(LABELED)
+    assert title == "감자 싹 도려내고 먹는 법"
+    assert intro == "싹이 난 감자, 버려야 할까요?"
+    assert sections == [
+        ("솔라닌이란", "싹과 초록 껍질에 많은 독성 성분입니다."),
+        ("손질법", "싹 주변을 1cm 이상 도려냅니다."),
+        ("보관법", "서늘하고 어두운 곳에 둡니다."),
+    ]
+
+
+def test_line_layout_without_labels_merges_extra_lines_into_last_body():
+    lines = ["감자 손질", "들어가며", "A", "a", "B", "b", "C", "c", "덧붙임"]
+    title, intro, sections = parse_ai_response("\n".join(lines))
+    assert (title, intro) == ("감자 손질", "들어가며")
+    assert sections == [("A", "a"), ("B", "b"), ("C", "c\n덧붙임")]
+
+
+def test_paragraph_layout_without_labels():
+    title, intro, sections = parse_ai_response("감자 손질\n\n들어가며\n\n보관법\n\n첫 줄\n둘째 줄")
+    assert (title, intro) == ("감자 손질", "들어가며")
+    assert sections == [("보관법", "첫 줄\n둘째 줄")]
+
+
+def test_label_with_tab_is_parsed():
+    title, _, sections = parse_ai_response("제목: 감자\n소제목\t2\n손질법\n본문2\n내용")
+    assert title == "감자"
+    assert sections == [("손질법", "내용")]
+
+
+def test_extract_title_body_joins_sections():
+    title, body = extract_title_body(LABELED)
+    assert title == "감자 싹 도려내고 먹는 법"
+    assert body.splitlines() == [
+        "싹이 난 감자, 버려야 할까요?",
+        "솔라닌이란",
+        "싹과 초록 껍질에 많은 독성 성분입니다.",
+        "손질법",
+        "싹 주변을 1cm 이상 도려냅니다.",
+        "보관법",
+        "서늘하고 어두운 곳에 둡니다.",
+    ]
+    assert extract_title_body("") == ("", "")
+
+
+def test_format_labeled_text_round_trips():
+    title, intro, sections = parse_ai_response(LABELED)
+    text = format_labeled_text(title, intro, sections)
+    assert extract_title_body(text) == (title, build_body_text(intro, sections))
+
+
+# ----------------------------------------------------------------------
+# 스트리밍
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_incremental_parser_reports_title_before_body(chunk_size):
+    events = []
+    parser = IncrementalLabelParser(
+        on_title=lambda title: events.append(("title", title)),
+        on_section=lambda label, text: events.append((label, text)),
+    )
+    for start in range(0, len(LABELED), chunk_size):
+        parser.feed(LABELED[start:start + chunk_size])
+        if start + chunk_size < len(LABELED) and any(kind == "본문3" for kind, _ in events):
+            pytest.fail("마지막 구간은 close() 전에 알리면 안 됨")
+
+    assert parser.close() == LABELED
+    assert events[0] == ("title", "감자 싹 도려내고 먹는 법")
+    assert [kind for kind, _ in events[1:]] == ["제목", "서론", "소제목1", "본문1", "소제목2", "본문2", "소제목3", "본문3"]
+    assert ("본문2", "싹 주변을 1cm 이상 도려냅니다.") in events
+
+
+def test_incremental_parser_uses_first_line_without_labels():
+    titles = []
+    parser = IncrementalLabelParser(on_title=titles.append)
+    parser.feed("첫 줄 제목\r\n둘째")
+    parser.feed(" 줄")
+    assert titles == ["첫 줄 제목"]
+    assert parser.close() == "첫 줄 제목\r\n둘째 줄"
+
+
+# ----------------------------------------------------------------------
+# JSON 출력 모드
+# ----------------------------------------------------------------------
+def json_post(**overrides):
+    data = {
+        "title": "감자 싹 도려내고 먹는 법",
+        "intro": "서론입니다.",
+        "sections": [{"subtitle": f"소제목 {i}", "body": BODY_TEXT} for i in range(MIN_JSON_SECTIONS)],
+    }
+    data.update(overrides)
+    return json.dumps(data, ensure_ascii=False)
+
+
+def test_parse_json_response_accepts_valid_post_in_code_fence():
+    title, intro, sections = parse_json_response(f"```json\n{json_post()}\n```", keyword="감자 싹")
+    assert (title, intro) == ("감자 싹 도려내고 먹는 법", "서론입니다.")
+    assert len(sections) == MIN_JSON_SECTIONS
+
+
+@pytest.mark.parametrize("content", [
+    "제목: 라벨 형식",
+    "[]",
+    json_post(title=" "),
+    json_post(title="다른 주제"),
+    json_post(sections=[{"subtitle": "하나", "body": BODY_TEXT}]),
+    json_post(sections=[{"subtitle": "짧음", "body": "짧다"}] * MIN_JSON_SECTIONS),
+])
+def test_parse_json_response_rejects_invalid_posts(content):
+    with pytest.raises(InvalidAIResponse):
+        parse_json_response(content, keyword="감자 싹")
+
+
+# ----------------------------------------------------------------------
+# 일괄 생성
+# ----------------------------------------------------------------------
+def test_parse_batch_response_splits_blocks_by_number():
+    post = f"제목: {{}} 정리\n서론: {BODY_TEXT}\n소제목1: 하나\n본문1: 내용"
+    content = "\r\n".join([
+        "===== 글 2 시작 | 키워드: 텀블러 =====",
+        post.format("텀블러 물때"),
+        "===== 글 2 끝 =====",
+        "===== 글 1 시작 | 키워드: 감자 싹 =====",
+        post.format("감자싹 손질"),
+        "===== 글 1 끝 =====",
+        "===== 글 3 시작 | 키워드: 누락 =====",
+        post.format("다른 제목"),
+        "===== 글 3 끝 =====",
+    ])
+    results = parse_batch_response(content, ["감자 싹", "텀블러", "누락", "없음"])
+    assert results[0][1] == "감자싹 손질 정리"
+    assert results[1][1] == "텀블러 물때 정리"
+    assert results[1][2].startswith(BODY_TEXT.strip())
+    # 제목에 키워드가 없거나 구간이 없으면 실패
+    assert results[2:] == [None, None]
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""ai_router: 응답 시간 순서, 연속 실패 대기 시간(cooldown), failover 실행, 백엔드 후보 구성"""
+
+import pytest
+
+from ai_router import AIRouter, configured_backends, get_ai_router, percentile
+
+BACKENDS = ["gemini_api", "gemini_web", "gpt_web"]
+
+
+@pytest.fixture
+def router(clock):
+    return AIRouter()
+
+
+def test_percentile_uses_nearest_rank():
+    assert percentile([], 0.5) is None
+    assert percentile([1.0], 0.95) == 1.0
+    assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 0.5) == 3.0
+    assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 0.95) == 5.0
+
+
+def test_unmeasured_backends_keep_configured_order(router):
+    assert router.order(BACKENDS) == BACKENDS
+
+
+def test_measured_backends_are_ordered_by_p50_before_unmeasured(router):
+    for latency in (9.0, 10.0, 11.0):
+        router.record("gemini_api", latency, True)
+    for latency in (3.0, 4.0, 30.0):
+        router.record("gpt_web", latency, True)
+    assert router.order(BACKENDS) == ["gpt_web", "gemini_api", "gemini_web"]
+    snap = router.snapshot("gpt_web")
+    assert (snap["calls"], snap["p50"], snap["p95"], snap["healthy"]) == (3, 4.0, 30.0, True)
+
+
+def test_consecutive_failures_set_doubling_cooldown(router, clock):
+    router.record("gemini_api", 1.0, False)
+    # 한 번 실패로는 대기하지 않음
+    assert router.order(BACKENDS)[0] == "gemini_api"
+
+    router.record("gemini_api", 1.0, False)
+    assert router.order(BACKENDS) == ["gemini_web", "gpt_web", "gemini_api"]
+    assert not router.snapshot("gemini_api")["healthy"]
+
+    clock.now += AIRouter.BASE_COOLDOWN
+    assert router.order(BACKENDS)[0] == "gemini_api"
+
+    router.record("gemini_api", 1.0, False)
+    clock.now += AIRouter.BASE_COOLDOWN
+    assert router.order(BACKENDS)[-1] == "gemini_api"
+    clock.now += AIRouter.BASE_COOLDOWN
+    assert router.order(BACKENDS)[0] == "gemini_api"
+
+
+def test_cooldown_is_capped_and_cleared_by_success(router, clock):
+    for _ in range(20):
+        router.record("gpt_web", 1.0, False)
+    clock.now += AIRouter.MAX_COOLDOWN - 1
+    assert router.order(BACKENDS)[-1] == "gpt_web"
+    clock.now += 1
+    assert not router.snapshot("gpt_web")["healthy"]  # 쿨다운은 끝났지만 오류율이 높음
+
+    router.record("gpt_web", 1.0, True)
+    stats = router._stats["gpt_web"]
+    assert (stats.consecutive_failures, stats.cooldown_until) == (0, 0.0)
+
+
+def test_cooling_backends_are_ordered_by_cooldown_end(router, clock):
+    for backend in ("gemini_web", "gemini_api"):
+        router.record(backend, 1.0, False)
+        router.record(backend, 1.0, False)
+        clock.now += 1
+    assert router.order(BACKENDS) == ["gpt_web", "gemini_web", "gemini_api"]
+
+
+def test_high_error_rate_marks_backend_unhealthy(router):
+    for ok in (False, True, False, True, False):
+        router.record("gemini_api", 1.0, ok)
+    snap = router.snapshot("gemini_api")
+    assert snap["error_rate"] == pytest.approx(0.6)
+    assert not snap["healthy"]
+    assert router.order(BACKENDS)[-1] == "gemini_api"
+
+
+def test_run_fails_over_to_next_backend(router, clock):
+    calls, results = [], []
+
+    def call(backend, previous):
+        calls.append((backend, previous))
+        clock.now += 2.0
+        return "본문" if backend == "gpt_web" else None
+
+    backend, result = router.run(BACKENDS, call, on_result=lambda *args: results.append(args))
+    assert (backend, result) == ("gpt_web", "본문")
+    assert calls == [("gemini_api", None), ("gemini_web", "gemini_api"), ("gpt_web", "gemini_web")]
+    assert results == [("gemini_api", 2.0, False), ("gemini_web", 2.0, False), ("gpt_web", 2.0, True)]
+    # 성공한 백엔드의 응답 시간이 기록되어 다음 요청부터 먼저 시도
+    assert router.snapshot("gpt_web")["p50"] == 2.0
+    assert router.order(BACKENDS)[0] == "gpt_web"
+
+
+def test_run_returns_none_when_every_backend_fails(router):
+    assert router.run(BACKENDS, lambda backend, previous: "") == (None, None)
+    assert all(router.snapshot(backend)["error_rate"] == 1.0 for backend in BACKENDS)
+
+
+def test_run_propagates_exceptions_without_recording(router):
+    class Stop(Exception):
+        pass
+
+    def call(backend, previous):
+        raise Stop()
+
+    with pytest.raises(Stop):
+        router.run(BACKENDS, call)
+    assert router.snapshot("gemini_api")["calls"] == 0
+
+
+def test_get_ai_router_is_shared():
+    assert get_ai_router() is get_ai_router()
+
+
+def test_describe_reports_stats(router):
+    assert router.describe("gpt_web") == "ChatGPT 웹 (기록 없음)"
+    router.record("gpt_web", 2.0, True)
+    assert router.describe("gpt_web") == "ChatGPT 웹 (p50 2.0초 / p95 2.0초, 오류율 0%)"
+
+
+@pytest.mark.parametrize("config, has_api_key, expected", [
+    ({}, True, ["gemini_api"]),
+    ({"gemini_mode": "web"}, False, ["gemini_web", "gpt_web", "perplexity_web"]),
+    ({"gemini_mode": "web", "web_ai_provider": "GPT"}, True, ["gpt_web", "gemini_web", "perplexity_web", "gemini_api"]),
+    ({"gemini_mode": "web", "ai_failover": False}, True, ["gemini_web"]),
+    ({"gemini_mode": "web", "ai_backends": ["gemini_api", "perplexity_web"]}, True, ["gemini_api", "perplexity_web"]),
+    ({"gemini_mode": "web", "ai_backends": ["gemini_api"]}, False, ["gemini_web", "gpt_web", "perplexity_web"]),
+])
+def test_configured_backends(config, has_api_key, expected):
+    assert configured_backends(config, has_api_key) == expected
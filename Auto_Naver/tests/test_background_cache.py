@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""background_cache: (경로, mtime, 크기) 무효화, LRU, 디스크 타일 정리, 사본 반환"""
+
+import os
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from background_cache import BackgroundImageCache
+
+
+def write_jpeg(path, color, size=(640, 480), mtime_ns=None):
+    Image.new("RGB", size, color).save(path, "JPEG")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return str(path)
+
+
+@pytest.fixture
+def folder(tmp_path):
+    image_dir = tmp_path / "image"
+    image_dir.mkdir()
+    return image_dir
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return BackgroundImageCache(str(tmp_path), size=(30, 30))
+
+
+def tiles(cache):
+    if not os.path.isdir(cache.tile_dir):
+        return []
+    return sorted(os.listdir(cache.tile_dir))
+
+
+def test_get_resizes_and_reuses_memory(cache, folder, monkeypatch):
+    path = write_jpeg(folder / "bg.jpg", (200, 30, 30))
+    image = cache.get(path)
+    assert image.size == (30, 30) and image.mode == "RGB"
+    assert len(tiles(cache)) == 1
+
+    def fail(_path):
+        raise AssertionError("메모리 캐시가 있으면 다시 디코딩하지 않아야 함")
+
+    monkeypatch.setattr(cache, "_decode", fail)
+    assert cache.get(path).getpixel((15, 15)) == image.getpixel((15, 15))
+
+
+def test_get_returns_copy(cache, folder):
+    path = write_jpeg(folder / "bg.jpg", (200, 30, 30))
+    first = cache.get(path)
+    first.paste((0, 0, 0), (0, 0, 30, 30))
+    assert cache.get(path).getpixel((15, 15))[0] > 150
+
+
+def test_changed_file_is_rebuilt_and_stale_tile_removed(cache, folder):
+    path = write_jpeg(folder / "bg.jpg", (200, 30, 30), mtime_ns=1_000_000_000)
+    assert cache.get(path).getpixel((15, 15))[0] > 150
+    old_tiles = tiles(cache)
+
+    write_jpeg(folder / "bg.jpg", (30, 30, 200), mtime_ns=2_000_000_000)
+    assert cache.get(path).getpixel((15, 15))[2] > 150
+    new_tiles = tiles(cache)
+    assert len(new_tiles) == 1 and new_tiles != old_tiles
+
+
+def test_disk_tile_survives_restart(tmp_path, cache, folder, monkeypatch):
+    path = write_jpeg(folder / "bg.jpg", (30, 200, 30))
+    cache.get(path)
+
+    restarted = BackgroundImageCache(str(tmp_path), size=(30, 30))
+    monkeypatch.setattr(restarted, "_decode", lambda _path: pytest.fail("타일이 있으면 디코딩하지 않아야 함"))
+    assert restarted.get(path).getpixel((15, 15))[1] > 150
+
+
+def test_lru_evicts_least_recently_used(tmp_path, folder):
+    cache = BackgroundImageCache(str(tmp_path), size=(30, 30), max_items=2)
+    a, b, c = (write_jpeg(folder / f"{name}.jpg", (100, 100, 100)) for name in "abc")
+    cache.get(a)
+    cache.get(b)
+    cache.get(a)  # b가 가장 오래 안 쓴 항목
+    cache.get(c)
+    cached = {key[0] for key in cache._images}
+    assert cached == {os.path.abspath(a), os.path.abspath(c)}
+
+
+def test_backgrounds_filters_jpg_and_follows_folder_changes(cache, folder):
+    write_jpeg(folder / "a.jpg", (100, 100, 100))
+    (folder / "note.txt").write_text("x", encoding="utf-8")
+    assert [os.path.basename(p) for p in cache.backgrounds(str(folder))] == ["a.jpg"]
+
+    write_jpeg(folder / "b.JPG", (100, 100, 100))
+    os.utime(folder, ns=(5_000_000_000, 5_000_000_000))
+    assert sorted(os.path.basename(p) for p in cache.backgrounds(str(folder))) == ["a.jpg", "b.JPG"]
+    assert cache.backgrounds(str(folder / "missing")) == []
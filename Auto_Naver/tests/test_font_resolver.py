@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""font_resolver: 한글 글리프 확인, 후보 순서, 크기별 글꼴 캐시"""
+
+import pytest
+
+ImageFont = pytest.importorskip("PIL.ImageFont")
+
+import font_resolver
+from font_resolver import FontResolver, folder_fonts, platform_fonts, supports_hangul
+
+
+class StubFont:
+    def __init__(self, path, size, hangul):
+        self.path = path
+        self.size = size
+        self.hangul = hangul
+
+
+@pytest.fixture
+def stub_fonts(tmp_path, monkeypatch):
+    """이름에 'ko'가 들어간 빈 글꼴 파일만 한글 글꼴로 취급하는 truetype 대역"""
+    loaded = []
+    real_truetype = ImageFont.truetype
+
+    def truetype(path, size, **kwargs):
+        if not isinstance(path, str):
+            return real_truetype(path, size, **kwargs)  # load_default의 내장 글꼴
+        if path.endswith("broken.ttf"):
+            raise OSError("unknown file format")
+        loaded.append((path, size))
+        return StubFont(path, size, "ko" in path.rsplit("/", 1)[-1])
+
+    monkeypatch.setattr(ImageFont, "truetype", truetype)
+    monkeypatch.setattr(font_resolver, "supports_hangul", lambda font: font.hangul)
+
+    def make(*names):
+        paths = []
+        for name in names:
+            path = tmp_path / name
+            path.write_bytes(b"")
+            paths.append(str(path))
+        return paths
+
+    make.loaded = loaded
+    return make
+
+
+def test_probe_rejects_font_without_hangul():
+    # Pillow 기본 글꼴(Aileron)에는 '가'가 없다
+    try:
+        font = ImageFont.load_default(size=24)
+    except TypeError:
+        pytest.skip("Pillow 10.1 이전에는 FreeType 기본 글꼴이 없음")
+    assert supports_hangul(font) is False
+
+
+def test_resolver_skips_missing_broken_and_latin_fonts(stub_fonts, tmp_path):
+    broken, latin, korean, later = stub_fonts("broken.ttf", "latin.ttf", "ko_gothic.ttf", "ko_later.ttf")
+    resolver = FontResolver([str(tmp_path / "missing.ttf"), broken, latin, korean, later], use_fontconfig=False)
+    assert resolver.path == korean
+
+
+def test_font_is_cached_per_size(stub_fonts):
+    (korean,) = stub_fonts("ko.ttf")
+    resolver = FontResolver([korean], use_fontconfig=False)
+    assert resolver.font(24) is resolver.font(24)  # 확인용으로 읽은 글꼴 재사용
+    big = resolver.font(40)
+    assert resolver.font(40.0) is big and big.size == 40
+    assert stub_fonts.loaded == [(korean, 24), (korean, 40)]
+
+
+def test_falls_back_to_default_font_once(stub_fonts, capsys):
+    (latin,) = stub_fonts("latin.ttf")
+    resolver = FontResolver([latin], use_fontconfig=False)
+    assert resolver.path is None
+    assert resolver.font(20) is resolver.font(20)
+    assert capsys.readouterr().out.count("한글 글꼴을 찾지 못했습니다") == 1
+
+
+def test_fontconfig_candidates_come_after_configured(stub_fonts, monkeypatch):
+    latin, korean = stub_fonts("latin.ttf", "ko_fc.ttf")
+    monkeypatch.setattr(font_resolver, "fontconfig_fonts", lambda: [korean, latin])
+    assert FontResolver([latin]).path == korean
+
+
+def test_candidate_helpers(tmp_path):
+    (tmp_path / "b.TTF").write_bytes(b"")
+    (tmp_path / "a.otf").write_bytes(b"")
+    (tmp_path / "readme.txt").write_text("x", encoding="utf-8")
+    assert folder_fonts(str(tmp_path)) == [str(tmp_path / "a.otf"), str(tmp_path / "b.TTF")]
+    assert folder_fonts(str(tmp_path / "missing")) == []
+    assert platform_fonts("win32")[0].endswith("malgun.ttf")
+    assert platform_fonts("linux2") == platform_fonts("linux")
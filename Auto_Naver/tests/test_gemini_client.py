@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+"""gemini_client: 토큰 버킷, 재시도/마감 시간, 사용량 보정, 스트리밍 중단, 컨텍스트 캐시 생성/재시도 (가짜 genai 모듈 사용)"""
+
+import sys
+import threading
+import types
+
+import pytest
+
+import gemini_client
+from gemini_client import (
+    GeminiClient,
+    GeminiDeadlineExceeded,
+    GeminiStreamInterrupted,
+    TokenBucket,
+    estimate_tokens,
+    get_gemini_client,
+    is_retryable_error,
+    usage_counts,
+)
+
+
+class ResourceExhausted(Exception):
+    pass
+
+
+class HttpError(Exception):
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+def response(prompt=10, cached=0, output=5):
+    usage = types.SimpleNamespace(
+        prompt_token_count=prompt,
+        cached_content_token_count=cached,
+        candidates_token_count=output,
+        total_token_count=prompt + output,
+    )
+    return types.SimpleNamespace(usage_metadata=usage)
+
+
+# ----------------------------------------------------------------------
+# 보조 함수 / 토큰 버킷
+# ----------------------------------------------------------------------
+def test_retryable_errors():
+    assert is_retryable_error(ResourceExhausted())
+    assert is_retryable_error(HttpError(503))
+    assert not is_retryable_error(HttpError(400))
+    assert not is_retryable_error(ValueError("bad request"))
+
+
+def test_estimate_tokens_and_usage_counts():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("가나다abcdefgh") == 3 + 2 + 1
+    assert usage_counts(object()) == (0, 0, 0)
+    assert usage_counts(response(100, 40, 7)) == (100, 40, 7)
+
+
+def test_token_bucket_reserves_ahead_and_refills(clock):
+    bucket = TokenBucket(60)
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(30) == pytest.approx(30.0)
+    # 먼저 예약한 몫이 있으므로 다음 요청은 더 오래 기다림
+    assert bucket.reserve(1) == pytest.approx(31.0)
+    clock.now += 31
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    # 사용하지 않은 예약분 반환
+    bucket.adjust(-2)
+    assert bucket.reserve(1) == 0.0
+
+
+def test_token_bucket_caps_oversized_requests(clock):
+    bucket = TokenBucket(10)
+    assert bucket.reserve(1000) == 0.0
+    assert bucket.reserve(10) == pytest.approx(60.0)
+
+
+def test_clients_are_shared_per_key_and_model():
+    client = get_gemini_client("key-a", "model-x", {"gemini_rpm": 30})
+    assert get_gemini_client("key-a", "model-x") is client
+    assert get_gemini_client("key-b", "model-x") is not client
+    assert client.request_bucket.capacity == 30
+
+
+# ----------------------------------------------------------------------
+# 재시도 / 마감 시간
+# ----------------------------------------------------------------------
+def test_generate_retries_retryable_errors(clock, monkeypatch):
+    monkeypatch.setattr(gemini_client.random, "uniform", lambda low, high: high)
+    client = GeminiClient("test-model", rpm=600, tpm=10 ** 6, timeout=600)
+    errors = [ResourceExhausted(), HttpError(500)]
+    retries = []
+
+    def call(remaining):
+        if errors:
+            raise errors.pop(0)
+        return response(100, 30, 20)
+
+    result = client.generate("프롬프트", sleep=clock.sleep, call=call,
+                             on_retry=lambda attempt, delay, error: retries.append((attempt, delay)))
+    assert result.usage_metadata.prompt_token_count == 100
+    assert retries == [(1, 4.0), (2, 8.0)]
+    # 거절된 요청의 예약분은 반환되고 성공한 요청은 실제 사용량만 차감
+    assert client.token_bucket.tokens == pytest.approx(10 ** 6 - 120, abs=1)
+    assert client.usage.snapshot() == {
+        "requests": 1, "prompt_tokens": 100, "cached_tokens": 30, "uncached_tokens": 70, "output_tokens": 20,
+    }
+
+
+def test_generate_reserves_expected_output_tokens(clock):
+    client = GeminiClient("test-model", tpm=10 ** 6)
+    client.generate("가나다", call=lambda remaining: object(), expected_output_tokens=50000)
+    # 사용량이 없는 응답은 예약한 만큼 차감된 채로 남음
+    assert client.token_bucket.tokens == pytest.approx(10 ** 6 - 50004)
+
+
+def test_generate_does_not_retry_other_errors(clock):
+    client = GeminiClient("test-model")
+    calls = []
+
+    def call(remaining):
+        calls.append(remaining)
+        raise ValueError("잘못된 요청")
+
+    with pytest.raises(ValueError):
+        client.generate("프롬프트", sleep=clock.sleep, call=call)
+    assert len(calls) == 1
+    # 실패한 요청의 TPM 예약분은 반환됨
+    assert client.token_bucket.tokens == pytest.approx(client.token_bucket.capacity)
+
+
+def test_generate_refunds_tokens_on_deadline(clock):
+    client = GeminiClient("test-model", tpm=10 ** 6)
+
+    def call(remaining):
+        raise GeminiDeadlineExceeded("마감 시간 초과")
+
+    with pytest.raises(GeminiDeadlineExceeded):
+        client.generate("프롬프트", sleep=clock.sleep, call=call)
+    assert client.token_bucket.tokens == pytest.approx(10 ** 6)
+
+    # 동시 요청 슬롯을 얻지 못한 경우도 반환
+    client = GeminiClient("test-model", tpm=10 ** 6, max_concurrency=1)
+    client._semaphore.acquire()
+    with pytest.raises(GeminiDeadlineExceeded):
+        client.generate("프롬프트", timeout=0.01, sleep=clock.sleep, call=lambda remaining: response())
+    assert client.token_bucket.tokens == pytest.approx(10 ** 6)
+
+
+def test_generate_gives_up_when_rate_wait_exceeds_deadline(clock):
+    client = GeminiClient("test-model", rpm=1, timeout=30)
+    client.generate("첫 요청", sleep=clock.sleep, call=lambda remaining: response())
+    with pytest.raises(GeminiDeadlineExceeded):
+        client.generate("둘째 요청", sleep=clock.sleep, call=lambda remaining: response())
+
+
+# ----------------------------------------------------------------------
+# 스트리밍
+# ----------------------------------------------------------------------
+class StreamingModel:
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False, request_options=None, **kwargs):
+        self.calls += 1
+        chunks, error = self.chunks, self.error
+
+        class Stream:
+            usage_metadata = None
+
+            def __iter__(self):
+                for text in chunks:
+                    yield types.SimpleNamespace(text=text)
+                if error:
+                    raise error
+        return Stream()
+
+
+def test_generate_stream_delivers_chunks():
+    client = GeminiClient("test-model")
+    client._model = StreamingModel(["제목: 가", "\n본문"])
+    received = []
+    client.generate_stream("프롬프트", received.append)
+    assert received == ["제목: 가", "\n본문"]
+
+
+def test_generate_stream_is_not_retried_after_partial_output(clock):
+    client = GeminiClient("test-model")
+    client._model = StreamingModel(["제목: 가"], error=ResourceExhausted())
+    received = []
+    with pytest.raises(GeminiStreamInterrupted):
+        client.generate_stream("프롬프트", received.append, sleep=clock.sleep)
+    assert received == ["제목: 가"]
+    assert client._model.calls == 1
+
+
+# ----------------------------------------------------------------------
+# 컨텍스트 캐시
+# ----------------------------------------------------------------------
+class FakeGenai:
+    """google.generativeai 대체 (CachedContent.create 성공/실패/지연 제어)"""
+
+    def __init__(self):
+        self.fail = False
+        self.created = 0
+        self.started = threading.Event()
+        self.proceed = threading.Event()
+        self.proceed.set()
+        genai = self
+
+        class GenerativeModel:
+            def __init__(self, model_name, system_instruction=None, cached_content=None):
+                self.model_name = model_name
+                self.system_instruction = system_instruction
+                self.cached_content = cached_content
+
+            @classmethod
+            def from_cached_content(cls, cached_content):
+                return cls(cached_content.model, cached_content=cached_content)
+
+        class CachedContent:
+            @staticmethod
+            def create(model, display_name, system_instruction, ttl):
+                genai.started.set()
+                genai.proceed.wait(5)
+                if genai.fail:
+                    raise RuntimeError("캐시 생성 실패")
+                genai.created += 1
+                return types.SimpleNamespace(model=model, name=f"cache-{genai.created}")
+
+        self.GenerativeModel = GenerativeModel
+        self.caching = types.SimpleNamespace(CachedContent=CachedContent)
+
+
+@pytest.fixture
+def genai(monkeypatch):
+    fake = FakeGenai()
+    module = types.ModuleType("google.generativeai")
+    module.GenerativeModel = fake.GenerativeModel
+    module.caching = fake.caching
+    google = types.ModuleType("google")
+    google.generativeai = module
+    monkeypatch.setitem(sys.modules, "google", google)
+    monkeypatch.setitem(sys.modules, "google.generativeai", module)
+    return fake
+
+
+def test_model_for_reuses_cache_until_refresh(genai, clock):
+    client = GeminiClient("test-model")
+    first = client.model_for("고정 지침")
+    assert first.cached_content.name == "cache-1"
+    assert client.model_for("고정 지침") is first
+
+    clock.now += GeminiClient.CONTEXT_CACHE_TTL - GeminiClient.CONTEXT_CACHE_MARGIN
+    assert client.model_for("고정 지침").cached_content.name == "cache-2"
+    assert client.model_for(None).system_instruction is None
+
+
+def test_model_for_falls_back_and_backs_off_after_failure(genai, clock):
+    client = GeminiClient("test-model")
+    genai.fail = True
+    plain = client.model_for("고정 지침")
+    assert plain.cached_content is None
+    assert plain.system_instruction == "고정 지침"
+
+    # 대기 시간 동안은 다시 만들지 않음
+    genai.fail = False
+    assert client.model_for("고정 지침") is plain
+    assert genai.created == 0
+
+    clock.now += GeminiClient.CACHE_RETRY_DELAY
+    assert client.model_for("고정 지침").cached_content.name == "cache-1"
+
+
+def test_backoff_doubles_on_repeated_failures(genai, clock):
+    client = GeminiClient("test-model")
+    genai.fail = True
+    client.model_for("고정 지침")
+    clock.now += GeminiClient.CACHE_RETRY_DELAY
+    client.model_for("고정 지침")
+
+    genai.fail = False
+    clock.now += GeminiClient.CACHE_RETRY_DELAY
+    assert client.model_for("고정 지침").cached_content is None
+    clock.now += GeminiClient.CACHE_RETRY_DELAY
+    assert client.model_for("고정 지침").cached_content is not None
+
+
+def test_other_threads_do_not_wait_for_cache_creation(genai, clock):
+    client = GeminiClient("test-model")
+    genai.proceed.clear()
+    results = {}
+    creator = threading.Thread(target=lambda: results.setdefault("creator", client.model_for("고정 지침")))
+    creator.start()
+    assert genai.started.wait(5)
+
+    # 만드는 중에는 잠금을 잡지 않으므로 바로 일반 지침 모델을 받음
+    other = client.model_for("고정 지침")
+    assert other.cached_content is None
+    genai.proceed.set()
+    creator.join(5)
+    assert results["creator"].cached_content.name == "cache-1"
+    assert genai.created == 1
+
+
+def test_context_cache_can_be_disabled(genai):
+    client = GeminiClient("test-model", context_cache=False)
+    assert client.model_for("고정 지침").cached_content is None
+    assert genai.created == 0
+
+
+def test_generate_uses_system_instruction_model(genai, clock):
+    client = GeminiClient("test-model")
+    requests = []
+
+    def generate_content(self, prompt, request_options=None, **kwargs):
+        requests.append((self.cached_content.name, prompt))
+        return response()
+
+    genai.GenerativeModel.generate_content = generate_content
+    client.generate("[키워드]: 감자", system_instruction="고정 지침")
+    assert requests == [("cache-1", "[키워드]: 감자")]
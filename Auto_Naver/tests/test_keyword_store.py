@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""keyword_store: 임대/완료/반납, keywords.txt 가져오기/내보내기, 중복 키워드 색인, 개수 캐시, 우선순위 스케줄러, 대량 가져오기"""
+
+import time
+import unicodedata
+
+import pytest
+
+from keyword_store import (
+    KeywordScheduler,
+    KeywordStore,
+    LeaseKeeper,
+    format_keyword_line,
+    get_keyword_store,
+    keyword_hash,
+    normalize_keyword,
+    parse_keyword_line,
+)
+
+
+@pytest.fixture
+def store(tmp_path, make_store):
+    return make_store(tmp_path, "a", "b", "c")
+
+
+def read_lines(path):
+    return path.read_text(encoding="utf-8").splitlines()
+
+
+def test_lease_in_file_order_and_ack(store, tmp_path):
+    entry_id, keyword, skipped = store.lease()
+    assert (keyword, skipped) == ("a", [])
+    assert store.pending_count() == 3  # 임대 중 키워드 포함
+
+    assert store.ack(entry_id)
+    assert store.pending_count() == 2
+    assert read_lines(tmp_path / "setting" / "used_keywords.txt") == ["a"]
+    assert store.lease().keyword == "b"
+
+
+def test_release_returns_keyword_to_queue(store):
+    entry = store.lease()
+    store.release(entry.entry_id)
+    assert store.lease() == entry
+
+
+def test_ack_twice_is_rejected(store):
+    entry_id = store.lease().entry_id
+    assert store.ack(entry_id)
+    assert not store.ack(entry_id)
+
+
+def test_empty_queue(tmp_path, make_store):
+    store = make_store(tmp_path, "# 주석만", "")
+    assert store.pending_count() == 0
+    assert store.lease() is None
+
+
+def test_leased_keyword_is_not_handed_to_another_worker(store, tmp_path):
+    other = KeywordStore(str(tmp_path))
+    assert store.lease().keyword == "a"
+    assert other.lease().keyword == "b"
+    # 다른 작업자의 임대는 완료/반납/연장할 수 없음
+    entry_id = store.lease().entry_id
+    assert not other.ack(entry_id)
+    assert not other.renew(entry_id)
+    other.release(entry_id)
+    assert other.lease() is None
+
+
+def test_expired_lease_is_reclaimed(store, tmp_path):
+    entry = store.lease(ttl=0.01)
+    time.sleep(0.02)
+    other = KeywordStore(str(tmp_path))
+    assert other.lease() == entry
+    # 임대를 잃은 작업자는 완료 처리할 수 없음
+    assert not store.ack(entry.entry_id)
+    assert other.ack(entry.entry_id)
+
+
+def test_renew_extends_lease(store, tmp_path):
+    entry_id = store.lease(ttl=0.05).entry_id
+    assert store.renew(entry_id, ttl=60)
+    time.sleep(0.06)
+    assert KeywordStore(str(tmp_path)).lease().keyword == "b"
+
+
+def test_lease_keeper_reports_lost_lease(store, tmp_path):
+    lost = []
+    keeper = LeaseKeeper(store, interval=0.01, on_lost=lost.append)
+    entry_id = store.lease(ttl=0.01).entry_id
+    time.sleep(0.02)
+    KeywordStore(str(tmp_path)).lease()  # 만료된 임대를 다른 작업자가 회수
+    keeper.add(entry_id)
+    deadline = time.time() + 2
+    while not lost and time.time() < deadline:
+        time.sleep(0.01)
+    keeper.stop()
+    assert lost == [entry_id]
+
+
+def test_edited_file_is_reimported_without_used_keywords(store, tmp_path, write_keywords):
+    store.ack(store.lease().entry_id)
+    # 사용 완료된 "a"가 아직 남아 있는 파일을 편집
+    write_keywords(tmp_path, "a", "c", "d")
+    assert store.pending_count() == 2
+    assert [store.lease().keyword, store.lease().keyword] == ["c", "d"]
+
+
+def test_export_writes_remaining_keywords(store, tmp_path):
+    store.ack(store.lease().entry_id)
+    store.lease()
+    store.export_keywords_file()
+    assert read_lines(tmp_path / "setting" / "keywords.txt") == ["b", "c"]
+    # 내보낸 파일은 변경으로 보지 않음
+    assert not store.sync()
+
+
+def write_used(data_dir, *lines):
+    path = data_dir / "setting" / "used_keywords.txt"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("".join(line + "\n" for line in lines))
+
+
+def test_normalize_keyword():
+    decomposed = unicodedata.normalize("NFD", "감자")
+    assert normalize_keyword("  Foo \t Bar ") == "foo bar"
+    assert normalize_keyword(decomposed) == "감자"
+    assert keyword_hash(decomposed + " 요리") == keyword_hash("감자  요리")
+
+
+def test_import_marks_used_keywords_as_duplicates(tmp_path, make_store):
+    write_used(tmp_path, "B")
+    store = make_store(tmp_path, "a", "b ", "c")
+    assert store.pending_count() == 2
+    assert store.last_import_duplicates == 1
+    assert store.is_used("b")
+    assert [store.lease().keyword, store.lease().keyword] == ["a", "c"]
+
+
+def test_lease_skips_keyword_used_after_import(tmp_path, make_store):
+    store = make_store(tmp_path, "a", "b")
+    assert store.pending_count() == 2
+    # 가져온 뒤 다른 프로세스가 같은 키워드를 사용 완료로 기록
+    conn = store._connect()
+    conn.execute("INSERT INTO used_index (hash) VALUES (?)", (keyword_hash("A"),))
+    conn.commit()
+    conn.close()
+    entry = store.lease()
+    assert (entry.keyword, entry.skipped) == ("b", ["a"])
+
+
+def test_duplicates_are_kept_when_skipping_is_disabled(tmp_path, make_store):
+    write_used(tmp_path, "a")
+    store = make_store(tmp_path, "a", "b", skip_duplicates=False)
+    assert store.last_import_duplicates == 0
+    entry = store.lease()
+    assert (entry.keyword, entry.skipped) == ("a", ["a"])
+
+
+def test_keyword_used_since_export_is_not_reimported_or_counted(store, tmp_path, write_keywords):
+    store.ack(store.lease().entry_id)  # "a" 사용 완료, 파일에는 아직 남아 있음
+    write_keywords(tmp_path, "A", "b", "c", "d")
+    # 편집기에 남아 있던 줄은 정규화 기준으로 조용히 건너뜀 (중복으로 알리지 않음)
+    assert store.pending_count() == 3
+    assert store.last_import_duplicates == 0
+
+    # 내보낸 뒤 다시 추가한 경우에만 중복으로 셈
+    store.export_keywords_file()
+    write_keywords(tmp_path, "b", "c", "d", "a")
+    assert store.pending_count() == 3
+    assert store.last_import_duplicates == 1
+
+
+def test_used_keyword_stays_out_after_repeated_edits_without_skipping(tmp_path, make_store, write_keywords):
+    store = make_store(tmp_path, "a", "b", skip_duplicates=False)
+    store.ack(store.lease().entry_id)
+    write_keywords(tmp_path, "a", "b", "c")
+    assert store.pending_count() == 2
+    # 내보내지 않고 다시 편집해도 사용한 키워드가 대기열로 돌아오지 않음
+    write_keywords(tmp_path, "a", "b", "c", "d")
+    assert store.pending_count() == 3
+    assert [store.lease().keyword for _ in range(3)] == ["b", "c", "d"]
+
+
+def test_used_log_is_loaded_incrementally(tmp_path, make_store):
+    write_used(tmp_path, "a")
+    make_store(tmp_path, "x")
+    write_used(tmp_path, "b")
+    store = KeywordStore(str(tmp_path))
+    assert store.is_used("a") and store.is_used("b")
+    assert not store.is_used("x")
+
+
+def test_count_is_cached_until_files_change(store, monkeypatch):
+    assert store.pending_count() == 3
+    monkeypatch.setattr(store, "_connect", None)  # 캐시 적중 시 DB에 접근하지 않음
+    assert store.pending_count() == 3
+    assert store.cached_count == 3
+
+
+def test_count_follows_own_changes(store):
+    counts = []
+    store.add_count_listener(counts.append)
+    store.pending_count()
+    entry_id = store.lease().entry_id
+    store.release(entry_id)
+    store.ack(store.lease().entry_id)
+    assert store.pending_count() == 2
+    # 개수가 실제로 바뀔 때만 알림
+    assert counts == [3, 2]
+
+
+def test_count_is_invalidated_by_another_process(store, tmp_path):
+    assert store.pending_count() == 3
+    other = KeywordStore(str(tmp_path))
+    other.ack(other.lease().entry_id)
+    assert store.pending_count() == 2
+
+
+def test_own_change_does_not_hide_concurrent_change(store, tmp_path, monkeypatch):
+    assert store.pending_count() == 3
+    other = KeywordStore(str(tmp_path))
+    flush = store._flush_used_log
+
+    def flush_then_other_process_acks():
+        # 이 프로세스의 ack 반영 직후, 개수 캐시를 갱신하기 전에 다른 프로세스가 하나 더 사용
+        flush()
+        monkeypatch.setattr(store, "_flush_used_log", flush)
+        other.ack(other.lease().entry_id)
+
+    monkeypatch.setattr(store, "_flush_used_log", flush_then_other_process_acks)
+    store.ack(store.lease().entry_id)
+    assert store.pending_count() == 1
+    assert store.cached_count == 1
+
+
+def test_count_is_invalidated_by_file_edit(store, tmp_path, write_keywords):
+    counts = []
+    store.add_count_listener(counts.append)
+    assert store.pending_count() == 3
+    write_keywords(tmp_path, "a", "b", "c", "d")
+    assert store.pending_count() == 4
+    assert counts == [3, 4]
+
+
+def test_get_keyword_store_shares_instance(tmp_path, write_keywords):
+    write_keywords(tmp_path, "a")
+    store = get_keyword_store(str(tmp_path))
+    assert get_keyword_store(str(tmp_path), lease_ttl=30, skip_duplicates=False) is store
+    assert store.lease_ttl == 30
+    assert not store.skip_duplicates
+
+
+def test_parse_and_format_keyword_line():
+    entry = parse_keyword_line("선물 추천 | 10 | 2026-12-01 09:30 | 시즌")
+    assert entry[0] == "선물 추천" and entry[1] == 10 and entry[3] == "시즌"
+    assert format_keyword_line(*entry) == "선물 추천 | 10 | 2026-12-01 09:30 | 시즌"
+    assert parse_keyword_line("감자 | x") == ("감자", 0, 0.0, "")
+    assert format_keyword_line("감자") == "감자"
+    assert format_keyword_line("감자", 3) == "감자 | 3"
+
+
+def test_scheduler_orders_by_priority_and_not_before():
+    scheduler = KeywordScheduler([(1, 0, 0, ""), (2, 5, 0, ""), (3, 9, 200, ""), (4, 5, 0, "")])
+    assert [scheduler.pop(now=100), scheduler.pop(now=100)] == [2, 4]
+    assert scheduler.next_available_at() == 200
+    assert scheduler.pop(now=100) == 1
+    assert scheduler.pop(now=100) is None
+    assert scheduler.pop(now=200) == 3
+
+
+def test_scheduler_spreads_categories():
+    rows = [(1, 5, 0, "a"), (2, 5, 0, "a"), (3, 5, 0, "b"), (4, 5, 0, "b")]
+    scheduler = KeywordScheduler(rows)
+    assert [scheduler.pop(now=100) for _ in rows] == [1, 3, 2, 4]
+
+
+def test_priority_mode_lease_and_export_round_trip(tmp_path, make_store):
+    store = make_store(tmp_path, "낮음", "높음 | 9", "예약 | 10 | 2999-01-01", order_mode="priority")
+    first = store.lease()
+    assert first[1] == "높음"
+    store.release(first.entry_id)
+    assert store.lease() == first
+    assert store.lease().keyword == "낮음"
+    assert store.lease() is None
+    assert store.next_available_at() is not None
+
+    store.export_keywords_file()
+    assert read_lines(tmp_path / "setting" / "keywords.txt") == ["낮음", "높음 | 9", "예약 | 10 | 2999-01-01 00:00"]
+
+
+def test_fifo_is_default_order(tmp_path, make_store):
+    store = make_store(tmp_path, "낮음", "높음 | 9")
+    assert store.lease().keyword == "낮음"
+
+
+def test_bulk_import_appends_unique_keywords(tmp_path, make_store):
+    write_used(tmp_path, "사용함")
+    store = make_store(tmp_path, "a", "b")
+    store.ack(store.lease().entry_id)  # "a" 사용 완료
+    source = tmp_path / "bulk.txt"
+    source.write_text(
+        "\ufeffb\nc\nC \n# 주석\n\nd | 5 | | 시즌\n사용함\nA\n" + "".join(f"k{i}\n" for i in range(100)),
+        encoding="utf-8",
+    )
+    progress = []
+    stats = store.bulk_import(str(source), progress=lambda done, total, st: progress.append((done, total)))
+
+    assert stats == {"read": 106, "added": 102, "pending_duplicates": 2, "used_duplicates": 2}
+    assert progress[-1] == (source.stat().st_size, source.stat().st_size)
+    assert store.pending_count() == 103
+    lines = read_lines(tmp_path / "setting" / "keywords.txt")
+    # 기존 파일은 그대로 두고 새 키워드만 이어 씀
+    assert lines[:4] == ["a", "b", "c", "d | 5 |  | 시즌"]
+    assert len(lines) == 104
+    # 내보낸 파일은 다시 가져오지 않음
+    assert not store.sync()
+
+
+def test_bulk_import_without_new_keywords_leaves_file_untouched(store, tmp_path):
+    keywords_file = tmp_path / "setting" / "keywords.txt"
+    before = keywords_file.stat().st_mtime_ns
+    source = tmp_path / "bulk.txt"
+    source.write_text("a\nB\n", encoding="utf-8")
+    assert store.bulk_import(str(source))["added"] == 0
+    assert keywords_file.stat().st_mtime_ns == before
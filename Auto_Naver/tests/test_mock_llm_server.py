@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""mock_llm_server: generateContent/streamGenerateContent/cachedContents 응답 형식 (urllib로 실제 서버 호출)"""
+
+import json
+import threading
+import types
+import urllib.error
+import urllib.request
+
+import pytest
+
+from ai_response_parser import (
+    IncrementalLabelParser,
+    extract_title_body,
+    parse_batch_response,
+    parse_json_response,
+)
+from gemini_client import GeminiClient, is_retryable_error
+from mock_llm_server import MockSettings, serve
+from prompt_store import PromptTemplateStore
+
+MODEL_PATH = "/v1beta/models/gemini-2.5-flash-lite"
+
+
+@pytest.fixture
+def settings():
+    return MockSettings(latency=0, jitter=0, token_rate=0, seed=1)
+
+
+@pytest.fixture
+def base_url(settings):
+    server = serve(port=0, settings=settings, quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def request(base_url, path, payload=None, method=None):
+    """JSON 요청 후 (상태 코드, 응답 본문 문자열)"""
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    req = urllib.request.Request(base_url + path, data=data, method=method,
+                                 headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return resp.status, resp.read().decode("utf-8")
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode("utf-8")
+
+
+def generate_payload(prompt, **extra):
+    payload = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+    payload.update(extra)
+    return payload
+
+
+def candidate_text(payload):
+    return "".join(part["text"] for part in payload["candidates"][0]["content"]["parts"])
+
+
+def test_generate_content_returns_parsable_post(base_url):
+    status, body = request(base_url, MODEL_PATH + ":generateContent",
+                           generate_payload(PromptTemplateStore.render_request("감자 싹")))
+    assert status == 200
+    payload = json.loads(body)
+    title, text = extract_title_body(candidate_text(payload))
+    assert "감자 싹" in title and len(text) > 1000
+    usage = payload["usageMetadata"]
+    assert usage["totalTokenCount"] == usage["promptTokenCount"] + usage["candidatesTokenCount"]
+    assert payload["candidates"][0]["finishReason"] == "STOP"
+
+
+def test_json_and_batch_requests_follow_their_contracts(base_url):
+    json_request = generate_payload(PromptTemplateStore.render_request("감자 싹"),
+                                    generationConfig={"responseMimeType": "application/json"})
+    status, body = request(base_url, MODEL_PATH + ":generateContent", json_request)
+    assert status == 200
+    assert parse_json_response(candidate_text(json.loads(body)), keyword="감자 싹")[0]
+
+    keywords = ["감자 싹", "텀블러 물때"]
+    status, body = request(base_url, MODEL_PATH + ":generateContent",
+                           generate_payload(PromptTemplateStore.render_batch_request(keywords)))
+    assert status == 200
+    assert all(parse_batch_response(candidate_text(json.loads(body)), keywords))
+
+
+def test_stream_is_a_json_array_with_usage_on_last_chunk(base_url):
+    status, body = request(base_url, MODEL_PATH + ":streamGenerateContent",
+                           generate_payload(PromptTemplateStore.render_request("감자 싹")))
+    assert status == 200
+    chunks = json.loads(body)
+    assert len(chunks) > 1
+    assert all("usageMetadata" not in chunk for chunk in chunks[:-1])
+    assert chunks[-1]["usageMetadata"]["candidatesTokenCount"] > 0
+    assert "감자 싹" in extract_title_body("".join(candidate_text(chunk) for chunk in chunks))[0]
+
+
+class RestStreamingModel:
+    """generate_content(stream=True)를 대역 서버 REST 스트리밍으로 처리하는 모델 (조각마다 .text)"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    def generate_content(self, prompt, stream=False, request_options=None, **kwargs):
+        status, body = request(self.base_url, MODEL_PATH + ":streamGenerateContent", generate_payload(prompt))
+        assert status == 200
+        chunks = json.loads(body)
+
+        class Stream:
+            usage_metadata = types.SimpleNamespace(**{
+                "prompt_token_count": chunks[-1]["usageMetadata"]["promptTokenCount"],
+                "total_token_count": chunks[-1]["usageMetadata"]["totalTokenCount"],
+            })
+
+            def __iter__(self):
+                for chunk in chunks:
+                    yield types.SimpleNamespace(text=candidate_text(chunk))
+        return Stream()
+
+
+def test_stream_chunks_feed_generate_stream_and_incremental_parser(base_url):
+    client = GeminiClient("gemini-2.5-flash-lite")
+    client._model = RestStreamingModel(base_url)
+    titles = []
+    parser = IncrementalLabelParser(on_title=titles.append)
+    client.generate_stream(PromptTemplateStore.render_request("감자 싹"), parser.feed)
+    content = parser.close()
+    assert titles == [extract_title_body(content)[0]]
+    assert "감자 싹" in titles[0]
+
+
+def test_cached_contents_lifecycle(base_url):
+    status, body = request(base_url, "/v1beta/cachedContents", {
+        "model": "models/gemini-2.5-flash-lite",
+        "systemInstruction": {"parts": [{"text": "고정 지침 " * 50}]},
+        "ttl": "600s",
+    })
+    assert status == 200
+    name = json.loads(body)["name"]
+    assert name.startswith("cachedContents/")
+
+    status, body = request(base_url, f"/v1beta/{name}")
+    assert status == 200
+    assert json.loads(body)["usageMetadata"]["totalTokenCount"] > 0
+    assert request(base_url, f"/v1beta/{name}", {"ttl": "1200s"}, method="PATCH")[0] == 200
+
+    status, body = request(base_url, MODEL_PATH + ":generateContent",
+                           generate_payload(PromptTemplateStore.render_request("감자"), cachedContent=name))
+    assert status == 200
+    usage = json.loads(body)["usageMetadata"]
+    assert 0 < usage["cachedContentTokenCount"] < usage["promptTokenCount"]
+
+    assert request(base_url, f"/v1beta/{name}", method="DELETE")[0] == 200
+    assert request(base_url, f"/v1beta/{name}")[0] == 404
+    status, _ = request(base_url, MODEL_PATH + ":generateContent",
+                        generate_payload("감자", cachedContent=name))
+    assert status == 404
+
+
+def test_injected_errors_are_retryable(base_url, settings):
+    settings.error_rate = 1.0
+    settings.error_status = 503
+    status, body = request(base_url, MODEL_PATH + ":generateContent", generate_payload("감자"))
+    error = json.loads(body)["error"]
+    assert (status, error["status"]) == (503, "UNAVAILABLE")
+    assert is_retryable_error(types.SimpleNamespace(code=status))
+    assert settings.stats["errors"] == 1
+
+
+def test_web_pages_and_answer_endpoint(base_url):
+    status, body = request(base_url, "/web/gemini")
+    assert status == 200 and "<html" in body.lower()
+    assert request(base_url, "/web/unknown")[0] == 404
+    status, body = request(base_url, "/mock/answer", {"prompt": PromptTemplateStore.render_request("감자")})
+    answer = json.loads(body)
+    assert not answer["error"]
+    assert "감자" in extract_title_body(answer["text"])[0]
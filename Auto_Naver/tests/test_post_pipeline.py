@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""post_pipeline: 작업자별 생성기, 미리 만드는 글 수 제한, 실패/정지 시 키워드 반환, 일괄 생성, 종료 정리"""
+
+import threading
+import time
+
+import pytest
+
+from keyword_store import KeywordStore
+from post_pipeline import PostPipeline
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(PostPipeline, "IDLE_WAIT", 0.05)
+    monkeypatch.setattr(PostPipeline, "MAX_BACKOFF", 0.05)
+
+
+@pytest.fixture
+def keywords(tmp_path, make_store):
+    """make_store를 키워드 개수로 호출하는 도우미"""
+    return lambda count: make_store(tmp_path, *(f"키워드{i}" for i in range(count)))
+
+
+class Producer:
+    """작업자 하나의 생성기 (호출한 스레드를 기록)"""
+
+    def __init__(self, fail=()):
+        self.fail = list(fail)  # 한 번씩 실패할 키워드
+        self.threads = set()
+        self.keywords = []
+        self._lock = threading.Lock()
+
+    def produce(self, keyword):
+        with self._lock:
+            self.threads.add(threading.get_ident())
+            self.keywords.append(keyword)
+            if keyword in self.fail:
+                self.fail.remove(keyword)
+                return None
+        return f"{keyword} 제목", f"{keyword} 본문", None, None
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def collect(pipeline, count, timeout=5):
+    posts = []
+    deadline = time.monotonic() + timeout
+    while len(posts) < count and time.monotonic() < deadline:
+        post = pipeline.get(timeout=0.1)
+        if post is not None:
+            posts.append(post)
+    return posts
+
+
+def test_each_worker_uses_its_own_producer(keywords):
+    store = keywords(10)
+    producers = [Producer() for _ in range(3)]
+    pipeline = PostPipeline([(p.produce, None) for p in producers], store, depth=3)
+    assert pipeline.workers == 3
+    pipeline.start()
+    try:
+        posts = collect(pipeline, 10)
+        assert sorted(post.keyword for post in posts) == sorted(f"키워드{i}" for i in range(10))
+        assert all(post.title == f"{post.keyword} 제목" for post in posts)
+        # 생성기마다 한 작업자 스레드에서만 호출됨
+        assert all(len(p.threads) <= 1 for p in producers)
+        assert len(set().union(*(p.threads for p in producers))) == sum(1 for p in producers if p.threads)
+        for post in posts:
+            assert store.ack(post.entry_id)
+        assert wait_until(lambda: pipeline.exhausted)
+    finally:
+        pipeline.stop()
+    assert pipeline.join(timeout=5)
+
+
+def test_depth_limits_prepared_posts(keywords, tmp_path):
+    store = keywords(10)
+    pipeline = PostPipeline([(Producer().produce, None)] * 2, store, depth=2)
+    pipeline.start()
+    try:
+        assert wait_until(lambda: pipeline.ready_count == 2)
+        time.sleep(0.1)
+        assert pipeline.ready_count == 2
+        post = pipeline.get(timeout=1)
+        assert post is not None
+        assert wait_until(lambda: pipeline.ready_count == 2)
+    finally:
+        pipeline.stop()
+    assert pipeline.join(timeout=5)
+    # 꺼낸 글 하나만 임대 상태로 남고 나머지는 대기열로 돌아옴
+    other = KeywordStore(str(tmp_path))
+    leased = [other.lease() for _ in range(10)]
+    assert sum(entry is not None for entry in leased) == 9
+    assert post.keyword not in {entry.keyword for entry in leased if entry}
+
+
+def test_failed_keyword_returns_to_queue(keywords, tmp_path):
+    store = keywords(2)
+    producer = Producer(fail=["키워드0"])
+    pipeline = PostPipeline([(producer.produce, None)], store, depth=1)
+    pipeline.start()
+    try:
+        # 실패한 키워드는 대기열 앞으로 돌아가 다시 생성됨
+        post = pipeline.get(timeout=5)
+        assert post.keyword == "키워드0"
+        assert producer.keywords[:2] == ["키워드0", "키워드0"]
+    finally:
+        pipeline.stop()
+    assert pipeline.join(timeout=5)
+    assert KeywordStore(str(tmp_path)).lease().keyword == "키워드1"
+
+
+def test_batch_producer_gets_grouped_keywords(keywords):
+    store = keywords(4)
+    batches = []
+
+    def produce_batch(keywords):
+        batches.append(list(keywords))
+        # 빠진 키워드는 실패로 보고 대기열로 되돌림
+        return {keyword: (keyword, "본문", None, None) for keyword in keywords if keyword != "키워드1"}
+
+    single = Producer()
+    pipeline = PostPipeline([(single.produce, produce_batch)], store, depth=3, batch_size=5)
+    assert pipeline.batch_size == 3
+    pipeline.start()
+    try:
+        posts = collect(pipeline, 4)
+    finally:
+        pipeline.stop()
+    assert batches[0] == ["키워드0", "키워드1", "키워드2"]
+    assert sorted(post.keyword for post in posts) == ["키워드0", "키워드1", "키워드2", "키워드3"]
+    assert "키워드1" in single.keywords or any("키워드1" in batch for batch in batches[1:])
+
+
+def test_on_exit_runs_once_on_last_worker_thread(keywords):
+    store = keywords(1)
+    exits = []
+    pipeline = PostPipeline([(Producer().produce, None)] * 3, store,
+                            on_exit=lambda: exits.append(threading.current_thread().name))
+    pipeline.start()
+    assert pipeline.get(timeout=5) is not None
+    pipeline.stop()
+    assert pipeline.join(timeout=5)
+    assert len(exits) == 1
+    assert exits[0].startswith("PostPipeline-")
+
+
+def test_requires_producers(keywords):
+    with pytest.raises(ValueError):
+        PostPipeline([], keywords(1))
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""prompt_store: 키워드 자리 치환, 파일 변경 시에만 다시 컴파일, 시스템 지침/일괄 요청 구성"""
+
+import os
+
+import pytest
+
+from prompt_store import BATCH_KEYWORD_TOKEN, FRAME, PromptTemplateStore
+
+
+@pytest.fixture
+def setting_dir(tmp_path):
+    (tmp_path / "prompt1.txt").write_text("{keyword} 제목과 서론", encoding="utf-8")
+    (tmp_path / "prompt2.txt").write_text("{keywords} 본문", encoding="utf-8")
+    (tmp_path / "prompt_output_form.txt").write_text("제목:\n서론:", encoding="utf-8")
+    return tmp_path
+
+
+def rewrite(path, text):
+    """내용과 mtime을 함께 바꿔 서명 변경을 보장"""
+    stat = os.stat(path)
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_render_matches_frame_format(setting_dir, clock):
+    store = PromptTemplateStore(str(setting_dir))
+    expected = FRAME.format(prompt1="감자 제목과 서론", prompt2="감자 본문", output_form="제목:\n서론:")
+    assert store.render("감자") == expected
+    assert store.render_many(["감자", "고구마"]) == [expected, expected.replace("감자", "고구마")]
+    assert store.missing == []
+    assert len(store.template_hash) == 64
+
+
+def test_files_are_reread_only_after_change(setting_dir, clock):
+    store = PromptTemplateStore(str(setting_dir))
+    assert "감자 제목과 서론" in store.render("감자")
+    old_hash = store.template_hash
+    rewrite(setting_dir / "prompt1.txt", "{keyword} 새 지침")
+
+    # 확인 주기 안에서는 파일을 보지 않음
+    assert "새 지침" not in store.render("감자")
+    clock.now += PromptTemplateStore.CHECK_INTERVAL
+    assert "감자 새 지침" in store.render("감자")
+    assert store.template_hash != old_hash
+    clock.now += PromptTemplateStore.CHECK_INTERVAL
+    assert not store.refresh()
+
+
+def test_missing_required_template(setting_dir, clock):
+    os.remove(setting_dir / "prompt2.txt")
+    store = PromptTemplateStore(str(setting_dir))
+    assert store.render("감자") is None
+    assert store.render_system() is None
+    assert store.render_many(["감자"]) == []
+    assert not store.available
+    assert store.template_hash == ""
+    assert store.missing == ["prompt2.txt"]
+
+
+def test_system_instruction_changes_template_hash(setting_dir, clock):
+    store = PromptTemplateStore(str(setting_dir))
+    without_system = store.template_hash
+    assert store.render_system() == store.render(BATCH_KEYWORD_TOKEN)
+
+    (setting_dir / "system_prompt.txt").write_text("  전문가처럼 작성  \n", encoding="utf-8")
+    assert store.refresh(force=True)
+    assert store.render_system().startswith("전문가처럼 작성\n")
+    assert store.template_hash != without_system
+    assert store.missing == []
+    assert "감자" in store.render_request("감자")
+
+
+def test_render_batch_lists_keywords_once(setting_dir, clock):
+    store = PromptTemplateStore(str(setting_dir))
+    prompt = store.render_batch(["감자", "고구마"])
+    assert prompt.startswith(store.render(BATCH_KEYWORD_TOKEN))
+    assert prompt.endswith("1. 감자\n2. 고구마\n")
+    assert "서로 다른 글 2개" in prompt
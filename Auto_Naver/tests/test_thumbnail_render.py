@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""thumbnail_render: 픽셀 폭 줄바꿈, 가장 큰 글꼴 크기 선택, 말줄임 자르기, 글자 폭 캐시 (PIL 없이 가짜 글꼴 사용)"""
+
+import pytest
+
+from thumbnail_render import (
+    ELLIPSIS,
+    GlyphWidthCache,
+    TitleLayoutEngine,
+    draw_title,
+    wrap_title,
+)
+
+
+class FakeFont:
+    """ASCII는 크기의 절반, 그 외 글자는 크기만큼의 폭을 갖는 글꼴"""
+
+    def __init__(self, size, path="fake.ttf"):
+        self.size = size
+        self.path = path
+        self.calls = 0
+
+    def getlength(self, text):
+        self.calls += 1
+        return sum(self.size / 2 if ord(char) < 128 else self.size for char in text)
+
+    def getmetrics(self):
+        return self.size, self.size // 4
+
+
+class FakeDraw:
+    def __init__(self):
+        self.texts = []
+
+    def text(self, xy, text, fill=None, font=None):
+        self.texts.append((xy, text, fill))
+
+
+def fonts():
+    cache = {}
+
+    def font_for_size(size):
+        if size not in cache:
+            cache[size] = FakeFont(size)
+        return cache[size]
+    return font_for_size
+
+
+def char_width(text):
+    """한 글자 폭 10 (공백 포함)"""
+    return 10 * len(text)
+
+
+def engine(**kwargs):
+    return TitleLayoutEngine(fonts(), glyph_cache=GlyphWidthCache(), **kwargs)
+
+
+# ----------------------------------------------------------------------
+# 줄바꿈
+# ----------------------------------------------------------------------
+def test_wrap_title_breaks_at_commas_then_words():
+    lines = wrap_title("감자 싹 도려내고 먹는 법, 안전하게 먹는 비결", 80, char_width)
+    assert lines == ["감자 싹", "도려내고 먹는", "법", "안전하게 먹는", "비결"]
+    assert all(char_width(line) <= 80 for line in lines)
+
+
+def test_wrap_title_splits_long_words_by_character():
+    lines = wrap_title("가나다라마바사아자 끝", 40, char_width)
+    assert lines == ["가나다라", "마바사아", "자 끝"]
+
+
+def test_wrap_title_skips_empty_comma_parts():
+    assert wrap_title("앞,, 뒤 ,", 200, char_width) == ["앞", "뒤"]
+
+
+# ----------------------------------------------------------------------
+# 크기 선택 / 자르기
+# ----------------------------------------------------------------------
+def fits(layout_engine, title, size, width, height):
+    return layout_engine._try(title, size, width, height)[4]
+
+
+@pytest.mark.parametrize("title", [
+    "감자 싹 도려내고 먹는 법, 안전하게 먹는 3가지 비결",
+    "텀블러 깊은 곳 물때 제거 방법",
+    "Short title",
+])
+def test_layout_picks_largest_size_that_fits(title):
+    layout_engine = engine(min_size=14, max_size=40)
+    layout = layout_engine.layout(title, 240, 240)
+
+    assert 14 <= layout.size <= 40
+    assert layout.size == 40 or not fits(layout_engine, title, layout.size + 1, 240, 240)
+    assert len(layout.lines) <= layout_engine.max_lines
+    assert max(layout.widths) == layout.width <= 240
+    assert layout.height <= 240
+    assert "".join(layout.lines).replace(" ", "") == title.replace(",", "").replace(" ", "")
+
+
+def test_short_title_uses_max_size():
+    layout = engine(max_size=32).layout("짧은 제목", 240, 240)
+    assert (layout.size, layout.lines) == (32, ["짧은 제목"])
+    assert layout.line_height == 32 + 8
+    assert layout.height == 40
+
+
+def test_title_that_never_fits_is_truncated_with_ellipsis():
+    title = " ".join(["아주긴제목단어"] * 30)
+    layout = engine(min_size=14, max_size=40, max_lines=3).layout(title, 120, 240)
+    assert layout.size == 14
+    assert len(layout.lines) == 3
+    assert layout.lines[-1].endswith(ELLIPSIS)
+    assert all(width <= 120 for width in layout.widths)
+
+
+def test_truncation_respects_box_height():
+    title = " ".join(["단어"] * 40)
+    layout = engine(min_size=20, max_size=20, max_lines=5, spacing=4).layout(title, 100, 60)
+    # 줄 높이 25 + 간격 4: 60px에는 2줄까지
+    assert len(layout.lines) == 2
+    assert layout.lines[-1].endswith(ELLIPSIS)
+
+
+def test_layout_normalizes_whitespace():
+    layout = engine(max_size=20).layout("  제목\n  줄바꿈   포함 ", 240, 240)
+    assert layout.lines == ["제목 줄바꿈 포함"]
+
+
+# ----------------------------------------------------------------------
+# 글자 폭 캐시 / 그리기
+# ----------------------------------------------------------------------
+def test_glyph_cache_measures_each_character_once_per_font():
+    cache = GlyphWidthCache()
+    font = FakeFont(20)
+    assert cache.width(font, "가나 a") == 20 + 20 + 10 + 10
+    assert cache.width(font, "나가 a가") == 20 + 20 + 10 + 10 + 20
+    assert font.calls == 4
+    # 같은 경로/크기의 다른 객체는 같은 표를 사용
+    assert cache.table(FakeFont(20)) is cache.table(font)
+    assert cache.table(FakeFont(21)) is not cache.table(font)
+
+
+def test_draw_title_centers_each_line_with_shadow():
+    layout = engine(max_size=20).layout("가나, 가나다라", 100, 100)
+    draw = FakeDraw()
+    draw_title(draw, layout, (30, 30, 100, 100), fill="white", shadow="gray", shadow_offset=2)
+
+    assert layout.lines == ["가나", "가나다라"]
+    top = 30 + (100 - layout.height) // 2
+    assert draw.texts == [
+        ((30 + 30 + 2, top + 2), "가나", "gray"),
+        ((30 + 30, top), "가나", "white"),
+        ((30 + 10 + 2, top + 29 + 2), "가나다라", "gray"),
+        ((30 + 10, top + 29), "가나다라", "white"),
+    ]
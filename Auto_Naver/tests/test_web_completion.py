@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""web_completion: 비동기 감시 구간 반복, 일시정지 확인, 폴링 전환 후 조용한 시간 판정, 클립보드 없는 입력, 탭 점검 (가짜 드라이버 사용)"""
+
+import sys
+import types
+
+import pytest
+
+import web_completion
+from web_completion import (
+    CompletionWatcher,
+    click_first,
+    count_responses,
+    read_editor_text,
+    set_editor_text,
+    tab_state,
+    wait_prompt_sent,
+)
+
+
+class TimeoutException(Exception):
+    pass
+
+
+class WebDriverException(Exception):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def selenium_exceptions(monkeypatch):
+    """selenium.common.exceptions 대체 (설치 여부와 무관하게 같은 예외 사용)"""
+    module = types.ModuleType("selenium.common.exceptions")
+    module.TimeoutException = TimeoutException
+    module.WebDriverException = WebDriverException
+    common = types.ModuleType("selenium.common")
+    common.exceptions = module
+    selenium = types.ModuleType("selenium")
+    selenium.common = common
+    monkeypatch.setitem(sys.modules, "selenium", selenium)
+    monkeypatch.setitem(sys.modules, "selenium.common", common)
+    monkeypatch.setitem(sys.modules, "selenium.common.exceptions", module)
+
+
+@pytest.fixture
+def wall_clock(clock, monkeypatch):
+    """web_completion의 time.time/time.sleep을 가짜 시계로 바꿈"""
+    monkeypatch.setattr(web_completion, "time", types.SimpleNamespace(time=clock, sleep=clock.sleep))
+    return clock
+
+
+class FakeDriver:
+    """execute_async_script/execute_script 결과를 차례로 돌려주는 드라이버"""
+
+    def __init__(self, async_results=(), poll_results=()):
+        self.async_results = list(async_results)
+        self.poll_results = list(poll_results)
+        self.async_calls = []
+        self.script_timeouts = []
+
+    def set_script_timeout(self, seconds):
+        self.script_timeouts.append(seconds)
+
+    def execute_async_script(self, script, *args):
+        self.async_calls.append(args)
+        result = self.async_results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def execute_script(self, script, *args):
+        result = self.poll_results.pop(0) if len(self.poll_results) > 1 else self.poll_results[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def test_async_watch_repeats_chunks_until_done(wall_clock):
+    driver = FakeDriver(async_results=[
+        {"status": "pending", "text": "절반", "copies": 0},
+        TimeoutException(),
+        {"status": "done", "text": "전체 응답", "copies": "2"},
+    ])
+    checks = []
+    result = CompletionWatcher(driver).wait(
+        response_selectors=[".resp"], copy_selectors=[".copy"], before_responses=1, before_copies=1,
+        quiet=1.5, timeout=60, between=lambda: checks.append(1),
+    )
+    assert result == {"status": "done", "text": "전체 응답", "copies": 2}
+    assert len(checks) == 3
+    # 선택자/이전 개수/조용한 시간(ms)/구간 길이(ms) 전달
+    assert driver.async_calls[0] == ([".resp"], [".copy"], "", 1, 1, 1500, CompletionWatcher.CHUNK_SECONDS * 1000)
+
+
+def test_between_can_abort_wait(wall_clock):
+    driver = FakeDriver(async_results=[{"status": "pending"}] * 3)
+
+    def stop():
+        if driver.async_calls:
+            raise RuntimeError("정지 요청")
+
+    with pytest.raises(RuntimeError):
+        CompletionWatcher(driver).wait(response_selectors=[".resp"], between=stop)
+    assert len(driver.async_calls) == 1
+
+
+def test_falls_back_to_polling_until_content_is_quiet(wall_clock):
+    driver = FakeDriver(
+        async_results=[WebDriverException("async 미지원")],
+        poll_results=[
+            {"text": "", "copies": 0},
+            {"text": "가", "copies": 0},
+            {"text": "가나", "copies": 1},
+            {"text": "가나", "copies": 1},
+            {"text": "가나", "copies": 1},
+        ],
+    )
+    watcher = CompletionWatcher(driver)
+    started = wall_clock.now
+    result = watcher.wait(response_selectors=[".resp"], copy_selectors=[".copy"], quiet=1.5, timeout=60)
+    assert result == {"status": "done", "text": "가나", "copies": 1}
+    assert not watcher._async_supported
+    # "가나"가 처음 보인 뒤 2초(1초 간격 두 번) 동안 바뀌지 않아 완료
+    assert wall_clock.now - started == 5 * CompletionWatcher.POLL_INTERVAL
+
+
+def test_polling_timeout_returns_last_text(wall_clock):
+    driver = FakeDriver(async_results=[WebDriverException()], poll_results=[{"text": "", "copies": 0}])
+    result = CompletionWatcher(driver).wait(response_selectors=[".resp"], copy_selectors=[".copy"], timeout=5)
+    assert result["status"] == "timeout"
+    assert result["text"] == ""
+
+
+def test_set_editor_text_checks_entered_length():
+    text = "감자 싹\n도려내기"
+    assert set_editor_text(FakeDriver(async_results=[7]), "editor", text)
+    # 입력창에 90% 미만만 들어갔거나 스크립트가 실패하면 False
+    assert not set_editor_text(FakeDriver(async_results=[5]), "editor", text)
+    assert not set_editor_text(FakeDriver(async_results=[WebDriverException()]), "editor", text)
+
+
+def test_wait_prompt_sent(wall_clock):
+    pending = {"cleared": False, "started": False}
+    assert wait_prompt_sent(FakeDriver(poll_results=[pending, {"cleared": True, "started": False}]),
+                            "editor", [".resp"], 0)
+    # 입력창이 늦게 비워져도 새 응답/중지 버튼이 보이면 전송된 것으로 봄 (Enter 재전송 방지)
+    assert wait_prompt_sent(FakeDriver(poll_results=[pending, {"cleared": False, "started": True}]),
+                            "editor", [".resp"], 0)
+    # 입력창이 다시 그려져 기존 요소가 사라져도 전송된 것으로 봄
+    assert wait_prompt_sent(FakeDriver(poll_results=[WebDriverException()]), "editor", [".resp"], 0)
+    assert not wait_prompt_sent(FakeDriver(poll_results=[pending]), "editor", [".resp"], 0, timeout=1)
+
+
+def test_read_helpers_return_defaults_on_error():
+    assert read_editor_text(FakeDriver(poll_results=[" 입력 \n"]), "editor") == "입력"
+    assert read_editor_text(FakeDriver(poll_results=[WebDriverException()]), "editor") == ""
+    assert count_responses(FakeDriver(poll_results=[3]), [".resp"]) == 3
+    assert count_responses(FakeDriver(poll_results=[WebDriverException()]), [".resp"]) == 0
+
+
+def test_tab_helpers_return_defaults_on_error():
+    state = {"host": "gemini.google.com", "ready": "complete", "editor": True, "responses": 0}
+    assert tab_state(FakeDriver(poll_results=[state]), ".editor", [".resp"]) == state
+    assert tab_state(FakeDriver(poll_results=[WebDriverException()]), ".editor", [".resp"]) is None
+    assert click_first(FakeDriver(poll_results=[True]), ".new-chat")
+    assert not click_first(FakeDriver(poll_results=[None]), ".new-chat")
+    assert not click_first(FakeDriver(poll_results=[WebDriverException()]), ".new-chat")
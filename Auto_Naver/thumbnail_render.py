@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+썸네일 제목 배치 모듈
+
+제목을 글자 수가 아닌 실제 픽셀 폭으로 줄바꿈하고, 여백 안에 들어가는 가장 큰 글꼴 크기를 이분 탐색으로 찾는다.
+  - 폭 측정: 글꼴(경로, 크기)별 글자 advance 폭 캐시 (한 번 잰 글자는 다시 FreeType을 부르지 않음)
+  - 줄바꿈: 쉼표에서 줄을 나누고(기존 동작 유지), 그 안에서는 단어(공백) 단위로 채우며
+    한 단어가 한 줄보다 길면 글자 단위로 나눈다.
+  - 크기: MIN_FONT_SIZE~MAX_FONT_SIZE 사이에서 줄 수/높이/폭 조건을 만족하는 최대 크기
+    (가장 작은 크기로도 넘치면 MAX_LINES줄에서 자르고 말줄임표를 붙임)
+
+측정은 글자별 캐시 덧셈뿐이라 제목 수천 개를 연속으로 배치해도 글꼴 파일/글리프를 다시 읽지 않는다.
+"""
+
+import threading
+from collections import namedtuple
+
+MIN_FONT_SIZE = 14
+MAX_FONT_SIZE = 40
+MAX_LINES = 5
+LINE_SPACING = 4
+ELLIPSIS = "…"
+
+TitleLayout = namedtuple("TitleLayout", "font size lines widths line_height spacing width height")
+
+
+class GlyphWidthCache:
+    """글꼴별 글자 advance 폭 캐시 (스레드 안전)"""
+
+    def __init__(self):
+        self._widths = {}  # (글꼴 경로, 크기) → {글자: 폭}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _font_key(font):
+        path = getattr(font, "path", None)
+        return (path if isinstance(path, str) else id(font), getattr(font, "size", None))
+
+    def table(self, font):
+        key = self._font_key(font)
+        with self._lock:
+            table = self._widths.get(key)
+            if table is None:
+                table = self._widths[key] = {}
+            return table
+
+    def width(self, font, text, table=None):
+        """문자열 폭 (글자 폭의 합, 커닝은 무시)"""
+        if table is None:
+            table = self.table(font)
+        total = 0.0
+        for char in text:
+            advance = table.get(char)
+            if advance is None:
+                advance = table[char] = font.getlength(char)
+            total += advance
+        return total
+
+
+def _split_word(word, max_width, measure):
+    """한 줄보다 긴 단어를 글자 단위로 나눔"""
+    pieces = []
+    current = ""
+    for char in word:
+        if current and measure(current + char) > max_width:
+            pieces.append(current)
+            current = char
+        else:
+            current += char
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def wrap_title(title, max_width, measure):
+    """쉼표 → 단어 → 글자 순으로 max_width 안에 들어가게 줄바꿈한 줄 목록"""
+    lines = []
+    space = measure(" ")
+    for part in title.split(","):
+        words = part.split()
+        if not words:
+            continue
+        current = ""
+        current_width = 0.0
+        for word in words:
+            word_width = measure(word)
+            if current and current_width + space + word_width <= max_width:
+                current += " " + word
+                current_width += space + word_width
+                continue
+            if current:
+                lines.append(current)
+            if word_width <= max_width:
+                current, current_width = word, word_width
+            else:
+                pieces = _split_word(word, max_width, measure)
+                lines.extend(pieces[:-1])
+                current, current_width = pieces[-1], measure(pieces[-1])
+        lines.append(current)
+    return lines
+
+
+def _line_height(font):
+    try:
+        ascent, descent = font.getmetrics()
+        return ascent + descent
+    except AttributeError:
+        # 비트맵 기본 글꼴
+        left, top, right, bottom = font.getbbox("가")
+        return bottom
+
+
+def _truncate(lines, max_lines, max_width, measure):
+    """max_lines에서 자르고 마지막 줄에 말줄임표"""
+    last = lines[max_lines - 1]
+    while last and measure(last + ELLIPSIS) > max_width:
+        last = last[:-1]
+    return lines[:max_lines - 1] + [last.rstrip() + ELLIPSIS]
+
+
+class TitleLayoutEngine:
+    """제목 → (글꼴 크기, 줄 목록) 배치"""
+
+    def __init__(self, font_for_size, min_size=MIN_FONT_SIZE, max_size=MAX_FONT_SIZE,
+                 max_lines=MAX_LINES, spacing=LINE_SPACING, glyph_cache=None):
+        self.font_for_size = font_for_size  # 크기 → 글꼴 (FontResolver.font)
+        self.min_size = int(min_size)
+        self.max_size = max(int(max_size), self.min_size)
+        self.max_lines = int(max_lines)
+        self.spacing = spacing
+        self.glyph_cache = glyph_cache or _shared_glyph_cache
+
+    def _try(self, title, size, max_width, max_height):
+        font = self.font_for_size(size)
+        table = self.glyph_cache.table(font)
+
+        def measure(text):
+            return self.glyph_cache.width(font, text, table)
+
+        lines = wrap_title(title, max_width, measure)
+        line_height = _line_height(font)
+        fits = bool(lines) and len(lines) <= self.max_lines
+        if fits:
+            height = line_height * len(lines) + self.spacing * (len(lines) - 1)
+            fits = height <= max_height
+        return font, lines, line_height, measure, fits
+
+    def layout(self, title, max_width, max_height):
+        """max_width x max_height 상자에 들어가는 가장 큰 배치 (TitleLayout)"""
+        title = " ".join(title.split())
+        low, high = self.min_size, self.max_size
+        best = None
+        # 크기가 클수록 줄이 늘어나므로(단조) 이분 탐색
+        while low <= high:
+            size = (low + high) // 2
+            attempt = self._try(title, size, max_width, max_height)
+            if attempt[4]:
+                best = (size, attempt)
+                low = size + 1
+            else:
+                high = size - 1
+
+        if best is None:
+            size = self.min_size
+            attempt = self._try(title, size, max_width, max_height)
+            font, lines, line_height, measure, _ = attempt
+            visible = max(1, min(self.max_lines, (max_height + self.spacing) // (line_height + self.spacing)))
+            if len(lines) > visible:
+                lines = _truncate(lines, visible, max_width, measure)
+        else:
+            size, (font, lines, line_height, measure, _) = best
+
+        widths = [measure(line) for line in lines]
+        height = line_height * len(lines) + self.spacing * max(0, len(lines) - 1)
+        return TitleLayout(font, size, lines, widths, line_height, self.spacing, max(widths, default=0), height)
+
+
+def draw_title(draw, layout, box, fill=(255, 255, 255), shadow=(50, 50, 50), shadow_offset=2):
+    """box (left, top, width, height) 중앙에 줄마다 가운데 정렬로 그림 (그림자 → 본문)"""
+    left, top, width, height = box
+    y = top + (height - layout.height) // 2
+    for line, line_width in zip(layout.lines, layout.widths):
+        x = left + int((width - line_width) // 2)
+        if shadow is not None:
+            draw.text((x + shadow_offset, y + shadow_offset), line, fill=shadow, font=layout.font)
+        draw.text((x, y), line, fill=fill, font=layout.font)
+        y += layout.line_height + layout.spacing
+
+
+_shared_glyph_cache = GlyphWidthCache()
@@ -0,0 +1,377 @@
+# -*- coding: utf-8 -*-
+"""
+웹 AI(Gemini/ChatGPT/Perplexity) 입력/응답 완료 감지 모듈
+
+페이지에 MutationObserver를 넣고 execute_async_script로 기다려, 응답 노드/복사 버튼이 나타난 뒤
+내용이 quiet초 동안 바뀌지 않으면 바로 결과를 돌려받는다. 1초마다 find_elements를 반복하던
+방식보다 완료를 빨리 알아채고, WebDriver 왕복은 CHUNK_SECONDS마다 한 번으로 줄어든다.
+(긴 대기를 CHUNK_SECONDS 단위로 나누어 그 사이에 일시정지/정지 요청을 확인한다)
+
+비동기 스크립트를 쓸 수 없는 경우에는 같은 조건을 1초마다 한 번의 execute_script로 확인한다.
+
+프롬프트 입력(set_editor_text)과 응답 추출(감시 결과의 text, count_responses)은 OS 클립보드를 쓰지 않고
+DOM API로 처리하므로 한 PC에서 여러 자동화를 동시에 실행해도 서로의 프롬프트/응답이 섞이지 않는다.
+"""
+
+import time
+
+# 응답 생성 중에만 보이는 중지 버튼 (ChatGPT/Gemini/Perplexity 공용, 전송 확인용)
+STOP_BUTTON_SELECTOR = (
+    "button[data-testid='stop-button'], button[aria-label*='stop' i], button[aria-label*='중지']"
+)
+
+# 현재 상태 계산 (비동기 감시/폴링 공용)
+# arguments: 응답 선택자 목록, 복사 버튼 선택자 목록, 복사 버튼 XPath, 이전 응답 수
+_STATE_JS = """
+function __acwState(respSelectors, copySelectors, copyXPath, beforeResp) {
+    let text = "";
+    for (const sel of respSelectors) {
+        const nodes = document.querySelectorAll(sel);
+        if (nodes.length) {
+            if (nodes.length > beforeResp) {
+                text = (nodes[nodes.length - 1].innerText || "").trim();
+            }
+            break;
+        }
+    }
+    let copies = 0;
+    for (const sel of copySelectors) {
+        copies += document.querySelectorAll(sel).length;
+    }
+    if (copyXPath) {
+        copies += document.evaluate(
+            copyXPath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+        ).snapshotLength;
+    }
+    return {text: text, copies: copies};
+}
+"""
+
+_POLL_JS = _STATE_JS + """
+return __acwState(arguments[0], arguments[1], arguments[2], arguments[3]);
+"""
+
+_WATCH_JS = _STATE_JS + """
+const [respSelectors, copySelectors, copyXPath, beforeResp, beforeCopy, quietMs, maxMs] = arguments;
+const done = arguments[arguments.length - 1];
+const needText = respSelectors.length > 0;
+const needCopy = copySelectors.length > 0 || !!copyXPath;
+let last = {text: "", copies: 0};
+let lastKey = null;
+let quietTimer = null;
+let scheduled = false;
+let finished = false;
+let observer = null;
+let maxTimer = null;
+
+function finish(status) {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(maxTimer);
+    done({status: status, text: last.text, copies: last.copies});
+}
+
+function check() {
+    scheduled = false;
+    if (finished) return;
+    const state = __acwState(respSelectors, copySelectors, copyXPath, beforeResp);
+    const key = state.copies + "\\u0000" + state.text;
+    if (key !== lastKey) {
+        // 내용이 바뀌면 조용한 시간을 처음부터 다시 셈
+        lastKey = key;
+        last = state;
+        clearTimeout(quietTimer);
+        quietTimer = null;
+    }
+    const ready = (!needText || state.text) && (!needCopy || state.copies > beforeCopy);
+    if (ready && quietTimer === null) {
+        quietTimer = setTimeout(() => finish("done"), quietMs);
+    }
+}
+
+observer = new MutationObserver(() => {
+    // 스트리밍 중 변경이 몰려도 100ms에 한 번만 확인
+    if (!scheduled) {
+        scheduled = true;
+        setTimeout(check, 100);
+    }
+});
+observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+maxTimer = setTimeout(() => finish("pending"), maxMs);
+check();
+"""
+
+
+# 입력창 내용 (contenteditable은 innerText, textarea/input은 value)
+_EDITOR_TEXT_JS = """
+const el = arguments[0];
+return (el.isContentEditable ? el.innerText : el.value) || "";
+"""
+
+# 입력창에 텍스트 입력 (execute_async_script, arguments: 입력창, 텍스트)
+# 1) 편집기 자체 입력 처리를 타는 execCommand("insertText")
+# 2) 클립보드를 거치지 않는 합성 붙여넣기 이벤트 (DataTransfer)
+# 3) 줄 단위 <p> 문단으로 직접 구성
+# 편집기(Quill/ProseMirror/Lexical)가 DOM을 비동기로 갱신하므로 단계마다 잠시 기다렸다가 확인한다.
+_SET_EDITOR_TEXT_JS = """
+const el = arguments[0];
+const text = arguments[1];
+const done = arguments[arguments.length - 1];
+const compact = (value) => (value || "").replace(/\\s+/g, "");
+const target = compact(text).length;
+const current = () => (el.isContentEditable ? el.innerText : el.value) || "";
+const filled = () => compact(current()).length >= target * 0.9;
+const settle = (next) => setTimeout(next, 200);
+
+function selectAll() {
+    el.focus();
+    const range = document.createRange();
+    range.selectNodeContents(el);
+    const selection = window.getSelection();
+    selection.removeAllRanges();
+    selection.addRange(range);
+}
+
+if (!el.isContentEditable) {
+    const proto = el.tagName === "TEXTAREA" ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    el.focus();
+    Object.getOwnPropertyDescriptor(proto, "value").set.call(el, text);
+    el.dispatchEvent(new Event("input", {bubbles: true}));
+    settle(() => done(compact(current()).length));
+} else {
+    selectAll();
+    document.execCommand("insertText", false, text);
+    settle(() => {
+        if (filled()) return done(compact(current()).length);
+        selectAll();
+        const data = new DataTransfer();
+        data.setData("text/plain", text);
+        el.dispatchEvent(new ClipboardEvent("paste", {clipboardData: data, bubbles: true, cancelable: true}));
+        settle(() => {
+            if (filled()) return done(compact(current()).length);
+            el.innerHTML = "";
+            for (const line of text.split("\\n")) {
+                const p = document.createElement("p");
+                if (line) {
+                    p.textContent = line;
+                } else {
+                    p.appendChild(document.createElement("br"));
+                }
+                el.appendChild(p);
+            }
+            el.dispatchEvent(new Event("input", {bubbles: true}));
+            settle(() => done(compact(current()).length));
+        });
+    });
+}
+"""
+
+# 응답 노드 수 (앞에서부터 처음으로 찾은 선택자 기준, 감시 스크립트와 같은 규칙)
+_COUNT_RESPONSES_JS = """
+for (const sel of arguments[0]) {
+    const count = document.querySelectorAll(sel).length;
+    if (count) return count;
+}
+return 0;
+"""
+
+# 전송 확인 상태 (arguments: 입력창, 응답 선택자 목록, 이전 응답 수, 중지 버튼 선택자)
+_SUBMIT_STATE_JS = """
+const el = arguments[0];
+const text = ((el.isContentEditable ? el.innerText : el.value) || "").trim();
+let responses = 0;
+for (const sel of arguments[1]) {
+    responses = document.querySelectorAll(sel).length;
+    if (responses) break;
+}
+let streaming = false;
+for (const btn of document.querySelectorAll(arguments[3])) {
+    if (btn.offsetParent !== null) {
+        streaming = true;
+        break;
+    }
+}
+return {cleared: !text, started: responses > arguments[2] || streaming};
+"""
+
+# 탭 상태 (arguments: 입력창 선택자, 응답 선택자 목록) - 웹 AI 탭 재사용 전 점검용
+_TAB_STATE_JS = """
+const editor = document.querySelector(arguments[0]);
+let responses = 0;
+for (const sel of arguments[1]) {
+    responses = document.querySelectorAll(sel).length;
+    if (responses) break;
+}
+return {
+    host: location.host,
+    ready: document.readyState,
+    editor: !!(editor && editor.offsetParent !== null),
+    responses: responses,
+};
+"""
+
+# 선택자에 맞는 첫 번째 보이는 요소 클릭 (arguments: 선택자)
+_CLICK_FIRST_JS = """
+for (const el of document.querySelectorAll(arguments[0])) {
+    if (el.offsetParent !== null) {
+        el.click();
+        return true;
+    }
+}
+return false;
+"""
+
+
+def tab_state(driver, editor_selector, response_selectors):
+    """현재 탭의 {host, ready, editor, responses} (스크립트 1회, 실패 시 None)"""
+    try:
+        return driver.execute_script(_TAB_STATE_JS, editor_selector, list(response_selectors))
+    except Exception:
+        return None
+
+
+def click_first(driver, selector):
+    """선택자에 맞는 첫 번째 보이는 요소를 클릭했으면 True"""
+    try:
+        return bool(driver.execute_script(_CLICK_FIRST_JS, selector))
+    except Exception:
+        return False
+
+
+def _compact_length(text):
+    return len("".join((text or "").split()))
+
+
+def read_editor_text(driver, editor):
+    """입력창 내용 읽기 (실패 시 빈 문자열)"""
+    try:
+        return (driver.execute_script(_EDITOR_TEXT_JS, editor) or "").strip()
+    except Exception:
+        return ""
+
+
+def set_editor_text(driver, editor, text, timeout=10):
+    """클립보드 없이 입력창에 text를 넣고, 입력창에 실제로 들어갔는지(공백 제외 90% 이상) 반환"""
+    try:
+        driver.set_script_timeout(timeout)
+        length = driver.execute_async_script(_SET_EDITOR_TEXT_JS, editor, text)
+    except Exception as e:
+        print(f"⚠️ 입력창 DOM 입력 실패: {type(e).__name__}")
+        return False
+    return int(length or 0) >= _compact_length(text) * 0.9
+
+
+def wait_prompt_sent(driver, editor, response_selectors, before_responses, timeout=5, interval=0.2):
+    """전송 후 입력창이 비워졌거나 새 응답/중지 버튼이 나타날 때까지 대기, 전송된 것으로 보이면 True
+
+    입력창이 늦게 비워지는 느린 전송도 새 응답/중지 버튼으로 알아채므로 Enter를 다시 보낼지 판단할 때 사용한다.
+    """
+    end_time = time.time() + timeout
+    while True:
+        try:
+            state = driver.execute_script(
+                _SUBMIT_STATE_JS, editor, list(response_selectors), before_responses, STOP_BUTTON_SELECTOR
+            )
+        except Exception:
+            # 전송 후 입력창이 새로 그려져 기존 요소가 사라진 경우
+            return True
+        if state and (state.get("cleared") or state.get("started")):
+            return True
+        if time.time() >= end_time:
+            return False
+        time.sleep(interval)
+
+
+def count_responses(driver, selectors):
+    """현재 응답 노드 수 (프롬프트 전송 전 기준값)"""
+    try:
+        return int(driver.execute_script(_COUNT_RESPONSES_JS, list(selectors)) or 0)
+    except Exception:
+        return 0
+
+
+class CompletionWatcher:
+    """웹 AI 응답 완료 감지 (MutationObserver + execute_async_script)"""
+
+    CHUNK_SECONDS = 10  # 비동기 스크립트 1회 최대 대기 시간 (초)
+    POLL_INTERVAL = 1.0  # 비동기 스크립트를 쓸 수 없을 때 확인 주기 (초)
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._async_supported = True
+
+    def wait(self, response_selectors=(), copy_selectors=(), copy_xpath=None,
+             before_responses=0, before_copies=0, quiet=1.0, timeout=180, between=None):
+        """응답 완료까지 대기 후 {"status", "text", "copies"} 반환
+
+        response_selectors: 응답 노드 CSS 선택자 (앞에서부터 처음으로 찾은 선택자 사용, 비우면 텍스트 조건 없음)
+        copy_selectors/copy_xpath: 복사 버튼 선택자 (개수는 선택자별 합계, 비우면 버튼 조건 없음)
+        before_responses/before_copies: 프롬프트 전송 전 개수 (이보다 많아져야 새 응답으로 봄)
+        quiet: 조건을 만족한 뒤 내용이 바뀌지 않아야 하는 시간 (초)
+        between(): 대기 구간 사이마다 호출 (일시정지/정지 확인용, 예외를 던지면 중단)
+        status는 완료 시 "done", 마감 시간까지 완료되지 않으면 "timeout" (text는 마지막으로 본 내용)
+        """
+        args = [list(response_selectors), list(copy_selectors), copy_xpath or "", int(before_responses)]
+        deadline = time.time() + timeout
+        last = {"status": "timeout", "text": "", "copies": 0}
+        while True:
+            if between:
+                between()
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                last["status"] = "timeout"
+                return last
+            if self._async_supported:
+                result = self._watch_chunk(args, before_copies, quiet, min(self.CHUNK_SECONDS, remaining))
+            else:
+                result = self._poll_once(args, before_copies, quiet, last)
+            if result:
+                last = result
+                if result["status"] == "done":
+                    result.pop("since", None)
+                    return result
+
+    def _watch_chunk(self, args, before_copies, quiet, seconds):
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+        try:
+            self.driver.set_script_timeout(seconds + quiet + 5)
+            result = self.driver.execute_async_script(
+                _WATCH_JS, *args, int(before_copies), int(quiet * 1000), int(seconds * 1000)
+            )
+        except TimeoutException:
+            return None
+        except WebDriverException as e:
+            print(f"⚠️ 응답 감시 스크립트 실행 실패 - 폴링으로 전환: {type(e).__name__}")
+            self._async_supported = False
+            return None
+        return self._normalize(result)
+
+    def _poll_once(self, args, before_copies, quiet, last):
+        """execute_script 한 번으로 상태 확인 (같은 내용이 quiet초 이상 유지되면 완료)"""
+        time.sleep(self.POLL_INTERVAL)
+        try:
+            state = self._normalize(self.driver.execute_script(_POLL_JS, *args))
+        except Exception:
+            return None
+        need_text = bool(args[0])
+        need_copy = bool(args[1] or args[2])
+        ready = (not need_text or state["text"]) and (not need_copy or state["copies"] > before_copies)
+        now = time.time()
+        if (state["text"], state["copies"]) != (last["text"], last["copies"]) or not last.get("since"):
+            state["since"] = now
+        else:
+            state["since"] = last["since"]
+        if ready and now - state["since"] >= quiet:
+            state["status"] = "done"
+        return state
+
+    @staticmethod
+    def _normalize(result):
+        result = result or {}
+        return {
+            "status": result.get("status", "pending"),
+            "text": result.get("text") or "",
+            "copies": int(result.get("copies") or 0),
+        }